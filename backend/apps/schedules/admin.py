@@ -1,7 +1,7 @@
 # backend/apps/schedules/admin.py
 
 from django.contrib import admin
-from .models import Vardiya, Musaitlik, CalisanTercihi, AylikSaatDengesi, KisitlamaKurali, VardiyaIstegi
+from .models import Vardiya, Musaitlik, CalisanTercihi, AylikSaatDengesi, KisitlamaKurali, VardiyaIstegi, PlanIsi
 
 class VardiyaAdmin(admin.ModelAdmin):
     # Liste sayfasında hangi sütunların görüneceğini belirtir
@@ -25,4 +25,5 @@ admin.site.register(Musaitlik)
 admin.site.register(CalisanTercihi)
 admin.site.register(AylikSaatDengesi)
 admin.site.register(KisitlamaKurali)
-admin.site.register(VardiyaIstegi)
\ No newline at end of file
+admin.site.register(VardiyaIstegi)
+admin.site.register(PlanIsi)
@@ -38,4 +38,17 @@ class IstekDurum(models.TextChoices):
 
 class KuralSart(models.TextChoices):
     CINSIYET_KADIN = 'cinsiyet_kadin', 'Cinsiyet: Kadın'
-    CINSIYET_ERKEK = 'cinsiyet_erkek', 'Cinsiyet: Erkek'
\ No newline at end of file
+    CINSIYET_ERKEK = 'cinsiyet_erkek', 'Cinsiyet: Erkek'
+
+class PlanIsiDurum(models.TextChoices):
+    BEKLIYOR = 'bekliyor', 'Sırada Bekliyor'
+    CALISIYOR = 'calisiyor', 'Çalışıyor'
+    TAMAMLANDI = 'tamamlandi', 'Tamamlandı'
+    HATA = 'hata', 'Hata'
+
+class PlanAsama(models.TextChoices):
+    VERI = 'veri', 'Veri Yükleniyor'
+    BLOKLAR = 'bloklar', 'Vardiya Blokları Hazırlanıyor'
+    FAVORILER = 'favoriler', 'Favori Atamaları'
+    DOLDURMA = 'doldurma', 'Boşluklar Dolduruluyor'
+    KAYIT = 'kayit', 'Plan Kaydediliyor'
@@ -0,0 +1,109 @@
+# apps/schedules/istatistik.py
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.schedules.choices import VardiyaDurum
+from apps.schedules.models import GunlukVardiyaOzeti, Vardiya
+
+# Yayinlanmis ve iptal edilmemis vardiyalar 'planlanan' sayilir
+PLANLANAN_DURUMLAR = [
+    VardiyaDurum.PLANLANDI, VardiyaDurum.BASLATILDI, VardiyaDurum.TAMAMLANDI, VardiyaDurum.IPTAL_ISTEGI,
+]
+TOPLU_KAYIT_BOYUTU = 2000
+
+
+def _sure(bitis, baslangic):
+    return ExpressionWrapper(F(bitis) - F(baslangic), output_field=DurationField())
+
+
+# Bir gruptaki vardiyalardan ozet alanlari; saatler timedelta olarak gelir
+OZET_TOPLAMLARI = {
+    'vardiya_sayisi': Count('id'),
+    'planlanan': Count('id', filter=Q(durum__in=PLANLANAN_DURUMLAR)),
+    'tamamlanan': Count('id', filter=Q(durum=VardiyaDurum.TAMAMLANDI)),
+    'iptal': Count('id', filter=Q(durum=VardiyaDurum.IPTAL)),
+    'planlanan_sure': Sum(_sure('bitis_zamani', 'baslangic_zamani'), filter=Q(durum__in=PLANLANAN_DURUMLAR)),
+    'gercek_sure': Sum(
+        _sure('gercek_bitis_zamani', 'gercek_baslangic_zamani'),
+        filter=Q(durum=VardiyaDurum.TAMAMLANDI, gercek_baslangic_zamani__isnull=False, gercek_bitis_zamani__isnull=False),
+    ),
+}
+
+
+def _gun_basi(tarih):
+    return timezone.make_aware(datetime.combine(tarih, time.min))
+
+
+def _ozet_alanlari(toplamlar):
+    return {
+        'vardiya_sayisi': toplamlar['vardiya_sayisi'],
+        'planlanan': toplamlar['planlanan'],
+        'tamamlanan': toplamlar['tamamlanan'],
+        'iptal': toplamlar['iptal'],
+        'planlanan_saat': (toplamlar['planlanan_sure'] or timedelta(0)).total_seconds() / 3600,
+        'gercek_saat': (toplamlar['gercek_sure'] or timedelta(0)).total_seconds() / 3600,
+    }
+
+
+def ozet_anahtari(vardiya):
+    """Vardiyanin ozet satiri: (sube_id, calisan_id, yerel gun)"""
+    return vardiya.sube_id, vardiya.calisan_id, timezone.localtime(vardiya.baslangic_zamani).date()
+
+
+def ozetleri_guncelle(anahtarlar):
+    """
+    Verilen (sube_id, calisan_id, tarih) ozet satirlarini o gunun vardiyalarindan
+    yeniden hesaplar. Vardiyayi degistiren islem kendi transaction'i icinde
+    degisiklikten once ve sonraki anahtarlari verir (calisan degistiyse ikisi de).
+    """
+    with transaction.atomic():
+        for sube_id, calisan_id, tarih in set(anahtarlar):
+            toplamlar = Vardiya.objects.filter(
+                sube_id=sube_id, calisan_id=calisan_id,
+                baslangic_zamani__gte=_gun_basi(tarih), baslangic_zamani__lt=_gun_basi(tarih + timedelta(days=1)),
+            ).aggregate(**OZET_TOPLAMLARI)
+            if not toplamlar['vardiya_sayisi']:
+                GunlukVardiyaOzeti.objects.filter(sube_id=sube_id, calisan_id=calisan_id, tarih=tarih).delete()
+                continue
+            # Satiri kilitleyerek yazar; eszamanli bir islem ayni satiri once olusturursa
+            # IntegrityError yakalanip mevcut satir guncellenir
+            GunlukVardiyaOzeti.objects.update_or_create(
+                sube_id=sube_id, calisan_id=calisan_id, tarih=tarih, defaults=_ozet_alanlari(toplamlar),
+            )
+
+
+def ozetleri_yeniden_olustur(baslangic=None, bitis=None, sube_idler=None):
+    """
+    [baslangic, bitis] gunlerinin (verilmezse tum gecmisin) ozetlerini silip
+    vardiyalardan tek gruplu sorguyla yeniden yazar. Plan kaydi ve
+    rebuild_daily_stats komutu kullanir. Yazilan satir sayisini dondurur.
+    """
+    vardiyalar = Vardiya.objects.all()
+    ozetler = GunlukVardiyaOzeti.objects.all()
+    if baslangic:
+        vardiyalar = vardiyalar.filter(baslangic_zamani__gte=_gun_basi(baslangic))
+        ozetler = ozetler.filter(tarih__gte=baslangic)
+    if bitis:
+        vardiyalar = vardiyalar.filter(baslangic_zamani__lt=_gun_basi(bitis + timedelta(days=1)))
+        ozetler = ozetler.filter(tarih__lte=bitis)
+    if sube_idler:
+        vardiyalar = vardiyalar.filter(sube_id__in=sube_idler)
+        ozetler = ozetler.filter(sube_id__in=sube_idler)
+
+    gruplar = vardiyalar.annotate(tarih=TruncDate('baslangic_zamani')).values(
+        'sube_id', 'calisan_id', 'tarih'
+    ).annotate(**OZET_TOPLAMLARI).order_by()
+    with transaction.atomic():
+        ozetler.delete()
+        yeni = GunlukVardiyaOzeti.objects.bulk_create([
+            GunlukVardiyaOzeti(
+                sube_id=grup['sube_id'], calisan_id=grup['calisan_id'], tarih=grup['tarih'], **_ozet_alanlari(grup)
+            )
+            for grup in gruplar
+        ], batch_size=TOPLU_KAYIT_BOYUTU)
+    return len(yeni)
@@ -0,0 +1,113 @@
+# apps/schedules/management/commands/benchmark_schedule.py
+
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.schedules.management.commands.create_schedule import Command as PlanlamaKomutu
+from apps.schedules.models import Vardiya
+from apps.schedules.planlama.sentetik import sentetik_veri_olustur
+
+
+def maks_rss_mb():
+    """Surecin simdiye kadarki en yuksek RSS degeri (MB)"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta byte
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class Command(BaseCommand):
+    help = (
+        'create_schedule motorunu farkli boyutlarda sentetik veriyle calistirir; sure, bellek, '
+        'sorgu sayisi, atama ve kapsanmayan saatleri JSON olarak raporlar. Gecici bir test '
+        'veritabani kullanir, asil veritabanina dokunmaz.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boyutlar', type=str, default='50,500,5000', help='Virgulle ayrilmis calisan sayilari')
+        parser.add_argument('--sube-basina-calisan', type=int, default=10, help='Sube sayisi = calisan / bu deger')
+        parser.add_argument('--donem', type=str, default='2025-11')
+        parser.add_argument('--tohum', type=int, default=0)
+        parser.add_argument('--motorlar', type=str, default='greedy',
+                            help='Virgulle ayrilmis motorlar; her boyutta yan yana olculur (or. greedy,optimal)')
+        parser.add_argument('--iyilestirme', type=float, default=0, help="create_schedule'un --iyilestirme degeri (sn)")
+        parser.add_argument('--paralel', type=int, default=1, help="create_schedule'un --paralel degeri")
+        parser.add_argument('--tracemalloc', action='store_true',
+                            help='Python tepe bellegini da olc (motoru belirgin sekilde yavaslatir)')
+        parser.add_argument('--cikti', type=str, help='JSON raporun yazilacagi dosya')
+
+    def handle(self, *args, **options):
+        boyutlar = [int(b) for b in options['boyutlar'].split(',') if b.strip()]
+
+        eski_ad = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            sonuclar = [sonuc for calisan_sayisi in boyutlar for sonuc in self.olc(calisan_sayisi, options)]
+        finally:
+            connection.creation.destroy_test_db(eski_ad, verbosity=0)
+
+        rapor = json.dumps({
+            'donem': options['donem'], 'tohum': options['tohum'], 'paralel': options['paralel'], 'sonuclar': sonuclar,
+        }, indent=2)
+        if options['cikti']:
+            with open(options['cikti'], 'w', encoding='utf-8') as f:
+                f.write(rapor)
+        self.stdout.write(rapor)
+
+    def olc(self, calisan_sayisi, options):
+        call_command('flush', interactive=False, verbosity=0)
+        sube_sayisi = max(1, calisan_sayisi // options['sube_basina_calisan'])
+
+        baslangic = time.perf_counter()
+        sentetik_veri_olustur(calisan_sayisi, sube_sayisi, options['donem'], options['tohum'])
+        veri_suresi = time.perf_counter() - baslangic
+
+        sonuclar = []
+        for motor in options['motorlar'].split(','):
+            # Her motor ayni veriyle, bos bir planla baslar
+            Vardiya.objects.all().delete()
+            sonuc = {'calisan': calisan_sayisi, 'sube': sube_sayisi, 'motor': motor, 'veri_uretim_sn': round(veri_suresi, 3)}
+            sonuc.update(self.calistir(motor, options))
+            self.stderr.write(f"{calisan_sayisi} calisan, {motor}: {sonuc['sure_sn']} sn, {sonuc['atama_sayisi']} atama")
+            sonuclar.append(sonuc)
+        return sonuclar
+
+    def calistir(self, motor, options):
+        if options['tracemalloc']:
+            tracemalloc.start()
+        komut = PlanlamaKomutu()
+        onceki_rss = maks_rss_mb()
+        with open(os.devnull, 'w') as bos, CaptureQueriesContext(connection) as sorgular:
+            baslangic = time.perf_counter()
+            call_command(komut, options['donem'], engine=motor, paralel=options['paralel'],
+                         iyilestirme=options['iyilestirme'], verbosity=0, stdout=bos)
+            sure = time.perf_counter() - baslangic
+        tepe_bellek = None
+        if options['tracemalloc']:
+            tepe_bellek = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            tracemalloc.stop()
+
+        return {
+            'sure_sn': round(sure, 3),
+            'planlama_sn': round(komut.planlama_suresi, 3),
+            'sorgu_sayisi': len(sorgular),
+            'tepe_bellek_mb': tepe_bellek,
+            # Tepe RSS surec boyunca tutulur; sadece bu calistirmadaki yukselis raporlanir.
+            # Boyutlar artan sirada verilince bu motorun payidir.
+            'rss_artisi_mb': round(maks_rss_mb() - onceki_rss, 1),
+            'atama_sayisi': len(komut.planlanan_vardiyalar),
+            'kalan_bosluk': komut.kalan_bosluk,
+            'toplam_blok_saati': round(komut.toplam_blok_saati, 1),
+            'kapsanmayan_saat': round(komut.uncovered_hours(), 1),
+            'kapsama_orani': round(komut.coverage_ratio(), 4),
+            'iyilestirme': komut.iyilestirme_raporu,
+            'profil': komut.profil_raporu,
+        }
@@ -1,197 +1,431 @@
-from django.core.management.base import BaseCommand
-from datetime import datetime, date, time, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from datetime import date, datetime, timedelta
 import calendar
-import math
+import heapq
+import numpy as np
+import json
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
 
 # Modelleri import edelim
-from apps.users.models import CustomUser
-from apps.branches.models import Sube, SubeCalismaSaati
-from apps.schedules.models import Musaitlik, AylikSaatDengesi, Vardiya, CalisanTercihi, KisitlamaKurali
+from apps.schedules.choices import MusaitlikDurum, PlanAsama, VardiyaDurum
+from apps.schedules.istatistik import ozetleri_yeniden_olustur
+from apps.schedules.models import Vardiya
+from apps.schedules.planlama.cakisma import VardiyaIndeksi
+from apps.schedules.planlama.durum import Atama, Blok
+from apps.schedules.planlama.fark import ay_araligi, ay_vardiyalari, mevcut_plan, plan_farki, taslak_vardiyalari
+from apps.schedules.planlama.iyilestirme import YerelArama
+from apps.schedules.planlama.kapsama import BlokKapsamasi
+from apps.schedules.planlama.mesafe import calisan_sube_mesafeleri
+from apps.schedules.planlama.motorlar import MOTORLAR
+from apps.schedules.planlama.paralel import isci_hazirla, kumeyi_planla, veri_parcalari
+from apps.schedules.planlama.profil import PlanlamaProfili
+from apps.schedules.planlama.uygunluk import UygunlukIndeksi
+from apps.schedules.planlama.veri import PlanlamaVerisi
+from apps.schedules.planlama.yayin import plani_yayinla
+from apps.schedules.planlama.yedek import goruntuyu_gecersiz_kil
 
 VARDIYA_MIN_SAAT = 3
 VARDIYA_MAX_SAAT = 9
 AYLIK_SAAT_LIMITI = 120
+TOPLU_KAYIT_BOYUTU = 500
+# Artimli planlamada yerinde kalan, saatleri motora yuklenen vardiyalar
+YAYINLANMIS_DURUMLAR = [VardiyaDurum.PLANLANDI, VardiyaDurum.BASLATILDI, VardiyaDurum.TAMAMLANDI]
 
 class Command(BaseCommand):
     help = 'Nihai v15: Duzeltilmis vardiya atama mantigi (Windows uyumlu)'
+    # call_command ile verilebilir: ilerleme(asama, yuzde, atama_sayisi, kalan_bosluk)
+    # ve onceden yuklenmis veri (PlanlamaVerisi)
+    stealth_options = ('ilerleme', 'veri')
 
     def add_arguments(self, parser):
         parser.add_argument('donem', type=str, help='Planin olusturulacagi donem (YYYY-AA formatinda)')
+        parser.add_argument('--dry-run', action='store_true', help='Veritabanina yazmadan plani ve mevcut planla farkini goster')
+        parser.add_argument('--publish', action='store_true',
+                            help='Kaydedilen taslaklari hemen yayinla (planlandi); yoksa plan taslak olarak kalir')
+        parser.add_argument('--paralel', type=int, default=1,
+                            help='Subeleri kumelere bolup bu kadar surecte paralel planla (1: tek surec)')
+        parser.add_argument('--iyilestirme', type=float, default=0, metavar='SANIYE',
+                            help='Motordan sonra bu kadar saniye yerel arama ile plani iyilestir (0: kapali)')
+        parser.add_argument('--engine', choices=sorted(MOTORLAR), default='greedy',
+                            help='Planlama motoru: greedy (v15) ya da optimal (gunluk atama problemi)')
+        # Artimli planlama: sadece penceredeki taslaklar yeniden cozulur, yayinlanmis vardiyalar sabit kalir
+        parser.add_argument('--from', dest='pencere_baslangic', type=date.fromisoformat, metavar='YYYY-AA-GG',
+                            help='Sadece bu tarihten itibaren yeniden planla (artimli mod)')
+        parser.add_argument('--to', dest='pencere_bitis', type=date.fromisoformat, metavar='YYYY-AA-GG',
+                            help='Sadece bu tarihe kadar (dahil) yeniden planla (artimli mod)')
+        parser.add_argument('--sube', type=int, action='append', metavar='SUBE_ID',
+                            help='Sadece bu subeyi yeniden planla; birden cok kez verilebilir (artimli mod)')
 
     def handle(self, *args, **options):
         donem = options['donem']
+        self.ilerleme = options.get('ilerleme')
+        # verbosity 0: atama/bosluk bazinda satir yazilmaz, sadece asama ozetleri
+        self.ayrintili = options.get('verbosity', 1) >= 1
+        self.profil = PlanlamaProfili()
+        self.planlanan_vardiyalar = []
         self.stdout.write(self.style.SUCCESS(f'>>> {donem} donemi icin Nihai Planlama Motoru v15 baslatiliyor...'))
 
-        # --- Veri Toplama ---
-        self.aktif_calisanlar = list(CustomUser.objects.filter(is_active=True, rol='calisan'))
-        self.kisitlama_kurallari = list(KisitlamaKurali.objects.all())
-        self.calisan_tercihleri = list(CalisanTercihi.objects.select_related('calisan', 'sube'))
-        self.musaitlik_sablonlari = self.get_musaitlik_dict(donem)
-        
-        try:
-            prev_month_dt = datetime.strptime(donem, "%Y-%m") - timedelta(days=1)
-            prev_month_str = prev_month_dt.strftime("%Y-%m")
-            self.onceki_ay_dengeleri = {d.calisan.id: d.denge for d in AylikSaatDengesi.objects.filter(donem=prev_month_str)}
-        except ValueError: 
-            self.onceki_ay_dengeleri = {}
-            
-        self.atanan_saatler = {calisan.id: 0 for calisan in self.aktif_calisanlar}
-        self.atanan_mesai_saatler = {calisan.id: 0 for calisan in self.aktif_calisanlar}
-        self.atanmis_vardiyalar = {calisan.id: [] for calisan in self.aktif_calisanlar}
-        calisma_saatleri = self.get_calisma_saatleri_dict()
-
-        # --- Plan Temizleme ---
-        yil, ay = map(int, donem.split('-'))
-        Vardiya.objects.filter(durum='taslak', baslangic_zamani__year=yil, baslangic_zamani__month=ay).delete()
-        
+        with connection.execute_wrapper(self.profil.sorgu_sayaci):
+            self.run_plan(donem, options)
+
+        self.profil.sayaclar['atama'] = len(self.planlanan_vardiyalar)
+        self.profil_raporu = self.profil.rapor()
+        self.stdout.write(f"[PROFIL] {json.dumps(self.profil_raporu)}")
+        self.stdout.write(self.style.SUCCESS('>>> Planlama tamamlandı!'))
+
+    def run_plan(self, donem, options):
+        # --- Veri Toplama (sabit sayida sorgu) ---
+        self.report_progress(PlanAsama.VERI, 0)
+        with self.profil.asama('veri'):
+            veri = options.get('veri') or PlanlamaVerisi.yukle(donem)
+            self.prepare_state(veri)
+        yil, ay = veri.yil, veri.ay
+        self.pencere = self.parse_window(veri, options)
+
         # --- Doldurulacak vardiya bloklarını belirle ---
-        aydaki_gunler = [d for d in calendar.Calendar().itermonthdates(yil, ay) if d.month == ay]
+        self.report_progress(PlanAsama.BLOKLAR, 5)
+        with self.profil.asama('bloklar'):
+            doldurulacak_vardiyalar = self.build_blocks(veri)
+            if self.pencere:
+                doldurulacak_vardiyalar = self.load_fixed_shifts(doldurulacak_vardiyalar, yil, ay)
+
+        motor = MOTORLAR[options.get('engine') or 'greedy'](self)
+        paralel = options.get('paralel') or 1
+        if paralel > 1 and self.pencere:
+            # Pencere kucuktur ve sabit vardiyalar alt sureclere tasinmaz
+            self.stdout.write(self.style.WARNING('Artimli modda --paralel kullanilmaz, tek surecte planlaniyor.'))
+            paralel = 1
+        baslangic = time.perf_counter()
+        if paralel > 1 and len(self.subeler) > 1:
+            self.plan_partitioned(veri, doldurulacak_vardiyalar, paralel, motor.ad)
+        else:
+            motor.planla(doldurulacak_vardiyalar)
+        self.planlama_suresi = time.perf_counter() - baslangic
+        self.stdout.write(self.style.SUCCESS(
+            f"\n[MOTOR {motor.ad}] {self.planlama_suresi:.2f} sn, kapsama %{100 * self.coverage_ratio():.1f}, "
+            f"{self.uncovered_hours():.1f} saat kapsanmadi, {self.kalan_bosluk} bosluk kaldi"
+        ))
+        self.iyilestirme_raporu = None
+        if options.get('iyilestirme'):
+            with self.profil.asama('iyilestirme'):
+                self.improve_plan(doldurulacak_vardiyalar, options['iyilestirme'])
+
+        # --- AŞAMA 3: PLANI KAYDET ---
+        if options.get('dry_run'):
+            # Deneme: veritabanina dokunmadan plani ve farki hazirla
+            self.stdout.write(self.style.HTTP_INFO('\nAŞAMA 3: Deneme modu, mevcut planla karsilastiriliyor...'))
+            with self.profil.asama('deneme'):
+                self.deneme_sonucu = self.build_dry_run_result(donem, yil, ay)
+        else:
+            self.stdout.write(self.style.HTTP_INFO('\nAŞAMA 3: Plan kaydediliyor...'))
+            self.report_progress(PlanAsama.KAYIT, 90, self.kalan_bosluk)
+            with self.profil.asama('kayit'):
+                self.save_plan(yil, ay)
+                if options.get('publish'):
+                    yayinlanan = plani_yayinla(yil, ay, self.pencere)
+                    self.stdout.write(self.style.SUCCESS(f"   [OK] {yayinlanan} vardiya yayinlandi."))
+        self.report_progress(PlanAsama.KAYIT, 100, self.kalan_bosluk)
+
+    def parse_window(self, veri, options):
+        """
+        --from/--to/--sube verildiyse (baslangic, bitis, sube_idler) penceresi,
+        yoksa None (tum ay). Tarihler dahildir ve donemin icinde olmalidir.
+        """
+        baslangic, bitis, sube_idler = options.get('pencere_baslangic'), options.get('pencere_bitis'), options.get('sube')
+        if not (baslangic or bitis or sube_idler):
+            return None
+
+        ay_basi = date(veri.yil, veri.ay, 1)
+        ay_sonu = date(veri.yil, veri.ay, calendar.monthrange(veri.yil, veri.ay)[1])
+        baslangic, bitis = baslangic or ay_basi, bitis or ay_sonu
+        if not ay_basi <= baslangic <= bitis <= ay_sonu:
+            raise CommandError(f'--from/--to {veri.donem} donemi icinde olmali ve --from <= --to olmali.')
+        if sube_idler:
+            bilinmeyen = set(sube_idler) - {sube.id for sube in veri.subeler}
+            if bilinmeyen:
+                raise CommandError(f"Sube bulunamadi: {', '.join(map(str, sorted(bilinmeyen)))}")
+            sube_idler = set(sube_idler)
+        return baslangic, bitis, sube_idler
+
+    def in_window(self, sube_id, tarih):
+        baslangic, bitis, sube_idler = self.pencere
+        return baslangic <= tarih <= bitis and (not sube_idler or sube_id in sube_idler)
+
+    def load_fixed_shifts(self, doldurulacak_vardiyalar, yil, ay):
+        """
+        Artimli mod: bloklari pencereyle sinirla, yerinde kalacak vardiyalari
+        (yayinlanmislar ve pencere disindaki taslaklar) motorun saat, cakisma ve
+        kapsama durumuna yukle. Sadece pencere icindeki taslaklar yeniden uretilir.
+        """
+        bloklar = [blok for blok in doldurulacak_vardiyalar if self.in_window(blok.sube_id, blok.baslangic.date())]
+        gun_bloklari = {}
+        for blok in bloklar:
+            gun_bloklari.setdefault((blok.sube_id, blok.baslangic.date()), []).append(blok)
+
+        self.sabit_vardiyalar = [
+            vardiya for vardiya in ay_vardiyalari(yil, ay, YAYINLANMIS_DURUMLAR + [VardiyaDurum.TASLAK])
+            if vardiya[4] != VardiyaDurum.TASLAK or not self.in_window(vardiya[0], vardiya[2].date())
+        ]
+        self.load_shifts(vardiya[:4] for vardiya in self.sabit_vardiyalar)
+        for sube_id, calisan_id, bas, bit, durum in self.sabit_vardiyalar:
+            if calisan_id is None:
+                continue
+            # Gece yarisini asan bloklar bir sonraki gune tasabilir
+            for tarih in (bas.date(), bas.date() - timedelta(days=1)):
+                for blok in gun_bloklari.get((sube_id, tarih), []):
+                    blok.kapsama.ekle(max(bas, blok.baslangic), min(bit, blok.bitis))
+
+        self.toplam_blok_saati = sum(blok.saat for blok in bloklar)
+        # Kapsama kurali (dolu saat = atanan saat) sabit vardiyalarin blok icindeki kismiyla baslar
+        self.toplam_atanan_saat = sum(
+            (dolu_bit - dolu_bas).total_seconds() / 3600 for blok in bloklar for dolu_bas, dolu_bit in blok.kapsama
+        )
+        baslangic, bitis, _ = self.pencere
+        self.stdout.write(self.style.HTTP_INFO(
+            f"[ARTIMLI] {baslangic} - {bitis}: {len(bloklar)} blok yeniden planlanacak, "
+            f"{len(self.sabit_vardiyalar)} vardiya sabit."
+        ))
+        return bloklar
+
+    def load_shifts(self, vardiyalar):
+        """Plan disinda kalan (sube_id, calisan_id, baslangic, bitis) vardiyalarini saat ve cakisma durumuna isle"""
+        for _, calisan_id, bas, bit in vardiyalar:
+            if calisan_id is None:
+                continue
+            self.atanmis_vardiyalar.ekle(calisan_id, bas, bit)
+            if calisan_id in self.calisan_sirasi:
+                self.add_hours(calisan_id, (bit - bas).total_seconds() / 3600)
+
+    def add_hours(self, calisan_id, vardiya_suresi):
+        """Calisanin saat ve mesai sayaclarini artir; limite ulasani aday kumelerinden cikar"""
+        i = self.calisan_sirasi[calisan_id]
+        mesai_suresi = max(0, vardiya_suresi - VARDIYA_MAX_SAAT)
+        self.atanan_saatler[i] += vardiya_suresi
+        self.atanan_mesai_saatler[i] += mesai_suresi
+        if self.atanan_saatler[i] >= AYLIK_SAAT_LIMITI:
+            self.uygunluk.doygun_yap(calisan_id)
+        return mesai_suresi
+
+    def prepare_state(self, veri):
+        """Planlama girdilerini ve atama sayaclarini hazirla (veritabanina dokunmaz)"""
+        # Vardiyalar planlama bitene kadar bellekte bekler, sonra toplu yazilir
+        self.planlanan_vardiyalar = []
+        self.aktif_calisanlar = veri.calisanlar
+        self.calisanlar_by_id = {calisan.id: calisan for calisan in self.aktif_calisanlar}
+        self.subeler = veri.subeler
+        self.sube_adlari = {sube.id: sube.sube_adi for sube in self.subeler}
+        self.kisitlama_kurallari = veri.kurallar
+        self.calisan_tercihleri = veri.tercihler
+        self.favori_tercihler = {(t.calisan_id, t.sube_id, t.gun) for t in self.calisan_tercihleri}
+        self.musaitlik_sablonlari = veri.musaitlik
+        self.onceki_ay_dengeleri = veri.onceki_ay_dengeleri
+
+        # Calisan basina sayaclar calisan_sirasi ile indekslenen dizilerde
+        self.calisan_sirasi = {calisan.id: i for i, calisan in enumerate(self.aktif_calisanlar)}
+        self.sube_sirasi = {sube.id: i for i, sube in enumerate(self.subeler)}
+        self.atanan_saatler = np.zeros(len(self.aktif_calisanlar))
+        self.atanan_mesai_saatler = np.zeros(len(self.aktif_calisanlar))
+        # Onceki aydan eksik saati olanlara bonus
+        self.denge_puanlari = np.array([
+            abs(min(0, self.onceki_ay_dengeleri.get(calisan.id, 0))) * 10 for calisan in self.aktif_calisanlar
+        ], dtype=float)
+        self.atanmis_vardiyalar = VardiyaIndeksi()
+        self.uygunluk = UygunlukIndeksi(self.aktif_calisanlar, self.is_available_on, self.kisitlama_kurallari)
+        # Calisan x sube mesafeleri (km); koordinati eksik olanlar NaN ve puani yok
+        self.mesafeler = calisan_sube_mesafeleri(self.aktif_calisanlar, self.subeler)
+        self.mesafe_puanlari = np.where(self.mesafeler < 50, 50 - self.mesafeler, 0.0)
+        self.toplam_atanan_saat = 0
+        self.kalan_bosluk = 0
+
+    def build_blocks(self, veri):
+        """Her subenin aydaki acik gunleri icin doldurulacak blok listesi"""
+        aydaki_gunler = [d for d in calendar.Calendar().itermonthdates(veri.yil, veri.ay) if d.month == veri.ay]
         doldurulacak_vardiyalar = []
         
-        for sube in Sube.objects.all():
+        for sube in self.subeler:
             for gun_tarihi in aydaki_gunler:
                 haftanin_gunu = gun_tarihi.isoweekday()
-                sube_saatleri = calisma_saatleri.get(sube.id, {}).get(haftanin_gunu)
+                sube_saatleri = veri.calisma_saatleri.get(sube.id, {}).get(haftanin_gunu)
                 if sube_saatleri and not sube_saatleri.get('kapali'):
                     baslangic = datetime.combine(gun_tarihi, sube_saatleri['acilis'])
                     bitis = datetime.combine(gun_tarihi, sube_saatleri['kapanis'])
                     if bitis <= baslangic: 
                         bitis += timedelta(days=1)
-                    doldurulacak_vardiyalar.append({
-                        "sube": sube, 
-                        "baslangic": baslangic, 
-                        "bitis": bitis, 
-                        "dolu_araliklar": []
-                    })
+                    doldurulacak_vardiyalar.append(Blok(
+                        sube.id, baslangic, bitis, BlokKapsamasi(baslangic, bitis, VARDIYA_MIN_SAAT)
+                    ))
         
+        self.toplam_blok_saati = sum(blok.saat for blok in doldurulacak_vardiyalar)
+        return doldurulacak_vardiyalar
+
+    def plan_blocks(self, doldurulacak_vardiyalar):
+        """v15 dongusu: once favoriler, sonra kalan bosluklar"""
         # --- AŞAMA 1: FAVORİLERİ ATA ---
         self.stdout.write(self.style.HTTP_INFO('\nAŞAMA 1: Favori atamaları yapılıyor...'))
-        self.assign_favorites(doldurulacak_vardiyalar)
+        with self.profil.asama('favoriler'):
+            self.assign_favorites(doldurulacak_vardiyalar)
 
         # --- AŞAMA 2: KALAN BOŞLUKLARI DOLDUR ---
         self.stdout.write(self.style.HTTP_INFO('\nAŞAMA 2: Kalan boşluklar dolduruluyor...'))
-        self.fill_remaining_shifts(doldurulacak_vardiyalar)
-
-        self.stdout.write(self.style.SUCCESS('>>> Planlama tamamlandı!'))
+        with self.profil.asama('doldurma'):
+            self.fill_remaining_shifts(doldurulacak_vardiyalar)
+
+    def plan_partitioned(self, veri, doldurulacak_vardiyalar, paralel, motor_adi='greedy'):
+        """
+        Subeleri cografi kumelere, calisanlari da bu kumelere bolup her kumeyi
+        ayri bir surecte planlar. Her calisan tek bir kumede planlandigi icin
+        kume sonuclari cakismaz ve aylik limiti asmaz. Sonra tum calisanlarla
+        ortak bir uzlastirma turu, kumelerde dolmayan bosluklari diger
+        kumelerde kapasitesi kalan calisanlarla doldurur.
+        """
+        parcalar = veri_parcalari(veri, paralel, self.mesafeler)
+        self.stdout.write(self.style.HTTP_INFO(
+            f'\nPARALEL: {len(self.subeler)} sube {len(parcalar)} kumeye bolundu, '
+            f'{min(paralel, len(parcalar))} surecte planlaniyor...'
+        ))
+        # sube_id -> (blok baslangiclari, bloklar); bir subenin bloklari tarih sirasinda
+        sube_bloklari = {}
+        for blok in doldurulacak_vardiyalar:
+            baslar, bloklar = sube_bloklari.setdefault(blok.sube_id, ([], []))
+            baslar.append(blok.baslangic)
+            bloklar.append(blok)
+
+        with self.profil.asama('paralel'), \
+                ProcessPoolExecutor(max_workers=min(paralel, len(parcalar)), initializer=isci_hazirla) as yurutucu:
+            sonuclar = yurutucu.map(kumeyi_planla, parcalar, [motor_adi] * len(parcalar))
+            for i, (parca, (atamalar, kalan_bosluk, sayaclar)) in enumerate(zip(parcalar, sonuclar), start=1):
+                self.profil.sayaclari_ekle(sayaclar)
+                for sube_id, calisan_id, baslangic, bitis in atamalar:
+                    self.record_shift(calisan_id, sube_id, baslangic, bitis)
+                    baslar, bloklar = sube_bloklari[sube_id]
+                    bloklar[bisect_right(baslar, baslangic) - 1].kapsama.ekle(baslangic, bitis)
+                self.stdout.write(
+                    f"  [KUME {i}] {len(parca.subeler)} sube, {len(parca.calisanlar)} calisan: "
+                    f"{len(atamalar)} atama, {kalan_bosluk} bosluk kaldi"
+                )
+                self.report_progress(PlanAsama.DOLDURMA, 10 + 60 * i // len(parcalar))
+
+        # Uzlastirma: kume disindaki favoriler ve kalan bosluklar tum calisanlarla
+        self.stdout.write(self.style.HTTP_INFO('\nUZLASTIRMA: Kumeler arasi kalan bosluklar dolduruluyor...'))
+        self.plan_blocks(doldurulacak_vardiyalar)
+
+    def improve_plan(self, doldurulacak_vardiyalar, butce_saniye):
+        """Sure butcesi icinde yerel arama; once/sonra olcumlerini raporlar"""
+        self.stdout.write(self.style.HTTP_INFO(f'\nIYILESTIRME: {butce_saniye:g} sn yerel arama...'))
+        rapor = YerelArama(self, doldurulacak_vardiyalar, butce_saniye).calistir()
+        once, sonra, hamleler = rapor['once'], rapor['sonra'], rapor['hamleler']
+        self.stdout.write(self.style.SUCCESS(
+            f"[IYILESTIRME] {rapor['sure_sn']:.2f} sn: kapsanmayan {once['kapsanmayan_saat']} -> "
+            f"{sonra['kapsanmayan_saat']} saat, mesai {once['mesai_saat']} -> {sonra['mesai_saat']} saat, "
+            f"saat sapmasi {once['saat_sapmasi']} -> {sonra['saat_sapmasi']} "
+            f"({', '.join(f'{adet} {ad}' for ad, adet in hamleler.items())})"
+        ))
+        self.iyilestirme_raporu = rapor
 
     # --- ATAMA FONKSİYONLARI ---
 
     def assign_favorites(self, tum_vardiya_bloklari):
         """Favori tercihlerine gore vardiya ata"""
-        for tercih in self.calisan_tercihleri:
-            calisan = tercih.calisan
-            for blok in tum_vardiya_bloklari:
+        # (sube_id, haftanin_gunu) -> o sube ve gundeki bloklar (tarih sirasiyla)
+        blok_indeksi = {}
+        for blok in tum_vardiya_bloklari:
+            blok_indeksi.setdefault((blok.sube_id, blok.baslangic.isoweekday()), []).append(blok)
+
+        for i, tercih in enumerate(self.calisan_tercihleri):
+            self.report_progress(PlanAsama.FAVORILER, 10 + 20 * i // len(self.calisan_tercihleri))
+            calisan = self.calisanlar_by_id[tercih.calisan_id]
+            # Sadece tercihin şube ve gününe uyan bloklar
+            for blok in blok_indeksi.get((tercih.sube_id, tercih.gun), []):
                 # Blok zaten doluysa atla
                 if self.is_block_fully_covered(blok):
                     continue
-                    
-                # Şube ve gün eşleşmesi kontrolü
-                if tercih.sube_id == blok['sube'].id and tercih.gun == blok['baslangic'].isoweekday():
-                    if self.is_candidate_valid_at_start(calisan, blok['sube'], blok['baslangic']):
-                        # Boşlukları bul ve favori çalışanı ata
-                        gaps = self.find_gaps_in_block(blok)
-                        for gap_start, gap_end in gaps:
-                            if self.solve_and_assign_gap(calisan, blok, gap_start, gap_end):
-                                self.stdout.write(f"  [OK] Favori: {calisan.username} -> {blok['sube'].sube_adi} [{gap_start.strftime('%d/%m %H:%M')}]")
-                                break  # Bu favori icin yeterli
+
+                self.profil.sayaclar['aday_tarama'] += 1
+                if self.is_candidate_valid_at_start(calisan, blok.sube_id, blok.baslangic):
+                    # Boşlukları bul ve favori çalışanı ata
+                    gaps = self.find_gaps_in_block(blok)
+                    for gap_start, gap_end in gaps:
+                        if self.solve_and_assign_gap(calisan, blok, gap_start, gap_end):
+                            if self.ayrintili:
+                                self.stdout.write(f"  [OK] Favori: {calisan.username} -> {self.sube_adlari[blok.sube_id]} [{gap_start.strftime('%d/%m %H:%M')}]")
+                            break  # Bu favori icin yeterli
 
     def fill_remaining_shifts(self, tum_vardiya_bloklari):
-        """Tum bosluklari doldurmaya calis - surekli guncellenen referans"""
-        max_iterations = 100  # Sonsuz dongu korumasi
-        iteration = 0
-        
-        while iteration < max_iterations:
-            iteration += 1
-            herhangi_atama_yapildi_mi = False
-            
-            # HER ITERASYONDA bosluklari yeniden hesapla
-            tum_bosluklar = []
-            for blok in tum_vardiya_bloklari:
-                if self.is_block_fully_covered(blok):
-                    continue
-                    
-                bosluklar = self.find_gaps_in_block(blok)
-                for bosluk_bas, bosluk_bitis in bosluklar:
-                    tum_bosluklar.append({
-                        'sube': blok['sube'], 
-                        'baslangic': bosluk_bas, 
-                        'bitis': bosluk_bitis, 
-                        'blok_ref': blok
-                    })
-            
-            # Boşluk kalmadıysa çık
-            if not tum_bosluklar:
-                self.stdout.write(self.style.SUCCESS(f"\n[BASARILI] Tum vardiya bloklari dolduruldu! (Iterasyon: {iteration})"))
-                break
-            
-            # En yakın tarihteki boşluklardan başla
-            tum_bosluklar.sort(key=lambda x: x['baslangic'])
-            
-            for bosluk in tum_bosluklar:
-                blok = bosluk['blok_ref']
-                
-                # Bu boşluk dolmuş mu tekrar kontrol et
-                if self.is_gap_filled(blok, bosluk['baslangic'], bosluk['bitis']):
-                    continue
-                
+        """
+        Tum bosluklari bir min-heap uzerinden doldurmaya calis.
+
+        Kuyruk (tur, baslangic) sirasindadir: bir atamadan arta kalan parca bir
+        sonraki tura girer, boylece once ayin tum acilis bosluklari, sonra
+        kalan parcalar doldurulur. Sadece atama yapilan blogun bosluklari
+        yeniden hesaplanir.
+        """
+        sira = count()  # Ayni baslangicli bosluklarda blok sirasi korunsun
+        bosluk_kuyrugu = [
+            (1, bosluk_bas, next(sira), bosluk_bitis, blok)
+            for blok in tum_vardiya_bloklari
+            for bosluk_bas, bosluk_bitis in self.find_gaps_in_block(blok)
+        ]
+        heapq.heapify(bosluk_kuyrugu)
+        doldurulamayan = 0
+
+        while bosluk_kuyrugu:
+            self.report_progress(PlanAsama.DOLDURMA, 30 + int(60 * self.coverage_ratio()), len(bosluk_kuyrugu) + doldurulamayan)
+            tur, bosluk_bas, _, bosluk_bitis, blok = heapq.heappop(bosluk_kuyrugu)
+
+            # Bu boşluk dolmuş mu tekrar kontrol et
+            if self.is_gap_filled(blok, bosluk_bas, bosluk_bitis):
+                continue
+
+            self.profil.sayaclar['bosluk_degerlendirme'] += 1
+            if self.ayrintili:
                 self.stdout.write(self.style.HTTP_INFO(
-                    f"\n[Iter {iteration}] Cozuluyor: {bosluk['sube'].sube_adi} - "
-                    f"{bosluk['baslangic'].strftime('%d/%m %H:%M')} -> {bosluk['bitis'].strftime('%H:%M')}"
+                    f"\n[Tur {tur}] Cozuluyor: {self.sube_adlari[blok.sube_id]} - "
+                    f"{bosluk_bas.strftime('%d/%m %H:%M')} -> {bosluk_bitis.strftime('%H:%M')}"
                 ))
-                
-                aday_havuzu = self.find_candidates(bosluk['sube'], bosluk['baslangic'])
-                if not aday_havuzu:
+
+            aday_havuzu = self.find_candidates(blok.sube_id, bosluk_bas)
+            if not aday_havuzu:
+                if self.ayrintili:
                     self.stdout.write(self.style.WARNING(" -> Bu bosluk icin uygun aday bulunamadi."))
-                    continue
-                
-                sirali_adaylar = self.rank_candidates(aday_havuzu, bosluk['sube'], bosluk['baslangic'])
-                
-                for aday_data in sirali_adaylar:
-                    en_iyi_aday = aday_data['aday']
-                    if self.solve_and_assign_gap(en_iyi_aday, blok, bosluk['baslangic'], bosluk['bitis']):
-                        herhangi_atama_yapildi_mi = True
-                        break  # Bu boşluk için yeterli, bir sonraki boşluğa geç
-                
-            # Hiç atama yapılamadıysa döngüden çık
-            if not herhangi_atama_yapildi_mi:
-                self.stdout.write(self.style.WARNING(
-                    f"\n[UYARI] Kalan {len(tum_bosluklar)} bosluk icin uygun calisan bulunamadi."
-                ))
-                break
+                doldurulamayan += 1
+                continue
+
+            sirali_adaylar = self.rank_candidates(aday_havuzu, blok.sube_id, bosluk_bas)
+
+            for aday_data in sirali_adaylar:
+                if self.solve_and_assign_gap(aday_data['aday'], blok, bosluk_bas, bosluk_bitis):
+                    # Sadece bu boşluktan kalan parçalar kuyruğa geri girer
+                    for yeni_bas, yeni_bitis in self.find_gaps_in_block(blok):
+                        if bosluk_bas <= yeni_bas and yeni_bitis <= bosluk_bitis:
+                            heapq.heappush(bosluk_kuyrugu, (tur + 1, yeni_bas, next(sira), yeni_bitis, blok))
+                    break
+            else:
+                # Aday havuzu sadece küçülür, çakışmalar sadece artar; bu boşluk sonradan da dolmaz
+                doldurulamayan += 1
+
+        self.kalan_bosluk = doldurulamayan
+        if doldurulamayan:
+            self.stdout.write(self.style.WARNING(
+                f"\n[UYARI] Kalan {doldurulamayan} bosluk icin uygun calisan bulunamadi."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("\n[BASARILI] Tum vardiya bloklari dolduruldu!"))
 
     def is_block_fully_covered(self, blok):
         """Bir blogun tamamen dolu olup olmadigini kontrol et"""
-        gaps = self.find_gaps_in_block(blok)
-        return len(gaps) == 0
+        return blok.kapsama.tamamen_dolu
 
     def is_gap_filled(self, blok, gap_start, gap_end):
         """Belirli bir boslugun doldurulup doldurulmadigini kontrol et"""
-        for dolu_bas, dolu_bitis in blok.get('dolu_araliklar', []):
-            # Boşluk tamamen dolu aralık içinde mi?
-            if dolu_bas <= gap_start and gap_end <= dolu_bitis:
-                return True
-        return False
+        return blok.kapsama.kapsiyor_mu(gap_start, gap_end)
 
     def find_gaps_in_block(self, blok):
         """Blok icindeki bos zaman dilimlerini bul"""
-        gaps = []
-        current_time = blok['baslangic']
-        dolu_araliklar = sorted(blok.get('dolu_araliklar', []), key=lambda x: x[0])
-        
-        for dolu_bas, dolu_bitis in dolu_araliklar:
-            if current_time < dolu_bas:
-                gap_duration = (dolu_bas - current_time).total_seconds() / 3600
-                if gap_duration >= VARDIYA_MIN_SAAT:
-                    gaps.append((current_time, dolu_bas))
-            current_time = max(current_time, dolu_bitis)
-        
-        # Son dolu aralıktan sonra boşluk var mı?
-        if current_time < blok['bitis']:
-            gap_duration = (blok['bitis'] - current_time).total_seconds() / 3600
-            if gap_duration >= VARDIYA_MIN_SAAT:
-                gaps.append((current_time, blok['bitis']))
-        
-        return gaps
+        return list(blok.kapsama.bosluklar())
 
     def solve_and_assign_gap(self, calisan, blok, bosluk_baslangic, bosluk_bitis):
         """Bir bosuga calisan ata - kural ve cakisma kontrolu ile"""
@@ -199,7 +433,7 @@ class Command(BaseCommand):
         atanacak_sure = min(VARDIYA_MAX_SAAT, kalan_sure)
 
         # Kısıtlama kuralı kontrolü
-        kural_bitis_saati = self.check_restriction_end_time(calisan, blok['sube'])
+        kural_bitis_saati = self.check_restriction_end_time(calisan, blok.sube_id)
         potansiyel_bitis_zamani = bosluk_baslangic + timedelta(hours=atanacak_sure)
 
         if kural_bitis_saati:
@@ -215,119 +449,87 @@ class Command(BaseCommand):
                 if yeni_atanacak_sure < VARDIYA_MIN_SAAT:
                     return False
                 atanacak_sure = yeni_atanacak_sure
-                self.stdout.write(self.style.NOTICE(
-                    f"   -> Kisitlama: {calisan.username} vardiyasi {kural_bitis_saati}'de bitecek."
-                ))
+                if self.ayrintili:
+                    self.stdout.write(self.style.NOTICE(
+                        f"   -> Kisitlama: {calisan.username} vardiyasi {kural_bitis_saati}'de bitecek."
+                    ))
 
         # Mesai zorunluluğu kontrolü
         yeni_bosluk_suresi = kalan_sure - atanacak_sure
         if 0 < yeni_bosluk_suresi < VARDIYA_MIN_SAAT:
             if kalan_sure <= VARDIYA_MAX_SAAT + VARDIYA_MIN_SAAT:
                 atanacak_sure = kalan_sure
-                self.stdout.write(self.style.NOTICE(
-                    f"   -> Zorunlu Mesai: {calisan.get_full_name()} {yeni_bosluk_suresi:.1f} saat mesai."
-                ))
+                if self.ayrintili:
+                    self.stdout.write(self.style.NOTICE(
+                        f"   -> Zorunlu Mesai: {calisan.get_full_name()} {yeni_bosluk_suresi:.1f} saat mesai."
+                    ))
 
         vardiya_bitis_zamani = bosluk_baslangic + timedelta(hours=atanacak_sure)
         
         # Çakışma kontrolü
         if not self.has_conflicting_shift(calisan, bosluk_baslangic, vardiya_bitis_zamani):
-            self.create_shift(calisan, blok['sube'], bosluk_baslangic, vardiya_bitis_zamani)
+            self.create_shift(calisan, blok.sube_id, bosluk_baslangic, vardiya_bitis_zamani)
             # KRİTİK: Dolu aralığı ekle
-            blok['dolu_araliklar'].append((bosluk_baslangic, vardiya_bitis_zamani))
+            blok.kapsama.ekle(bosluk_baslangic, vardiya_bitis_zamani)
             return True
         else:
-            self.stdout.write(self.style.WARNING(
-                f"   -> Atama Basarisiz: {calisan.username} icin cakisma var."
-            ))
+            if self.ayrintili:
+                self.stdout.write(self.style.WARNING(
+                    f"   -> Atama Basarisiz: {calisan.username} icin cakisma var."
+                ))
             return False
 
     # --- KONTROL FONKSİYONLARI ---
 
-    def is_candidate_valid_at_start(self, calisan, sube, baslangic_zamani):
+    def is_candidate_valid_at_start(self, calisan, sube_id, baslangic_zamani):
         """Bir adayin vardiya baslangici icin uygun olup olmadigini kontrol et"""
-        if not self.is_available(calisan, baslangic_zamani):
-            return False
-        if self.atanan_saatler[calisan.id] >= AYLIK_SAAT_LIMITI:
-            return False
-        if self.violates_restriction_at_start(calisan, sube, baslangic_zamani):
-            return False
-        return True
+        # Musaitlik, aylik limit ve baslangic kurali uygunluk indeksinde
+        return calisan.id in self.uygunluk.adaylar(sube_id, baslangic_zamani)
 
-    def find_candidates(self, sube, baslangic_zamani):
+    def find_candidates(self, sube_id, baslangic_zamani):
         """Sadece temel uygunluklari kontrol eder"""
-        adaylar = []
-        for calisan in self.aktif_calisanlar:
-            if not self.is_available(calisan, baslangic_zamani):
-                continue
-            if self.atanan_saatler[calisan.id] >= AYLIK_SAAT_LIMITI:
-                continue
-            if self.violates_restriction_at_start(calisan, sube, baslangic_zamani):
-                continue
-            adaylar.append(calisan)
-        return adaylar
-
-    def violates_restriction_at_start(self, calisan, sube, baslangic_zamani):
-        """Bir adayin vardiya BASLANGICINDA kural ihlal edip etmedigini kontrol et"""
-        for kural in self.kisitlama_kurallari:
-            if kural.sube_id == sube.id:
-                if baslangic_zamani.time() >= kural.baslangic_saati:
-                    if kural.sart == 'cinsiyet_kadin' and calisan.cinsiyet == 'kadin':
-                        return True
-        return False
+        aday_idler = self.uygunluk.adaylar(sube_id, baslangic_zamani)
+        # Siralama esitliklerinde eski davranis korunsun diye calisan sirasina gore
+        return [self.aktif_calisanlar[i] for i in sorted(self.calisan_sirasi[cid] for cid in aday_idler)]
 
-    def check_restriction_end_time(self, calisan, sube):
+    def check_restriction_end_time(self, calisan, sube_id):
         """Bir calisanin o subede uymasi gereken en erken bitis saatini dondurur"""
         for kural in self.kisitlama_kurallari:
-            if kural.sube_id == sube.id:
+            if kural.sube_id == sube_id:
                 if kural.sart == 'cinsiyet_kadin' and calisan.cinsiyet == 'kadin':
                     return kural.baslangic_saati
         return None
 
     def has_conflicting_shift(self, calisan, yeni_baslangic, yeni_bitis):
         """Cakisma kontrolu"""
-        yeni_baslangic_check = yeni_baslangic + timedelta(microseconds=1)
-        yeni_bitis_check = yeni_bitis - timedelta(microseconds=1)
-        for mevcut_baslangic, mevcut_bitis in self.atanmis_vardiyalar.get(calisan.id, []):
-            if yeni_baslangic_check < mevcut_bitis and mevcut_baslangic < yeni_bitis_check:
-                return True
-        return False
+        self.profil.sayaclar['cakisma_kontrolu'] += 1
+        return self.atanmis_vardiyalar.cakisiyor_mu(calisan.id, yeni_baslangic, yeni_bitis)
 
     # --- SIRALAMA VE ATAMA ---
-    def rank_candidates(self, aday_havuzu, sube, baslangic_zamani):
+    def rank_candidates(self, aday_havuzu, sube_id, baslangic_zamani):
         """Adaylari siralar (Favori onceligi dahil)"""
-        adaylar_ve_puanlar = []
         haftanin_gunu = baslangic_zamani.isoweekday()
+        self.profil.sayaclar['aday_tarama'] += len(aday_havuzu)
+        siralar = np.fromiter((self.calisan_sirasi[aday.id] for aday in aday_havuzu), dtype=np.intp, count=len(aday_havuzu))
+        favoriler = np.fromiter(
+            ((aday.id, sube_id, haftanin_gunu) in self.favori_tercihler for aday in aday_havuzu),
+            dtype=bool, count=len(aday_havuzu),
+        )
 
-        for aday in aday_havuzu:
-            puan = 0
-            is_favorite = False
-            
-            # Favori kontrolü
-            for tercih in self.calisan_tercihleri:
-                if (tercih.calisan_id == aday.id and 
-                    tercih.sube_id == sube.id and 
-                    tercih.gun == haftanin_gunu):
-                    puan += 1000  # Favorilere devasa bonus
-                    is_favorite = True
-                    break
-            
-            # Önceki ay dengesi
-            puan += abs(min(0, self.onceki_ay_dengeleri.get(aday.id, 0))) * 10
-            
-            # Mesafeden puan
-            if aday.enlem and sube.enlem:
-                distance = self.calculate_distance(aday.enlem, aday.boylam, sube.enlem, sube.boylam)
-                puan += max(0, 50 - distance)
-            
-            # Mesai cezası
-            puan -= self.atanan_mesai_saatler[aday.id] * 5
-            
-            adaylar_ve_puanlar.append({'aday': aday, 'puan': puan, 'is_favorite': is_favorite})
-        
-        return sorted(adaylar_ve_puanlar, key=lambda x: (x['is_favorite'], x['puan']), reverse=True)
+        # Favorilere devasa bonus + onceki ay dengesi + mesafe (50 km alti) - mesai cezasi
+        puanlar = (
+            np.where(favoriler, 1000.0, 0.0)
+            + self.denge_puanlari[siralar]
+            + self.mesafe_puanlari[siralar, self.sube_sirasi[sube_id]]
+            - self.atanan_mesai_saatler[siralar] * 5
+        )
+        # Once favoriler, sonra yuksek puan; esitlerde havuz sirasi korunur (lexsort kararli)
+        return [
+            {'aday': aday_havuzu[i], 'puan': float(puanlar[i]), 'is_favorite': bool(favoriler[i])}
+            for i in np.lexsort((-puanlar, ~favoriler))
+        ]
 
-    def create_shift(self, calisan, sube, baslangic, bitis):
+    def create_shift(self, calisan, sube_id, baslangic, bitis):
         """Vardiya olustur ve kaydet"""
         vardiya_suresi = (bitis - baslangic).total_seconds() / 3600
         
@@ -337,81 +539,105 @@ class Command(BaseCommand):
             ))
             return
 
-        # Atanmış vardiyalar listesine ekle
-        self.atanmis_vardiyalar[calisan.id].append((baslangic, bitis))
+        mesai_suresi = self.record_shift(calisan.id, sube_id, baslangic, bitis)
         
-        # Veritabanına kaydet
-        Vardiya.objects.create(
-            sube=sube, 
-            calisan=calisan, 
-            baslangic_zamani=baslangic, 
-            bitis_zamani=bitis, 
-            durum='planlandi'
-        )
-        
-        # Saat hesaplamaları
-        mesai_suresi = max(0, vardiya_suresi - VARDIYA_MAX_SAAT)
-        self.atanan_saatler[calisan.id] += vardiya_suresi
-        self.atanan_mesai_saatler[calisan.id] += mesai_suresi
-        
-        self.stdout.write(
-            f"   [OK] Atama: {calisan.get_full_name() or calisan.username} -> "
-            f"{sube.sube_adi} [{baslangic.strftime('%H:%M')}-{bitis.strftime('%H:%M')}] "
-            f"({vardiya_suresi:.1f} saat){' (MESAI)' if mesai_suresi > 0 else ''}"
-        )
+        if self.ayrintili:
+            self.stdout.write(
+                f"   [OK] Atama: {calisan.get_full_name() or calisan.username} -> "
+                f"{self.sube_adlari[sube_id]} [{baslangic.strftime('%H:%M')}-{bitis.strftime('%H:%M')}] "
+                f"({vardiya_suresi:.1f} saat){' (MESAI)' if mesai_suresi > 0 else ''}"
+            )
+
+    def record_shift(self, calisan_id, sube_id, baslangic, bitis):
+        """Vardiyayi plana ve sayaclara isle; mesai suresini dondurur"""
+        vardiya_suresi = (bitis - baslangic).total_seconds() / 3600
+        self.atanmis_vardiyalar.ekle(calisan_id, baslangic, bitis)
+        # Kayıt planlama sonunda save_plan ile toplu yapılır
+        self.planlanan_vardiyalar.append(Atama(sube_id, calisan_id, baslangic, bitis))
+        self.toplam_atanan_saat += vardiya_suresi
+        return self.add_hours(calisan_id, vardiya_suresi)
+
+    def save_plan(self, yil, ay):
+        """Eski taslaklari sil ve bellekteki plani tek transaction icinde toplu yaz"""
+        # Hata olursa silme de geri alinir, onceki plan oldugu gibi kalir
+        with transaction.atomic():
+            ay_basi, sonraki_ay = ay_araligi(yil, ay)
+            taslak_vardiyalari(yil, ay, self.pencere).delete()
+            Vardiya.objects.bulk_create(
+                [atama.vardiya() for atama in self.planlanan_vardiyalar], batch_size=TOPLU_KAYIT_BOYUTU
+            )
+            # Yayinlanan plan istatistik ozetlerine ayni transaction'da yansir
+            if self.pencere:
+                ozetleri_yeniden_olustur(*self.pencere)
+            else:
+                ozetleri_yeniden_olustur(ay_basi.date(), sonraki_ay.date() - timedelta(days=1))
+        goruntuyu_gecersiz_kil(f'{yil}-{ay:02d}')
+        self.stdout.write(self.style.SUCCESS(f"   [OK] {len(self.planlanan_vardiyalar)} vardiya kaydedildi."))
+
+    def build_dry_run_result(self, donem, yil, ay):
+        """Onerilen plan ve mevcut plana gore sube/gun bazinda fark"""
+        onerilen = [
+            (v.sube_id, v.calisan_id, v.baslangic_zamani, v.bitis_zamani)
+            for v in self.planlanan_vardiyalar
+        ]
+        # Kayitla ayni kume karsilastirilir: ayin (ya da pencerenin) taslaklari
+        fark = plan_farki(mevcut_plan(yil, ay, self.pencere), onerilen, self.sube_adlari)
+
+        for sube in fark['subeler'] if self.ayrintili else []:
+            for gun in sube['gunler']:
+                self.stdout.write(
+                    f"   {sube['sube_adi']} {gun['tarih']}: +{len(gun['eklenen'])} "
+                    f"-{len(gun['silinen'])} ~{len(gun['degisen'])}"
+                )
+        ozet = fark['ozet']
+        self.stdout.write(self.style.SUCCESS(
+            f"   [DENEME] {len(onerilen)} vardiya onerildi: {ozet['eklenen']} eklenen, "
+            f"{ozet['silinen']} silinen, {ozet['degisen']} degisen, {ozet['ayni']} ayni."
+        ))
+        return {
+            'donem': donem,
+            'kalan_bosluk': self.kalan_bosluk,
+            'plan': [
+                {'sube_id': sube_id, 'calisan_id': calisan_id, 'baslangic': bas.isoformat(), 'bitis': bit.isoformat()}
+                for sube_id, calisan_id, bas, bit in onerilen
+            ],
+            'fark': fark,
+        }
+
+    def report_progress(self, asama, yuzde, kalan_bosluk=0):
+        """Varsa ilerleme geri cagrisina asama ve sayaclari bildir"""
+        if self.ilerleme:
+            self.ilerleme(asama, yuzde, len(self.planlanan_vardiyalar), kalan_bosluk)
+
+    def uncovered_hours(self):
+        """Hicbir vardiyanin kapsamadigi toplam blok saati"""
+        # Atamalar her zaman blok icindeki bosluklara yapildigi icin dolu saat = atanan saat
+        return max(0, self.toplam_blok_saati - self.toplam_atanan_saat)
+
+    def coverage_ratio(self):
+        """Blok saatlerinin atanmis vardiyalarla dolan orani (0-1)"""
+        if not self.toplam_blok_saati:
+            return 1
+        return min(1, self.toplam_atanan_saat / self.toplam_blok_saati)
 
     # --- DİĞER YARDIMCI FONKSİYONLAR ---
     def is_available(self, calisan, baslangic_zamani):
         """Calisanin o zamanda musait olup olmadigini kontrol et"""
-        haftanin_gunu = baslangic_zamani.isoweekday()
-        calisan_musaitlik = self.musaitlik_sablonlari.get(calisan.id, {})
-        gun_durumu = calisan_musaitlik.get(haftanin_gunu, 'musait degil')
+        return self.is_available_on(calisan.id, baslangic_zamani.isoweekday(), baslangic_zamani.hour)
+
+    def is_available_on(self, calisan_id, haftanin_gunu, vardiya_baslangic_saati):
+        """Calisanin verilen gun ve baslangic saatinde musait olup olmadigini kontrol et"""
+        calisan_musaitlik = self.musaitlik_sablonlari.get(calisan_id, {})
+        gun_durumu = calisan_musaitlik.get(haftanin_gunu, MusaitlikDurum.MUSAIT_DEGIL)
         
-        if gun_durumu == 'musait degil':
+        if gun_durumu == MusaitlikDurum.MUSAIT_DEGIL:
             return False
 
-        vardiya_baslangic_saati = baslangic_zamani.hour
-        
-        if gun_durumu == '11 sonrasi' and vardiya_baslangic_saati < 11:
+        if gun_durumu == MusaitlikDurum.SAAT_11_SONRASI and vardiya_baslangic_saati < 11:
             return False
-        if gun_durumu == '14 sonrasi' and vardiya_baslangic_saati < 14:
+        if gun_durumu == MusaitlikDurum.SAAT_14_SONRASI and vardiya_baslangic_saati < 14:
             return False
-        if gun_durumu == '17 sonrasi' and vardiya_baslangic_saati < 17:
+        if gun_durumu == MusaitlikDurum.SAAT_17_SONRASI and vardiya_baslangic_saati < 17:
             return False
 
         return True
-
-    def get_musaitlik_dict(self, donem):
-        """Musaitlik sablonlarini sozluk olarak getir"""
-        musaitlik_sablonlari = {}
-        for m in Musaitlik.objects.filter(donem=donem):
-            if m.calisan.id not in musaitlik_sablonlari:
-                musaitlik_sablonlari[m.calisan.id] = {}
-            musaitlik_sablonlari[m.calisan.id][m.gun] = m.musaitlik_durumu
-        return musaitlik_sablonlari
-
-    def get_calisma_saatleri_dict(self):
-        """Sube calisma saatlerini sozluk olarak getir"""
-        saatler = {}
-        for scs in SubeCalismaSaati.objects.all():
-            if scs.sube.id not in saatler:
-                saatler[scs.sube.id] = {}
-            saatler[scs.sube.id][scs.gun] = {
-                'acilis': scs.acilis_saati if scs.acilis_saati else time(0, 0), 
-                'kapanis': scs.kapanis_saati if scs.kapanis_saati else time(0, 0), 
-                'kapali': scs.kapali
-            }
-        return saatler
-        
-    def calculate_distance(self, lat1, lon1, lat2, lon2):
-        """Iki koordinat arasindaki mesafeyi hesapla (Haversine)"""
-        if not all([lat1, lon1, lat2, lon2]):
-            return 9999
-        
-        R = 6371  # Dunya yaricapi (km)
-        lat1, lon1, lat2, lon2 = map(math.radians, [float(lat1), float(lon1), float(lat2), float(lon2)])
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = math.sin(dlat / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c
\ No newline at end of file
@@ -0,0 +1,28 @@
+# apps/schedules/management/commands/generate_synthetic_data.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.schedules.planlama.sentetik import sentetik_veri_olustur, sentetik_veriyi_sil
+
+
+class Command(BaseCommand):
+    help = 'Planlama motorunu denemek icin tohuma gore tekrarlanabilir sentetik veri olusturur.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('donem', type=str, help='Musaitliklerin olusturulacagi donem (YYYY-AA formatinda)')
+        parser.add_argument('--calisan', type=int, default=50, help='Calisan sayisi')
+        parser.add_argument('--sube', type=int, default=5, help='Sube sayisi')
+        parser.add_argument('--tohum', type=int, default=0, help='Rastgele sayi tohumu')
+        parser.add_argument('--temizle', action='store_true', help='Once onceki sentetik veriyi sil')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['temizle']:
+                sentetik_veriyi_sil()
+                self.stdout.write('Onceki sentetik veri silindi.')
+            sayilar = sentetik_veri_olustur(options['calisan'], options['sube'], options['donem'], options['tohum'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{sayilar['calisan']} calisan, {sayilar['sube']} sube, {sayilar['tercih']} tercih ve "
+            f"{sayilar['kural']} kural olusturuldu."
+        ))
@@ -0,0 +1,29 @@
+# apps/schedules/management/commands/rebuild_daily_stats.py
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.schedules.istatistik import ozetleri_yeniden_olustur
+
+
+class Command(BaseCommand):
+    help = (
+        'Gunluk vardiya ozetlerini (sube x calisan x gun) vardiyalardan yeniden olusturur. Ilk kurulumda '
+        'gecmisi doldurmak ya da ozetler disaridan degisen vardiyalarla ayrisinca kullanilir.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='baslangic', type=date.fromisoformat, metavar='YYYY-AA-GG',
+                            help='Bu gunden itibaren (verilmezse tum gecmis)')
+        parser.add_argument('--to', dest='bitis', type=date.fromisoformat, metavar='YYYY-AA-GG',
+                            help='Bu gune kadar, dahil')
+        parser.add_argument('--sube', type=int, action='append', metavar='SUBE_ID',
+                            help='Sadece bu sube(ler); tekrarlanabilir')
+
+    def handle(self, *args, **options):
+        baslangic, bitis = options['baslangic'], options['bitis']
+        if baslangic and bitis and bitis < baslangic:
+            raise CommandError('--to, --from tarihinden once olamaz.')
+        satir_sayisi = ozetleri_yeniden_olustur(baslangic, bitis, options['sube'])
+        self.stdout.write(self.style.SUCCESS(f'{satir_sayisi} gunluk ozet satiri yazildi.'))
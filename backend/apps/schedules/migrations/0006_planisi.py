@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0005_vardiya_gercek_baslangic_zamani_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlanIsi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('donem', models.CharField(max_length=7, verbose_name='Dönem (YYYY-AA)')),
+                ('durum', models.CharField(choices=[('bekliyor', 'Sırada Bekliyor'), ('calisiyor', 'Çalışıyor'), ('tamamlandi', 'Tamamlandı'), ('hata', 'Hata')], default='bekliyor', max_length=20)),
+                ('asama', models.CharField(blank=True, choices=[('veri', 'Veri Yükleniyor'), ('bloklar', 'Vardiya Blokları Hazırlanıyor'), ('favoriler', 'Favori Atamaları'), ('doldurma', 'Boşluklar Dolduruluyor'), ('kayit', 'Plan Kaydediliyor')], max_length=20, verbose_name='Aşama')),
+                ('ilerleme', models.PositiveSmallIntegerField(default=0, verbose_name='İlerleme (%)')),
+                ('atama_sayisi', models.PositiveIntegerField(default=0, verbose_name='Yapılan Atama')),
+                ('kalan_bosluk', models.PositiveIntegerField(default=0, verbose_name='Kalan Boşluk')),
+                ('hata_mesaji', models.TextField(blank=True)),
+                ('olusturulma_tarihi', models.DateTimeField(auto_now_add=True)),
+                ('guncellenme_tarihi', models.DateTimeField(auto_now=True)),
+                ('bitis_tarihi', models.DateTimeField(blank=True, null=True)),
+                ('olusturan', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='plan_isleri', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0006_planisi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='planisi',
+            name='deneme',
+            field=models.BooleanField(default=False, verbose_name='Deneme (veritabanına yazmaz)'),
+        ),
+        migrations.AddField(
+            model_name='planisi',
+            name='sonuc',
+            field=models.JSONField(blank=True, null=True, verbose_name='Deneme Sonucu (plan ve fark)'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0007_planisi_deneme_sonuc'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='planisi',
+            name='profil',
+            field=models.JSONField(blank=True, null=True, verbose_name='Profil (aşama süreleri ve sayaçlar)'),
+        ),
+    ]
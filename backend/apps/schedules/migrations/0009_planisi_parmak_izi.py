@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0008_planisi_profil'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='planisi',
+            name='onbellekten',
+            field=models.BooleanField(default=False, verbose_name='Önceki Sonuç Kullanıldı'),
+        ),
+        migrations.AddField(
+            model_name='planisi',
+            name='parmak_izi',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='Girdi Parmak İzi'),
+        ),
+    ]
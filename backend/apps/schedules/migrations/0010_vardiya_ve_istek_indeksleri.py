@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('branches', '0001_initial'),
+        ('schedules', '0009_planisi_parmak_izi'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vardiya',
+            index=models.Index(fields=['durum', 'baslangic_zamani'], name='vardiya_durum_bas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vardiya',
+            index=models.Index(fields=['calisan', 'durum', 'baslangic_zamani'], name='vardiya_calisan_durum_bas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vardiya',
+            index=models.Index(fields=['baslangic_zamani'], name='vardiya_bas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vardiya',
+            index=models.Index(fields=['sube', 'baslangic_zamani'], name='vardiya_sube_bas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vardiyaiptalistegi',
+            index=models.Index(fields=['durum', 'olusturulma_tarihi'], name='iptal_durum_olusturma_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vardiyaiptalistegi',
+            index=models.Index(fields=['durum', 'guncellenme_tarihi'], name='iptal_durum_guncelleme_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vardiyaistegi',
+            index=models.Index(fields=['durum', 'olusturulma_tarihi'], name='istek_durum_olusturma_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vardiyaistegi',
+            index=models.Index(fields=['durum', 'guncellenme_tarihi'], name='istek_durum_guncelleme_idx'),
+        ),
+    ]
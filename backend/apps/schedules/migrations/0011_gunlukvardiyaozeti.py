@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('branches', '0001_initial'),
+        ('schedules', '0010_vardiya_ve_istek_indeksleri'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GunlukVardiyaOzeti',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarih', models.DateField(verbose_name='Gün (yerel)')),
+                ('vardiya_sayisi', models.PositiveIntegerField(default=0, verbose_name='Toplam Vardiya')),
+                ('planlanan', models.PositiveIntegerField(default=0, verbose_name='Yayınlanmış, İptal Edilmemiş')),
+                ('tamamlanan', models.PositiveIntegerField(default=0)),
+                ('iptal', models.PositiveIntegerField(default=0)),
+                ('planlanan_saat', models.FloatField(default=0)),
+                ('gercek_saat', models.FloatField(default=0, verbose_name='Gerçekleşen Saat')),
+                ('calisan', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='gunluk_ozetler', to=settings.AUTH_USER_MODEL)),
+                ('sube', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='gunluk_ozetler', to='branches.sube')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tarih'], name='ozet_tarih_idx')],
+                'unique_together': {('sube', 'calisan', 'tarih')},
+            },
+        ),
+    ]
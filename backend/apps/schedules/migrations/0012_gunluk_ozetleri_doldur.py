@@ -0,0 +1,62 @@
+# Mevcut vardiyalardan gunluk ozetleri doldurur; istatistik sayfasi
+# yalnizca ozet tablosunu okudugu icin gecmis bos kalmamali.
+
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+
+# Migration o gunku durum degerleriyle calisir; istatistik.PLANLANAN_DURUMLAR ile ayni
+PLANLANAN_DURUMLAR = ['planlandi', 'baslatildi', 'tamamlandi', 'iptal_istegi']
+TOPLU_KAYIT_BOYUTU = 2000
+
+
+def _sure(bitis, baslangic):
+    return ExpressionWrapper(F(bitis) - F(baslangic), output_field=DurationField())
+
+
+def _saat(sure):
+    return (sure or timedelta(0)).total_seconds() / 3600
+
+
+def ozetleri_doldur(apps, schema_editor):
+    Vardiya = apps.get_model('schedules', 'Vardiya')
+    GunlukVardiyaOzeti = apps.get_model('schedules', 'GunlukVardiyaOzeti')
+
+    gruplar = Vardiya.objects.annotate(tarih=TruncDate('baslangic_zamani')).values(
+        'sube_id', 'calisan_id', 'tarih'
+    ).annotate(
+        vardiya_sayisi=Count('id'),
+        planlanan=Count('id', filter=Q(durum__in=PLANLANAN_DURUMLAR)),
+        tamamlanan=Count('id', filter=Q(durum='tamamlandi')),
+        iptal=Count('id', filter=Q(durum='iptal')),
+        planlanan_sure=Sum(_sure('bitis_zamani', 'baslangic_zamani'), filter=Q(durum__in=PLANLANAN_DURUMLAR)),
+        gercek_sure=Sum(
+            _sure('gercek_bitis_zamani', 'gercek_baslangic_zamani'),
+            filter=Q(durum='tamamlandi', gercek_baslangic_zamani__isnull=False, gercek_bitis_zamani__isnull=False),
+        ),
+    ).order_by()
+
+    GunlukVardiyaOzeti.objects.all().delete()
+    GunlukVardiyaOzeti.objects.bulk_create([
+        GunlukVardiyaOzeti(
+            sube_id=grup['sube_id'], calisan_id=grup['calisan_id'], tarih=grup['tarih'],
+            vardiya_sayisi=grup['vardiya_sayisi'], planlanan=grup['planlanan'],
+            tamamlanan=grup['tamamlanan'], iptal=grup['iptal'],
+            planlanan_saat=_saat(grup['planlanan_sure']), gercek_saat=_saat(grup['gercek_sure']),
+        )
+        for grup in gruplar
+    ], batch_size=TOPLU_KAYIT_BOYUTU)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0011_gunlukvardiyaozeti'),
+    ]
+
+    operations = [
+        # Geri alinirken tablo 0011 ile birlikte kalkar; burada yapilacak bir sey yok
+        migrations.RunPython(ozetleri_doldur, migrations.RunPython.noop),
+    ]
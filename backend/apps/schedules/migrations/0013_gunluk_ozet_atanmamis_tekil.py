@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:49
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+
+# 0012 ile ayni; migration o gunku durum degerleriyle calisir
+PLANLANAN_DURUMLAR = ['planlandi', 'baslatildi', 'tamamlandi', 'iptal_istegi']
+
+
+def _sure(bitis, baslangic):
+    return ExpressionWrapper(F(bitis) - F(baslangic), output_field=DurationField())
+
+
+def _saat(sure):
+    return (sure or timedelta(0)).total_seconds() / 3600
+
+
+def atanmamis_tekrarlari_birlestir(apps, schema_editor):
+    """
+    Kisit eklenmeden once eszamanli guncellemelerin olusturdugu tekrar eden
+    atanmamis satirlari silip o gunleri vardiyalardan tek satir olarak yeniden yazar.
+    """
+    Vardiya = apps.get_model('schedules', 'Vardiya')
+    GunlukVardiyaOzeti = apps.get_model('schedules', 'GunlukVardiyaOzeti')
+
+    tekrarlar = GunlukVardiyaOzeti.objects.filter(calisan__isnull=True).values('sube_id', 'tarih').annotate(
+        adet=Count('id')
+    ).filter(adet__gt=1).order_by()
+    for tekrar in list(tekrarlar):
+        sube_id, tarih = tekrar['sube_id'], tekrar['tarih']
+        GunlukVardiyaOzeti.objects.filter(sube_id=sube_id, calisan__isnull=True, tarih=tarih).delete()
+        toplamlar = Vardiya.objects.filter(sube_id=sube_id, calisan__isnull=True).annotate(
+            tarih=TruncDate('baslangic_zamani')
+        ).filter(tarih=tarih).aggregate(
+            vardiya_sayisi=Count('id'),
+            planlanan=Count('id', filter=Q(durum__in=PLANLANAN_DURUMLAR)),
+            tamamlanan=Count('id', filter=Q(durum='tamamlandi')),
+            iptal=Count('id', filter=Q(durum='iptal')),
+            planlanan_sure=Sum(_sure('bitis_zamani', 'baslangic_zamani'), filter=Q(durum__in=PLANLANAN_DURUMLAR)),
+            gercek_sure=Sum(
+                _sure('gercek_bitis_zamani', 'gercek_baslangic_zamani'),
+                filter=Q(durum='tamamlandi', gercek_baslangic_zamani__isnull=False, gercek_bitis_zamani__isnull=False),
+            ),
+        )
+        if toplamlar['vardiya_sayisi']:
+            GunlukVardiyaOzeti.objects.create(
+                sube_id=sube_id, calisan=None, tarih=tarih,
+                vardiya_sayisi=toplamlar['vardiya_sayisi'], planlanan=toplamlar['planlanan'],
+                tamamlanan=toplamlar['tamamlanan'], iptal=toplamlar['iptal'],
+                planlanan_saat=_saat(toplamlar['planlanan_sure']), gercek_saat=_saat(toplamlar['gercek_sure']),
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('branches', '0001_initial'),
+        ('schedules', '0012_gunluk_ozetleri_doldur'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(atanmamis_tekrarlari_birlestir, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='gunlukvardiyaozeti',
+            constraint=models.UniqueConstraint(condition=models.Q(('calisan__isnull', True)), fields=('sube', 'tarih'), name='ozet_atanmamis_tekil'),
+        ),
+    ]
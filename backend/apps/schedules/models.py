@@ -3,7 +3,7 @@
 from django.db import models
 
 # Choices sınıflarımızı yeni choices.py dosyasından import ediyoruz
-from .choices import Gunler, MusaitlikDurum, VardiyaDurum, IstekTipi, IstekDurum, KuralSart
+from .choices import Gunler, MusaitlikDurum, VardiyaDurum, IstekTipi, IstekDurum, KuralSart, PlanIsiDurum, PlanAsama
 
 class Vardiya(models.Model):
     durum = models.CharField(max_length=20, choices=VardiyaDurum.choices, default=VardiyaDurum.TASLAK)
@@ -14,6 +14,17 @@ class Vardiya(models.Model):
     gercek_baslangic_zamani = models.DateTimeField(null=True, blank=True, verbose_name="Gerçek Başlangıç Zamanı")
     gercek_bitis_zamani = models.DateTimeField(null=True, blank=True, verbose_name="Gerçek Bitiş Zamanı")
 
+    class Meta:
+        indexes = [
+            # Motorun ay okuma/taslak silme ve cakisma sorgulari: durum esitligi + zaman araligi
+            models.Index(fields=['durum', 'baslangic_zamani'], name='vardiya_durum_bas_idx'),
+            # Calisanin kendi vardiyalari ve atama oncesi cakisma kontrolu
+            models.Index(fields=['calisan', 'durum', 'baslangic_zamani'], name='vardiya_calisan_durum_bas_idx'),
+            # Takvim penceresi ve (baslangic_zamani, id) imlecli sayfalama; sube suzgecli hali
+            models.Index(fields=['baslangic_zamani'], name='vardiya_bas_idx'),
+            models.Index(fields=['sube', 'baslangic_zamani'], name='vardiya_sube_bas_idx'),
+        ]
+
     def __str__(self):
         calisan_adi = (self.calisan.get_full_name() or self.calisan.username) if self.calisan else "Atanmamış"
         return f"{self.sube.sube_adi} - {calisan_adi} - {self.baslangic_zamani.strftime('%d %b %Y %H:%M')}"
@@ -72,6 +83,13 @@ class VardiyaIstegi(models.Model):
     olusturulma_tarihi = models.DateTimeField(auto_now_add=True)
     guncellenme_tarihi = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Bekleyen istek listesi (olusturulma sirasiyla) ve onay gecmisi (son guncellenenler)
+            models.Index(fields=['durum', 'olusturulma_tarihi'], name='istek_durum_olusturma_idx'),
+            models.Index(fields=['durum', 'guncellenme_tarihi'], name='istek_durum_guncelleme_idx'),
+        ]
+
     def __str__(self):
         return f"{self.istek_yapan.username}, {self.hedef_calisan.username}'in vardiyasını istiyor. Durum: {self.get_durum_display()}"
 
@@ -83,5 +101,64 @@ class VardiyaIptalIstegi(models.Model):
     olusturulma_tarihi = models.DateTimeField(auto_now_add=True)
     guncellenme_tarihi = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['durum', 'olusturulma_tarihi'], name='iptal_durum_olusturma_idx'),
+            models.Index(fields=['durum', 'guncellenme_tarihi'], name='iptal_durum_guncelleme_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.istek_yapan.username} - {self.vardiya} için iptal isteği. Durum: {self.get_durum_display()}"
+
+
+class PlanIsi(models.Model):
+    """Arka planda çalışan bir plan oluşturma işi ve ilerleme durumu"""
+    donem = models.CharField(max_length=7, verbose_name="Dönem (YYYY-AA)")
+    deneme = models.BooleanField(default=False, verbose_name="Deneme (veritabanına yazmaz)")
+    durum = models.CharField(max_length=20, choices=PlanIsiDurum.choices, default=PlanIsiDurum.BEKLIYOR)
+    asama = models.CharField(max_length=20, choices=PlanAsama.choices, blank=True, verbose_name="Aşama")
+    ilerleme = models.PositiveSmallIntegerField(default=0, verbose_name="İlerleme (%)")
+    atama_sayisi = models.PositiveIntegerField(default=0, verbose_name="Yapılan Atama")
+    kalan_bosluk = models.PositiveIntegerField(default=0, verbose_name="Kalan Boşluk")
+    hata_mesaji = models.TextField(blank=True)
+    sonuc = models.JSONField(null=True, blank=True, verbose_name="Deneme Sonucu (plan ve fark)")
+    profil = models.JSONField(null=True, blank=True, verbose_name="Profil (aşama süreleri ve sayaçlar)")
+    parmak_izi = models.CharField(max_length=64, blank=True, db_index=True, verbose_name="Girdi Parmak İzi")
+    onbellekten = models.BooleanField(default=False, verbose_name="Önceki Sonuç Kullanıldı")
+    olusturan = models.ForeignKey('users.CustomUser', on_delete=models.SET_NULL, null=True, blank=True, related_name='plan_isleri')
+    olusturulma_tarihi = models.DateTimeField(auto_now_add=True)
+    guncellenme_tarihi = models.DateTimeField(auto_now=True)
+    bitis_tarihi = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.donem} plan işi - {self.get_durum_display()} (%{self.ilerleme})"
+
+
+class GunlukVardiyaOzeti(models.Model):
+    """
+    Şube x çalışan x gün bazında vardiya sayıları ve saatleri. İstatistikler
+    ham vardiyalar yerine bu tablodan okunur; vardiyayı değiştiren işlemler
+    ilgili satırları istatistik.ozetleri_guncelle ile yeniden hesaplar.
+    """
+    sube = models.ForeignKey('branches.Sube', on_delete=models.CASCADE, related_name='gunluk_ozetler')
+    calisan = models.ForeignKey('users.CustomUser', on_delete=models.CASCADE, null=True, blank=True, related_name='gunluk_ozetler')
+    tarih = models.DateField(verbose_name="Gün (yerel)")
+    vardiya_sayisi = models.PositiveIntegerField(default=0, verbose_name="Toplam Vardiya")
+    planlanan = models.PositiveIntegerField(default=0, verbose_name="Yayınlanmış, İptal Edilmemiş")
+    tamamlanan = models.PositiveIntegerField(default=0)
+    iptal = models.PositiveIntegerField(default=0)
+    planlanan_saat = models.FloatField(default=0)
+    gercek_saat = models.FloatField(default=0, verbose_name="Gerçekleşen Saat")
+
+    class Meta:
+        unique_together = ('sube', 'calisan', 'tarih')
+        indexes = [models.Index(fields=['tarih'], name='ozet_tarih_idx')]
+        # unique_together NULL çalışanı ayırt etmez; atanmamış vardiyaların satırı ayrıca tekil
+        constraints = [
+            models.UniqueConstraint(
+                fields=['sube', 'tarih'], condition=models.Q(calisan__isnull=True), name='ozet_atanmamis_tekil',
+            ),
+        ]
+
     def __str__(self):
-        return f"{self.istek_yapan.username} - {self.vardiya} için iptal isteği. Durum: {self.get_durum_display()}"
\ No newline at end of file
+        return f"{self.sube} - {self.calisan} - {self.tarih}"
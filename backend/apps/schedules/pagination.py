@@ -0,0 +1,78 @@
+# apps/schedules/pagination.py
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class VardiyaSayfalama(BasePagination):
+    """
+    (baslangic_zamani, id) uzerinde anahtar kumesi (keyset) sayfalama. Imlec
+    son satirin anahtaridir; sonraki sayfa OFFSET yerine 'bu anahtardan
+    buyuk' kosuluyla okunur, bu yuzden derin sayfalar da ilk sayfa kadar
+    hizlidir ve araya eklenen vardiyalar sayfalari kaydirmaz.
+    """
+
+    imlec_parametresi = 'imlec'
+    boyut_parametresi = 'sayfa_boyutu'
+    sayfa_boyutu = 500
+    azami_sayfa_boyutu = 2000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        boyut = self.boyut(request)
+        queryset = queryset.order_by('baslangic_zamani', 'id')
+        imlec = request.query_params.get(self.imlec_parametresi)
+        if imlec:
+            baslangic, vardiya_id = self.coz(imlec)
+            queryset = queryset.filter(
+                Q(baslangic_zamani__gt=baslangic) | Q(baslangic_zamani=baslangic, id__gt=vardiya_id)
+            )
+        # Bir fazlasi okunur; varsa sonraki sayfa vardir
+        satirlar = list(queryset[:boyut + 1])
+        self.sonraki = satirlar[boyut - 1] if len(satirlar) > boyut else None
+        return satirlar[:boyut]
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.sonraki_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def boyut(self, request):
+        try:
+            boyut = int(request.query_params.get(self.boyut_parametresi, self.sayfa_boyutu))
+        except ValueError:
+            return self.sayfa_boyutu
+        return min(max(boyut, 1), self.azami_sayfa_boyutu)
+
+    def sonraki_link(self):
+        if self.sonraki is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.imlec_parametresi, self.kodla(self.sonraki))
+
+    @staticmethod
+    def kodla(vardiya):
+        anahtar = f'{vardiya.baslangic_zamani.isoformat()}|{vardiya.id}'
+        return urlsafe_b64encode(anahtar.encode()).decode()
+
+    @staticmethod
+    def coz(imlec):
+        try:
+            zaman, vardiya_id = urlsafe_b64decode(imlec.encode()).decode().split('|')
+            return datetime.fromisoformat(zaman), int(vardiya_id)
+        except (ValueError, UnicodeDecodeError):
+            raise NotFound('Geçersiz imleç.')
@@ -0,0 +1,2 @@
+# apps/schedules/planlama/__init__.py
+# create_schedule motorunun kullandigi bellek ici planlama yapilari.
@@ -0,0 +1,104 @@
+# apps/schedules/planlama/cakisma.py
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import timedelta
+
+from apps.schedules.choices import VardiyaDurum
+from apps.schedules.models import Vardiya
+
+# Calisanin mesgul sayildigi vardiya durumlari
+MESGUL_DURUMLAR = [VardiyaDurum.PLANLANDI, VardiyaDurum.TASLAK]
+# Bu kadardan uzun vardiya yok sayilir; cakisma sorgusunun baslangic_zamani alt siniri
+AZAMI_VARDIYA_SURESI = timedelta(days=1)
+
+
+class CalisanVardiyalari:
+    """
+    Bir calisanin vardiya araliklarini baslangic ve bitislere gore ayri ayri
+    sirali tutar. [bas, bit) ile cakisan vardiya sayisi
+    (baslangici bit'ten once olanlar) - (bitisi bas'tan once ya da ona esit olanlar)
+    oldugundan sorgular O(log n)'dir; araliklarin kendi aralarinda cakismasi gerekmez.
+
+    Ucu uca degen vardiyalar (biri bitince digeri baslar) cakisma sayilmaz.
+    """
+
+    __slots__ = ('_baslar', '_bitisler')
+
+    def __init__(self, araliklar=()):
+        self._baslar = sorted(bas for bas, _ in araliklar)
+        self._bitisler = sorted(bit for _, bit in araliklar)
+
+    def ekle(self, baslangic, bitis):
+        insort(self._baslar, baslangic)
+        insort(self._bitisler, bitis)
+
+    def cikar(self, baslangic, bitis):
+        """Daha once eklenmis bir araligi kaldirir"""
+        del self._baslar[bisect_left(self._baslar, baslangic)]
+        del self._bitisler[bisect_left(self._bitisler, bitis)]
+
+    def cakisan_sayisi(self, baslangic, bitis):
+        return bisect_left(self._baslar, bitis) - bisect_right(self._bitisler, baslangic)
+
+    def cakisiyor_mu(self, baslangic, bitis, dinlenme=timedelta(0)):
+        """
+        [baslangic, bitis) ile cakisan ya da ondan 'dinlenme' sureden daha yakin
+        bir vardiya var mi? dinlenme=timedelta(hours=11) "11 saat icinde baska
+        vardiya var mi" sorusudur; tam 11 saat ara kabul edilir.
+        """
+        return self.cakisan_sayisi(baslangic - dinlenme, bitis + dinlenme) > 0
+
+    def __len__(self):
+        return len(self._baslar)
+
+
+class VardiyaIndeksi:
+    """calisan_id -> CalisanVardiyalari; motor ve view'lar ayni cakisma kurallarini kullanir"""
+
+    __slots__ = ('_calisanlar',)
+
+    def __init__(self, vardiyalar=()):
+        """vardiyalar: (calisan_id, baslangic, bitis) uclulerinden olusan bir dizi"""
+        gruplar = {}
+        for calisan_id, bas, bit in vardiyalar:
+            gruplar.setdefault(calisan_id, []).append((bas, bit))
+        self._calisanlar = {calisan_id: CalisanVardiyalari(araliklar) for calisan_id, araliklar in gruplar.items()}
+
+    @classmethod
+    def yukle(cls, baslangic, bitis, dinlenme=timedelta(0), durumlar=MESGUL_DURUMLAR):
+        """
+        [baslangic - dinlenme, bitis + dinlenme) penceresine degen mesgul
+        vardiyalari tek sorguyla yukler; bu pencere icindeki sorgular icin yeterlidir.
+        """
+        satirlar = Vardiya.objects.filter(
+            durum__in=durumlar,
+            calisan__isnull=False,
+            # Alt sinir olmadan (durum, baslangic_zamani) aramasi tum gecmisi okurdu
+            baslangic_zamani__gt=baslangic - dinlenme - AZAMI_VARDIYA_SURESI,
+            baslangic_zamani__lt=bitis + dinlenme,
+            bitis_zamani__gt=baslangic - dinlenme,
+        ).values_list('calisan_id', 'baslangic_zamani', 'bitis_zamani')
+        return cls(satirlar)
+
+    def calisan(self, calisan_id):
+        vardiyalar = self._calisanlar.get(calisan_id)
+        if vardiyalar is None:
+            vardiyalar = self._calisanlar[calisan_id] = CalisanVardiyalari()
+        return vardiyalar
+
+    def ekle(self, calisan_id, baslangic, bitis):
+        self.calisan(calisan_id).ekle(baslangic, bitis)
+
+    def cikar(self, calisan_id, baslangic, bitis):
+        self._calisanlar[calisan_id].cikar(baslangic, bitis)
+
+    def cakisiyor_mu(self, calisan_id, baslangic, bitis, dinlenme=timedelta(0)):
+        vardiyalar = self._calisanlar.get(calisan_id)
+        return vardiyalar is not None and vardiyalar.cakisiyor_mu(baslangic, bitis, dinlenme)
+
+    def cakisan_calisanlar(self, baslangic, bitis, dinlenme=timedelta(0)):
+        """Verilen araliga (ve dinlenme payina) vardiyasi degen calisanlarin id kumesi"""
+        return {
+            calisan_id for calisan_id, vardiyalar in self._calisanlar.items()
+            if vardiyalar.cakisiyor_mu(baslangic, bitis, dinlenme)
+        }
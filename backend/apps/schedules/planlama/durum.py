@@ -0,0 +1,43 @@
+# apps/schedules/planlama/durum.py
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from apps.schedules.choices import VardiyaDurum
+from apps.schedules.models import Vardiya
+from apps.schedules.planlama.kapsama import BlokKapsamasi
+
+
+@dataclass(slots=True)
+class Blok:
+    """Bir subenin bir gunluk acik saatleri; doluluk kapsama'da tutulur"""
+    sube_id: int
+    baslangic: datetime
+    bitis: datetime
+    kapsama: BlokKapsamasi
+
+    @property
+    def saat(self):
+        return (self.bitis - self.baslangic).total_seconds() / 3600
+
+
+@dataclass(slots=True)
+class Atama:
+    """
+    Motorun bellekte tuttugu vardiya. Alan adlari Vardiya ile aynidir; ORM
+    nesnesi sadece kayit sirasinda (vardiya()) olusturulur. Motor taslak
+    yazar; calisanlar vardiyayi plan yayinlaninca (yayin.plani_yayinla) gorur.
+    """
+    sube_id: int
+    calisan_id: int
+    baslangic_zamani: datetime
+    bitis_zamani: datetime
+
+    def vardiya(self):
+        return Vardiya(
+            sube_id=self.sube_id,
+            calisan_id=self.calisan_id,
+            baslangic_zamani=self.baslangic_zamani,
+            bitis_zamani=self.bitis_zamani,
+            durum=VardiyaDurum.TASLAK,
+        )
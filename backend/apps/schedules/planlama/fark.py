@@ -0,0 +1,129 @@
+# apps/schedules/planlama/fark.py
+
+from collections import defaultdict
+from datetime import datetime
+
+from django.utils import timezone
+
+from apps.schedules.choices import VardiyaDurum
+from apps.schedules.models import Vardiya
+
+
+def yerel_zaman(zaman, saat_dilimi=None):
+    """DB'den gelen zamani motorun kullandigi naive yerel zamana cevir"""
+    if timezone.is_aware(zaman):
+        return timezone.localtime(zaman, saat_dilimi).replace(tzinfo=None)
+    return zaman
+
+
+def _vardiya_dict(calisan_id, baslangic, bitis):
+    return {'calisan_id': calisan_id, 'baslangic': baslangic.isoformat(), 'bitis': bitis.isoformat()}
+
+
+def ay_araligi(yil, ay):
+    """
+    Ayin yerel saatle [baslangic, sonraki ay) araligi. __year/__month yerine
+    bununla suzulen sorgular (durum, baslangic_zamani) indeksinde aralik
+    aramasi yapar.
+    """
+    sonraki = (yil + 1, 1) if ay == 12 else (yil, ay + 1)
+    return timezone.make_aware(datetime(yil, ay, 1)), timezone.make_aware(datetime(*sonraki, 1))
+
+
+def taslak_vardiyalari(yil, ay, pencere=None):
+    """
+    Motorun silip yeniden yazdigi vardiyalar: ayin taslaklari, pencere
+    (baslangic, bitis, sube_idler) verildiyse sadece pencerenin icindekiler.
+    """
+    ay_basi, sonraki_ay = ay_araligi(yil, ay)
+    taslaklar = Vardiya.objects.filter(
+        durum=VardiyaDurum.TASLAK, baslangic_zamani__gte=ay_basi, baslangic_zamani__lt=sonraki_ay
+    )
+    if pencere:
+        baslangic, bitis, sube_idler = pencere
+        taslaklar = taslaklar.filter(baslangic_zamani__date__range=(baslangic, bitis))
+        if sube_idler:
+            taslaklar = taslaklar.filter(sube_id__in=sube_idler)
+    return taslaklar
+
+
+def ay_vardiyalari(yil, ay, durumlar):
+    """Ayin verilen durumlardaki vardiyalari: (sube_id, calisan_id, baslangic, bitis, durum) listesi"""
+    ay_basi, sonraki_ay = ay_araligi(yil, ay)
+    satirlar = Vardiya.objects.filter(
+        durum__in=durumlar, baslangic_zamani__gte=ay_basi, baslangic_zamani__lt=sonraki_ay
+    ).values_list('sube_id', 'calisan_id', 'baslangic_zamani', 'bitis_zamani', 'durum')
+    # Binlerce satirda her seferinde aktif saat dilimine bakmamak icin bir kez alinir
+    saat_dilimi = timezone.get_current_timezone()
+    return [
+        (sube_id, calisan_id, yerel_zaman(bas, saat_dilimi), yerel_zaman(bit, saat_dilimi), durum)
+        for sube_id, calisan_id, bas, bit, durum in satirlar
+    ]
+
+
+def mevcut_plan(yil, ay, pencere=None):
+    """
+    Kaydin yerine yazacagi vardiyalar (taslak_vardiyalari): (sube_id, calisan_id,
+    baslangic, bitis) listesi. Yayinlanmis vardiyalar kayitta yerinde kalir,
+    bu yuzden farka girmez.
+    """
+    satirlar = taslak_vardiyalari(yil, ay, pencere).values_list(
+        'sube_id', 'calisan_id', 'baslangic_zamani', 'bitis_zamani'
+    )
+    saat_dilimi = timezone.get_current_timezone()
+    return [
+        (sube_id, calisan_id, yerel_zaman(bas, saat_dilimi), yerel_zaman(bit, saat_dilimi))
+        for sube_id, calisan_id, bas, bit in satirlar
+    ]
+
+
+def plan_farki(mevcut, onerilen, sube_adlari=None):
+    """
+    Iki plani sube/gun bazinda karsilastirir.
+
+    mevcut ve onerilen (sube_id, calisan_id, baslangic, bitis) listeleridir.
+    Ayni calisan ve saatler 'ayni' sayilir. Kalanlardan ayni saat araligi
+    farkli calisana gecmisse ya da ayni calisanin ayni baslangicli vardiyasinin
+    bitisi degismisse 'degisen', digerleri 'eklenen'/'silinen' olur.
+    """
+    sube_adlari = sube_adlari or {}
+    gruplar = defaultdict(lambda: ([], []))
+    for sube_id, calisan_id, bas, bit in mevcut:
+        gruplar[(sube_id, bas.date())][0].append((calisan_id, bas, bit))
+    for sube_id, calisan_id, bas, bit in onerilen:
+        gruplar[(sube_id, bas.date())][1].append((calisan_id, bas, bit))
+
+    ozet = {'ayni': 0, 'eklenen': 0, 'silinen': 0, 'degisen': 0}
+    subeler = {}
+    for (sube_id, tarih), (eski_liste, yeni_liste) in sorted(gruplar.items()):
+        eskiler, yeniler = list(eski_liste), list(yeni_liste)
+
+        for vardiya in list(yeniler):
+            if vardiya in eskiler:
+                eskiler.remove(vardiya)
+                yeniler.remove(vardiya)
+                ozet['ayni'] += 1
+
+        degisen = []
+        for eslesme in (lambda v: (v[1], v[2]), lambda v: (v[0], v[1])):
+            for yeni in list(yeniler):
+                eski = next((v for v in eskiler if eslesme(v) == eslesme(yeni)), None)
+                if eski:
+                    eskiler.remove(eski)
+                    yeniler.remove(yeni)
+                    degisen.append({'eski': _vardiya_dict(*eski), 'yeni': _vardiya_dict(*yeni)})
+
+        if not (eskiler or yeniler or degisen):
+            continue
+        ozet['eklenen'] += len(yeniler)
+        ozet['silinen'] += len(eskiler)
+        ozet['degisen'] += len(degisen)
+        sube = subeler.setdefault(sube_id, {'sube_id': sube_id, 'sube_adi': sube_adlari.get(sube_id), 'gunler': []})
+        sube['gunler'].append({
+            'tarih': tarih.isoformat(),
+            'eklenen': [_vardiya_dict(*v) for v in yeniler],
+            'silinen': [_vardiya_dict(*v) for v in eskiler],
+            'degisen': degisen,
+        })
+
+    return {'ozet': ozet, 'subeler': list(subeler.values())}
@@ -0,0 +1,147 @@
+# apps/schedules/planlama/isler.py
+
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.schedules.choices import PlanIsiDurum
+from apps.schedules.management.commands.create_schedule import Command as PlanlamaKomutu
+from apps.schedules.models import PlanIsi
+from apps.schedules.planlama.fark import mevcut_plan
+from apps.schedules.planlama.veri import PlanlamaVerisi
+
+AKTIF_DURUMLAR = [PlanIsiDurum.BEKLIYOR, PlanIsiDurum.CALISIYOR]
+ILERLEME_KAYIT_ARALIGI = 0.5  # saniye
+# Bu sure boyunca ilerleme yazmayan aktif is yarida kalmis sayilir. Sunucu yeniden
+# baslarsa bellekteki kuyruk kaybolur; bekleyen is de bir daha hic calismaz.
+ISI_ZAMAN_ASIMI = timedelta(minutes=10)
+
+# Planlama CPU ve SQLite yazma agirlikli; isler tek tek sirayla calisir
+_yurutucu = ThreadPoolExecutor(max_workers=1, thread_name_prefix='plan-isi')
+_kilit = threading.Lock()
+
+
+def plan_isi_baslat(donem, olusturan=None, deneme=False):
+    """
+    Donem icin bir plan isi kuyruga ekler. Ayni donem (ve deneme/gercek turu)
+    icin bekleyen/calisan bir is varsa yenisi olusturulmaz, mevcut is dondurulur.
+
+    (is, yeni_mi) dondurur.
+    """
+    with _kilit, transaction.atomic():
+        mevcut = PlanIsi.objects.filter(donem=donem, deneme=deneme, durum__in=AKTIF_DURUMLAR).order_by('id').first()
+        if mevcut and mevcut.guncellenme_tarihi < timezone.now() - ISI_ZAMAN_ASIMI:
+            mevcut.durum = PlanIsiDurum.HATA
+            mevcut.hata_mesaji = 'İş yarıda kaldı (zaman aşımı).'
+            mevcut.save()
+            mevcut = None
+        if mevcut:
+            return mevcut, False
+        plan_isi = PlanIsi.objects.create(donem=donem, olusturan=olusturan, deneme=deneme)
+        # Is kaydi commit edilmeden calisan thread onu goremez
+        transaction.on_commit(lambda: _yurutucu.submit(_is_parcacigi, plan_isi.id))
+    return plan_isi, True
+
+
+def _is_parcacigi(plan_isi_id):
+    try:
+        plan_isini_calistir(plan_isi_id)
+    finally:
+        # Thread'in kendi veritabani baglantisi
+        connection.close()
+
+
+def girdi_parmak_izi(veri):
+    """
+    Planlama girdileri ve ayin mevcut taslak plani. Deneme sonucu bu plana
+    gore fark icerir; gercek isin sonucu ise bu planin kendisidir, elle
+    degistirilmis ya da silinmis bir plan tekrar calistirmada yeniden uretilir.
+    """
+    return veri.parmak_izi(sorted(map(repr, mevcut_plan(veri.yil, veri.ay))))
+
+
+def onceki_sonuc(plan_isi):
+    """Ayni turdeki son tamamlanan is ayni girdilerle calistiysa onu dondurur"""
+    son = PlanIsi.objects.filter(
+        donem=plan_isi.donem, deneme=plan_isi.deneme, durum=PlanIsiDurum.TAMAMLANDI
+    ).exclude(id=plan_isi.id).order_by('-id').first()
+    if son and son.parmak_izi == plan_isi.parmak_izi:
+        return son
+    return None
+
+
+def plan_isini_calistir(plan_isi_id):
+    """
+    Plan isini bu thread'de calistirir ve sonucunu isin kaydina yazar. Girdiler
+    ve mevcut taslak plan ayni turdeki son tamamlanan isle ayniysa motor
+    calismaz; o isin sonucu kullanilir (gercek planda bu, ayni plani ikinci kez
+    yazmamak demektir).
+    """
+    plan_isi = PlanIsi.objects.get(id=plan_isi_id)
+    if plan_isi.durum != PlanIsiDurum.BEKLIYOR:
+        # Kuyrukta beklerken zaman asimina ugrayip yerine yenisi acilmis
+        return plan_isi
+    plan_isi.durum = PlanIsiDurum.CALISIYOR
+    plan_isi.save(update_fields=['durum', 'guncellenme_tarihi'])
+
+    ilerleme = IlerlemeKaydedici(plan_isi)
+    komut = PlanlamaKomutu()
+    try:
+        veri = PlanlamaVerisi.yukle(plan_isi.donem)
+        plan_isi.parmak_izi = girdi_parmak_izi(veri)
+        onceki = onceki_sonuc(plan_isi)
+        if onceki is None:
+            call_command(komut, plan_isi.donem, dry_run=plan_isi.deneme, ilerleme=ilerleme, veri=veri,
+                         verbosity=0, stdout=io.StringIO())
+            if not plan_isi.deneme:
+                # Sonraki is, bu isin yazdigi plan yerinde duruyorsa ayni parmak izini bulur
+                plan_isi.parmak_izi = girdi_parmak_izi(veri)
+    except Exception as e:
+        plan_isi.durum = PlanIsiDurum.HATA
+        plan_isi.hata_mesaji = str(e)
+    else:
+        plan_isi.durum = PlanIsiDurum.TAMAMLANDI
+        plan_isi.ilerleme = 100
+        if onceki is not None:
+            plan_isi.onbellekten = True
+            plan_isi.atama_sayisi = onceki.atama_sayisi
+            plan_isi.kalan_bosluk = onceki.kalan_bosluk
+            plan_isi.sonuc = onceki.sonuc
+        else:
+            plan_isi.profil = komut.profil_raporu
+            if plan_isi.deneme:
+                plan_isi.sonuc = komut.deneme_sonucu
+    plan_isi.bitis_tarihi = timezone.now()
+    plan_isi.save()
+    return plan_isi
+
+
+class IlerlemeKaydedici:
+    """
+    Motorun ilerleme bildirimlerini isin kaydina yazar. Asama degismedikce
+    en fazla ILERLEME_KAYIT_ARALIGI saniyede bir kayit yapilir.
+    """
+
+    def __init__(self, plan_isi):
+        self.plan_isi = plan_isi
+        self._son_kayit = 0
+
+    def __call__(self, asama, ilerleme, atama_sayisi, kalan_bosluk):
+        asama_degisti = asama != self.plan_isi.asama
+        # Son degerler her zaman nesnede tutulur; is bitince hepsi kaydedilir
+        self.plan_isi.asama = asama
+        self.plan_isi.ilerleme = ilerleme
+        self.plan_isi.atama_sayisi = atama_sayisi
+        self.plan_isi.kalan_bosluk = kalan_bosluk
+
+        simdi = time.monotonic()
+        if not asama_degisti and simdi - self._son_kayit < ILERLEME_KAYIT_ARALIGI:
+            return
+        self._son_kayit = simdi
+        self.plan_isi.save(update_fields=['asama', 'ilerleme', 'atama_sayisi', 'kalan_bosluk', 'guncellenme_tarihi'])
@@ -0,0 +1,315 @@
+# apps/schedules/planlama/iyilestirme.py
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Dengeleme turunda bir vardiya icin denenecek en hafif calisan sayisi
+TAKAS_ADAY_SAYISI = 50
+
+
+class YerelArama:
+    """
+    Planlama motorundan sonra, verilen sure butcesi icinde plani calisanlar
+    arasi hamlelerle iyilestirir. Hedefler oncelik sirasiyla: kapsanmayan
+    saat, toplam mesai, calisan saatlerinin dengesizligi (kareler toplami).
+
+    Hamleler:
+      - doldurma: bir boslugu alabilecek calisanin onu engelleyen vardiyasini
+        baskasina verip boslugu ona atamak (kapsanmayan saati azaltir)
+      - bolme: mesaili bir vardiyanin son VARDIYA_MIN_SAAT saatini baska bir
+        calisana vermek (mesaiyi azaltir)
+      - tasima / takas: yuklu bir calisanin vardiyasini daha hafif birine
+        vermek ya da daha kisa bir vardiyayla degistirmek (dengeyi iyilestirir)
+
+    Her hamlenin etkisi sadece degisen calisanlarin saatlerinden artimli
+    hesaplanir; plan puani hicbir zaman bastan hesaplanmaz. Sadece hedefleri
+    iyilestiren hamleler kabul edilir. Favori tercihine denk gelen vardiyalara
+    dokunulmaz.
+    """
+
+    def __init__(self, komut, bloklar, butce_saniye):
+        from apps.schedules.management.commands.create_schedule import (
+            AYLIK_SAAT_LIMITI, VARDIYA_MAX_SAAT, VARDIYA_MIN_SAAT,
+        )
+        self.limit = AYLIK_SAAT_LIMITI
+        self.max_saat = VARDIYA_MAX_SAAT
+        self.min_saat = VARDIYA_MIN_SAAT
+
+        self.komut = komut
+        self.bloklar = bloklar
+        self.butce = butce_saniye
+        self.vardiyalar = {calisan.id: [] for calisan in komut.aktif_calisanlar}
+        for vardiya in komut.planlanan_vardiyalar:
+            self.vardiyalar[vardiya.calisan_id].append(vardiya)
+        self.kare_toplami = float(komut.atanan_saatler @ komut.atanan_saatler)
+        self.hamleler = {'doldurma': 0, 'bolme': 0, 'tasima': 0, 'takas': 0}
+
+    # --- Artimli puan ---
+
+    def olcum(self):
+        komut = self.komut
+        n = len(komut.atanan_saatler) or 1
+        ortalama = komut.atanan_saatler.sum() / n
+        return {
+            'kapsanmayan_saat': round(komut.uncovered_hours(), 1),
+            'mesai_saat': round(float(komut.atanan_mesai_saatler.sum()), 1),
+            'saat_sapmasi': round(float(max(0, self.kare_toplami / n - ortalama ** 2) ** 0.5), 2),
+        }
+
+    def _saat_ekle(self, calisan_id, saat, mesai=0):
+        """Calisanin saatlerini ve artimli puanlari guncelle, doygunlugu esitle"""
+        komut = self.komut
+        i = komut.calisan_sirasi[calisan_id]
+        eski = komut.atanan_saatler[i]
+        yeni = eski + saat
+        komut.atanan_saatler[i] = yeni
+        komut.atanan_mesai_saatler[i] += mesai
+        self.kare_toplami += yeni * yeni - eski * eski
+        if yeni >= self.limit:
+            komut.uygunluk.doygun_yap(calisan_id)
+        elif eski >= self.limit:
+            komut.uygunluk.doygunluktan_cikar(calisan_id)
+
+    @staticmethod
+    def _kare_farki(eski_a, yeni_a, eski_b, yeni_b):
+        return yeni_a * yeni_a + yeni_b * yeni_b - eski_a * eski_a - eski_b * eski_b
+
+    # --- Uygunluk ---
+
+    def _sure(self, vardiya):
+        return (vardiya.bitis_zamani - vardiya.baslangic_zamani).total_seconds() / 3600
+
+    def _korunur_mu(self, vardiya):
+        """Favori tercihine denk gelen vardiya yerinde kalir"""
+        anahtar = (vardiya.calisan_id, vardiya.sube_id, vardiya.baslangic_zamani.isoweekday())
+        return anahtar in self.komut.favori_tercihler
+
+    def _saat(self, calisan_id):
+        return self.komut.atanan_saatler[self.komut.calisan_sirasi[calisan_id]]
+
+    def _kurala_uyar(self, calisan, sube_id, bas, bit):
+        kural_saati = self.komut.check_restriction_end_time(calisan, sube_id)
+        if not kural_saati:
+            return True
+        kural_bitis = datetime.combine(bas.date(), kural_saati)
+        if kural_bitis < bas:
+            kural_bitis += timedelta(days=1)
+        return bas < kural_bitis and bit <= kural_bitis
+
+    def _alabilir_mi(self, calisan, sube_id, bas, bit, ek_saat):
+        """Calisan, saatleri ek_saat kadar degisince bu vardiyayi alabilir mi?"""
+        komut = self.komut
+        return (
+            self._saat(calisan.id) + ek_saat <= self.limit
+            and komut.uygunluk.uygun_mu(calisan.id, sube_id, bas)
+            and self._kurala_uyar(calisan, sube_id, bas, bit)
+            and not komut.has_conflicting_shift(calisan, bas, bit)
+        )
+
+    def _devret(self, vardiya, yeni_calisan):
+        """Vardiyayi baska calisana ver (saat ve mesai ile birlikte)"""
+        komut = self.komut
+        saat = self._sure(vardiya)
+        mesai = max(0, saat - self.max_saat)
+        eski_id, bas, bit = vardiya.calisan_id, vardiya.baslangic_zamani, vardiya.bitis_zamani
+        komut.atanmis_vardiyalar.cikar(eski_id, bas, bit)
+        self.vardiyalar[eski_id].remove(vardiya)
+        self._saat_ekle(eski_id, -saat, -mesai)
+
+        vardiya.calisan_id = yeni_calisan.id
+        komut.atanmis_vardiyalar.ekle(yeni_calisan.id, bas, bit)
+        self.vardiyalar[yeni_calisan.id].append(vardiya)
+        self._saat_ekle(yeni_calisan.id, saat, mesai)
+
+    def _sure_doldu(self):
+        return time.perf_counter() >= self.bitis
+
+    # --- Komsuluklar ---
+
+    def bosluklari_doldur(self):
+        kabul = 0
+        for blok in self.bloklar:
+            for bosluk_bas, bosluk_bitis in list(blok.kapsama.bosluklar()):
+                if self._sure_doldu():
+                    return kabul
+                if self._boslugu_doldur(blok, bosluk_bas, bosluk_bitis):
+                    kabul += 1
+        return kabul
+
+    def _boslugu_doldur(self, blok, bosluk_bas, bosluk_bitis):
+        komut = self.komut
+        uzunluk = (bosluk_bitis - bosluk_bas).total_seconds() / 3600
+        # solve_and_assign_gap'in verebilecegi en uzun vardiya (zorunlu mesai dahil)
+        en_uzun = min(uzunluk, self.max_saat + self.min_saat)
+        aday_bitis = bosluk_bas + timedelta(hours=min(uzunluk, self.max_saat))
+
+        for calisan in komut.aktif_calisanlar:
+            if self._sure_doldu():
+                return False
+            if not komut.is_available(calisan, bosluk_bas):
+                continue
+            engelleyenler = [
+                v for v in self.vardiyalar[calisan.id]
+                if v.baslangic_zamani < aday_bitis and bosluk_bas < v.bitis_zamani
+            ]
+            if len(engelleyenler) > 1:
+                continue
+            if engelleyenler:
+                secenekler = engelleyenler
+            elif self._saat(calisan.id) + en_uzun > self.limit:
+                # Limit engeli: yeterince uzun tek bir vardiyayi devretmek yeter
+                gereken = self._saat(calisan.id) + en_uzun - self.limit
+                secenekler = [v for v in self.vardiyalar[calisan.id] if self._sure(v) >= gereken]
+            else:
+                # Ne cakisma ne limit var; motor bu calisani kurala ya da uygunluga takildigi icin almadi
+                continue
+
+            for vardiya in secenekler:
+                if self._korunur_mu(vardiya):
+                    continue
+                saat = self._sure(vardiya)
+                devralan = next((
+                    aday for aday in komut.find_candidates(vardiya.sube_id, vardiya.baslangic_zamani)
+                    if aday.id != calisan.id and
+                    self._alabilir_mi(aday, vardiya.sube_id, vardiya.baslangic_zamani, vardiya.bitis_zamani, saat)
+                ), None)
+                if devralan is None:
+                    continue
+                self._devret(vardiya, devralan)
+                if (self._saat(calisan.id) + en_uzun <= self.limit and
+                        calisan.id in komut.uygunluk.adaylar(blok.sube_id, bosluk_bas)):
+                    onceki = len(komut.planlanan_vardiyalar)
+                    if komut.solve_and_assign_gap(calisan, blok, bosluk_bas, bosluk_bitis) and \
+                            len(komut.planlanan_vardiyalar) > onceki:
+                        yeni = komut.planlanan_vardiyalar[-1]
+                        self.vardiyalar[calisan.id].append(yeni)
+                        # create_shift saatleri zaten isledi; artimli puanlari esitle
+                        yeni_saat = self._sure(yeni)
+                        sonra = self._saat(calisan.id)
+                        self.kare_toplami += sonra * sonra - (sonra - yeni_saat) ** 2
+                        self.hamleler['doldurma'] += 1
+                        return True
+                self._devret(vardiya, calisan)  # geri al
+        return False
+
+    def mesaileri_bol(self):
+        komut = self.komut
+        kabul = 0
+        for vardiya in list(komut.planlanan_vardiyalar):
+            if self._sure_doldu():
+                break
+            saat = self._sure(vardiya)
+            # Kalan parca mesaisiz olmali: en fazla VARDIYA_MAX_SAAT + VARDIYA_MIN_SAAT saatlik vardiyalar
+            if not self.max_saat < saat <= self.max_saat + self.min_saat or self._korunur_mu(vardiya):
+                continue
+            kuyruk_bas = vardiya.bitis_zamani - timedelta(hours=self.min_saat)
+            devralan = next((
+                aday for aday in komut.find_candidates(vardiya.sube_id, kuyruk_bas)
+                if aday.id != vardiya.calisan_id and
+                self._alabilir_mi(aday, vardiya.sube_id, kuyruk_bas, vardiya.bitis_zamani, self.min_saat)
+            ), None)
+            if devralan is None:
+                continue
+
+            sahip_id, bas, bit = vardiya.calisan_id, vardiya.baslangic_zamani, vardiya.bitis_zamani
+            komut.atanmis_vardiyalar.cikar(sahip_id, bas, bit)
+            komut.atanmis_vardiyalar.ekle(sahip_id, bas, kuyruk_bas)
+            vardiya.bitis_zamani = kuyruk_bas
+            self._saat_ekle(sahip_id, -self.min_saat, -(saat - self.max_saat))
+            komut.toplam_atanan_saat -= self.min_saat
+
+            onceki_kare = self._saat(devralan.id) ** 2
+            komut.record_shift(devralan.id, vardiya.sube_id, kuyruk_bas, bit)
+            self.vardiyalar[devralan.id].append(komut.planlanan_vardiyalar[-1])
+            self.kare_toplami += self._saat(devralan.id) ** 2 - onceki_kare
+            self.hamleler['bolme'] += 1
+            kabul += 1
+        return kabul
+
+    def _hafiften_agira(self):
+        komut = self.komut
+        return [komut.aktif_calisanlar[i] for i in np.argsort(komut.atanan_saatler, kind='stable')]
+
+    def dengele(self):
+        kabul = 0
+        sirali = self._hafiften_agira()
+        for agir in reversed(sirali):
+            for vardiya in sorted(self.vardiyalar[agir.id], key=self._sure, reverse=True):
+                if self._sure_doldu():
+                    return kabul
+                if self._korunur_mu(vardiya):
+                    continue
+                if self._tasi(agir, vardiya, sirali) or self._takas_et(agir, vardiya, sirali):
+                    kabul += 1
+                    # _tasi'nin erken cikisi siraya dayanir; saatler degisti, yeniden sirala
+                    sirali = self._hafiften_agira()
+                    break
+        return kabul
+
+    def _tasi(self, agir, vardiya, sirali):
+        saat = self._sure(vardiya)
+        h_agir = self._saat(agir.id)
+        for hafif in sirali:
+            h_hafif = self._saat(hafif.id)
+            if self._kare_farki(h_agir, h_agir - saat, h_hafif, h_hafif + saat) >= 0:
+                return False  # Daha agir adaylar da iyilestiremez
+            if self._alabilir_mi(hafif, vardiya.sube_id, vardiya.baslangic_zamani, vardiya.bitis_zamani, saat):
+                self._devret(vardiya, hafif)
+                self.hamleler['tasima'] += 1
+                return True
+        return False
+
+    def _takas_et(self, agir, vardiya, sirali):
+        saat = self._sure(vardiya)
+        h_agir = self._saat(agir.id)
+        for hafif in sirali[:TAKAS_ADAY_SAYISI]:
+            if hafif.id == agir.id:
+                continue
+            h_hafif = self._saat(hafif.id)
+            for diger in self.vardiyalar[hafif.id]:
+                diger_saat = self._sure(diger)
+                fark = saat - diger_saat
+                if fark <= 0 or self._korunur_mu(diger):
+                    continue
+                if self._kare_farki(h_agir, h_agir - fark, h_hafif, h_hafif + fark) >= 0:
+                    continue
+                if self._takas_gecerli_mi(agir, vardiya, hafif, diger, fark):
+                    self._devret(vardiya, hafif)
+                    self._devret(diger, agir)
+                    self.hamleler['takas'] += 1
+                    return True
+        return False
+
+    def _takas_gecerli_mi(self, agir, vardiya, hafif, diger, fark):
+        """Iki vardiya birbirinden cikarilmis gibi cakisma ve uygunluk kontrolu"""
+        komut = self.komut
+        indeks = komut.atanmis_vardiyalar
+        indeks.cikar(agir.id, vardiya.baslangic_zamani, vardiya.bitis_zamani)
+        indeks.cikar(hafif.id, diger.baslangic_zamani, diger.bitis_zamani)
+        try:
+            return (
+                self._alabilir_mi(hafif, vardiya.sube_id, vardiya.baslangic_zamani, vardiya.bitis_zamani, fark)
+                and self._alabilir_mi(agir, diger.sube_id, diger.baslangic_zamani, diger.bitis_zamani, -fark)
+            )
+        finally:
+            indeks.ekle(agir.id, vardiya.baslangic_zamani, vardiya.bitis_zamani)
+            indeks.ekle(hafif.id, diger.baslangic_zamani, diger.bitis_zamani)
+
+    # --- Ana dongu ---
+
+    def calistir(self):
+        """Butce bitene ya da hicbir hamle kabul edilmeyene kadar komsuluklari dolas"""
+        komut = self.komut
+        baslangic = time.perf_counter()
+        self.bitis = baslangic + self.butce
+        once = self.olcum()
+        while not self._sure_doldu():
+            if not (self.bosluklari_doldur() + self.mesaileri_bol() + self.dengele()):
+                break
+        sure = time.perf_counter() - baslangic
+        sonra = self.olcum()
+
+        komut.kalan_bosluk = sum(len(blok.kapsama.bosluklar()) for blok in self.bloklar)
+        return {'sure_sn': round(sure, 3), 'once': once, 'sonra': sonra, 'hamleler': dict(self.hamleler)}
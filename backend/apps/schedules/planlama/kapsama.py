@@ -0,0 +1,67 @@
+# apps/schedules/planlama/kapsama.py
+
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+
+class BlokKapsamasi:
+    """
+    Bir vardiya blogunun dolu araliklarini sirali ve birlestirilmis tutar.
+
+    Araliklar eklendikce komsu/ortusen araliklarla birlestirilir; boylece
+    bosluk sorgulari her seferinde yeniden siralama yapmadan calisir.
+    """
+
+    __slots__ = ('baslangic', 'bitis', 'min_sure', '_baslar', '_bitisler', '_bosluklar')
+
+    def __init__(self, baslangic, bitis, min_sure_saat=0):
+        self.baslangic = baslangic
+        self.bitis = bitis
+        self.min_sure = timedelta(hours=min_sure_saat)
+        self._baslar = []
+        self._bitisler = []
+        self._bosluklar = None
+
+    def __len__(self):
+        return len(self._baslar)
+
+    def __iter__(self):
+        return iter(zip(self._baslar, self._bitisler))
+
+    def ekle(self, bas, bitis):
+        """[bas, bitis) araligini ekle, ortusen/bitisik araliklarla birlestir"""
+        if bitis <= bas:
+            return
+        # bas'tan once biten son araliga kadar olanlar etkilenmez
+        i = bisect_left(self._bitisler, bas)
+        # bitis'ten sonra baslayan ilk aralik ve sonrasi etkilenmez
+        j = bisect_right(self._baslar, bitis)
+        if i < j:
+            bas = min(bas, self._baslar[i])
+            bitis = max(bitis, self._bitisler[j - 1])
+        self._baslar[i:j] = [bas]
+        self._bitisler[i:j] = [bitis]
+        self._bosluklar = None
+
+    def kapsiyor_mu(self, bas, bitis):
+        """[bas, bitis) araligi tek bir dolu aralik icinde mi? O(log n)"""
+        i = bisect_right(self._baslar, bas) - 1
+        return i >= 0 and bitis <= self._bitisler[i]
+
+    def bosluklar(self):
+        """min_sure'den kisa olmayan bos zaman dilimleri (onbellekli)"""
+        if self._bosluklar is None:
+            bosluklar = []
+            simdiki = self.baslangic
+            for dolu_bas, dolu_bitis in zip(self._baslar, self._bitisler):
+                if simdiki < dolu_bas and dolu_bas - simdiki >= self.min_sure:
+                    bosluklar.append((simdiki, dolu_bas))
+                simdiki = max(simdiki, dolu_bitis)
+            if simdiki < self.bitis and self.bitis - simdiki >= self.min_sure:
+                bosluklar.append((simdiki, self.bitis))
+            self._bosluklar = tuple(bosluklar)
+        return self._bosluklar
+
+    @property
+    def tamamen_dolu(self):
+        return not self.bosluklar()
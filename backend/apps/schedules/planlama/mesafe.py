@@ -0,0 +1,48 @@
+# apps/schedules/planlama/mesafe.py
+
+import hashlib
+
+import numpy as np
+from django.core.cache import cache
+
+DUNYA_YARICAPI_KM = 6371
+MESAFE_ONBELLEK_SURESI = 60 * 60 * 24  # 1 gun
+
+
+def koordinat_dizisi(nesneler):
+    """enlem/boylam alanlarindan (n, 2) float dizi; eksik koordinat NaN olur"""
+    dizi = np.full((len(nesneler), 2), np.nan)
+    for i, nesne in enumerate(nesneler):
+        # Eski calculate_distance gibi 0/None koordinatlar eksik sayilir
+        if nesne.enlem and nesne.boylam:
+            dizi[i] = (float(nesne.enlem), float(nesne.boylam))
+    return dizi
+
+
+def mesafe_matrisi(kaynak, hedef):
+    """Iki koordinat dizisi arasindaki Haversine mesafeleri (km), (len(kaynak), len(hedef))"""
+    lat1, lon1 = np.radians(kaynak[:, 0])[:, None], np.radians(kaynak[:, 1])[:, None]
+    lat2, lon2 = np.radians(hedef[:, 0])[None, :], np.radians(hedef[:, 1])[None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return DUNYA_YARICAPI_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def calisan_sube_mesafeleri(calisanlar, subeler):
+    """
+    Calisan x sube mesafe matrisi. Koordinatlardan uretilen bir ozetle
+    cache'te tutulur; adresler degismedikce yeniden hesaplanmaz.
+    """
+    kaynak = koordinat_dizisi(calisanlar)
+    hedef = koordinat_dizisi(subeler)
+
+    ozet = hashlib.sha1()
+    for dizi in (kaynak, hedef):
+        ozet.update(np.ascontiguousarray(dizi).tobytes())
+        ozet.update(b'|')
+    anahtar = f'mesafe_matrisi_{ozet.hexdigest()}'
+
+    matris = cache.get(anahtar)
+    if matris is None:
+        matris = mesafe_matrisi(kaynak, hedef)
+        cache.set(anahtar, matris, MESAFE_ONBELLEK_SURESI)
+    return matris
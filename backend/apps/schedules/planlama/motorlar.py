@@ -0,0 +1,20 @@
+# apps/schedules/planlama/motorlar.py
+
+from apps.schedules.planlama.optimal import OptimalMotor
+
+
+class AcgozluMotor:
+    """v15: once favoriler, sonra rank_candidates sirasiyla ilk uyan aday"""
+
+    ad = 'greedy'
+
+    def __init__(self, komut):
+        self.komut = komut
+
+    def planla(self, bloklar):
+        self.komut.plan_blocks(bloklar)
+
+
+# Her motor komutun durumuyla (prepare_state, build_blocks) kurulur ve
+# planla(bloklar) ile atamalarini komutun create_shift'i uzerinden yapar
+MOTORLAR = {motor.ad: motor for motor in (AcgozluMotor, OptimalMotor)}
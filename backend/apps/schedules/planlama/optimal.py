@@ -0,0 +1,171 @@
+# apps/schedules/planlama/optimal.py
+
+from datetime import datetime, timedelta
+from math import ceil
+
+import numpy as np
+
+from apps.schedules.choices import PlanAsama
+from apps.schedules.planlama.uygunluk import SART_KOSULLARI
+
+# Her kapsanan saat, tum tercih/denge puanlarinin toplamindan agir basar
+KAPSAMA_AGIRLIGI = 10000
+FAVORI_PUANI = 1000
+UYGUN_DEGIL = 1e12
+
+
+def blok_dilimleri(bas, bit, kural_saatleri, min_saat, max_saat):
+    """
+    [bas, bit) araligini en fazla max_saat uzunlugunda, esit uzunluklu vardiya
+    dilimlerine boler. Subede bir kural saati araligin icine dusuyorsa once
+    oradan bolunur; boylece kurala takilan calisanlar kural saatinde biten
+    dilimi alabilir (v15'in vardiyayi kural saatinde bitirmesinin karsiligi).
+    min_saat'ten kisa parcalar dilim olmaz.
+    """
+    kesimler = [bas]
+    for saat in sorted(kural_saatleri):
+        zaman = datetime.combine(bas.date(), saat)
+        if zaman < bas:
+            zaman += timedelta(days=1)
+        if kesimler[-1] + timedelta(hours=min_saat) <= zaman <= bit - timedelta(hours=min_saat):
+            kesimler.append(zaman)
+    kesimler.append(bit)
+
+    dilimler = []
+    for parca_bas, parca_bit in zip(kesimler, kesimler[1:]):
+        dakika = (parca_bit - parca_bas).total_seconds() / 60
+        if dakika < min_saat * 60:
+            continue
+        adet = ceil(dakika / (max_saat * 60))
+        sinirlar = [parca_bas + timedelta(minutes=round(dakika * i / adet)) for i in range(adet + 1)]
+        dilimler.extend(zip(sinirlar, sinirlar[1:]))
+    return dilimler
+
+
+class OptimalMotor:
+    """
+    Bloklarin bos araliklarini once sabit vardiya dilimlerine ayirir, sonra her gunu bir atama
+    problemi olarak cozer: satirlar dilimler, sutunlar calisanlar, maliyet
+    -(kapsanan saat * KAPSAMA_AGIRLIGI + tercih/denge/mesafe puani). Bir calisan
+    gunde en fazla bir dilim alir; musaitlik, kisitlama kurallari, onceki gunden
+    tasan vardiyalar ve AYLIK_SAAT_LIMITI uygun olmayan eslesmeler olarak
+    isaretlenir. Gunler sirayla cozulur, boylece aylik saatler bir sonraki
+    gune aktarilir. Arta kalan bosluklar v15'in bosluk doldurmasina birakilir.
+    """
+
+    ad = 'optimal'
+
+    def __init__(self, komut):
+        self.komut = komut
+
+    def planla(self, bloklar):
+        try:
+            from scipy.optimize import linear_sum_assignment
+        except ImportError as e:
+            raise ImportError("'optimal' planlama motoru icin scipy kurulu olmalidir.") from e
+        from apps.schedules.management.commands.create_schedule import (
+            AYLIK_SAAT_LIMITI, VARDIYA_MAX_SAAT, VARDIYA_MIN_SAAT,
+        )
+
+        komut = self.komut
+        calisanlar = komut.aktif_calisanlar
+        if not calisanlar:
+            komut.fill_remaining_shifts(bloklar)
+            return
+
+        sube_kurallari = {}
+        for kural in komut.kisitlama_kurallari:
+            if kural.sart in SART_KOSULLARI:
+                sube_kurallari.setdefault(kural.sube_id, []).append(kural)
+        kurala_takilanlar = {
+            sart: np.array([kosul(calisan) for calisan in calisanlar])
+            for sart, kosul in SART_KOSULLARI.items()
+        }
+        favoriler = {}
+        for calisan_id, sube_id, gun in komut.favori_tercihler:
+            favoriler.setdefault((sube_id, gun), []).append(komut.calisan_sirasi[calisan_id])
+        # Calisan basina son vardiya bitisi; gunler sirayla cozuldugu icin cakisma sadece bununla olur
+        son_bitis = np.full(len(calisanlar), -np.inf)
+
+        gunler = {}
+        for blok in bloklar:
+            gunler.setdefault(blok.baslangic.date(), []).append(blok)
+
+        with komut.profil.asama('atama_problemi'):
+            for gun_no, (tarih, gun_bloklari) in enumerate(sorted(gunler.items()), start=1):
+                # Dilimler bosluklardan kesilir; artimli modda kismen dolu saatler yeniden atanmaz
+                dilimler = [
+                    (blok, bas, bit)
+                    for blok in gun_bloklari
+                    for bosluk_bas, bosluk_bit in blok.kapsama.bosluklar()
+                    for bas, bit in blok_dilimleri(
+                        bosluk_bas, bosluk_bit, [k.baslangic_saati for k in sube_kurallari.get(blok.sube_id, [])],
+                        VARDIYA_MIN_SAAT, VARDIYA_MAX_SAAT,
+                    )
+                ]
+                if dilimler:
+                    self._gunu_coz(
+                        dilimler, linear_sum_assignment, son_bitis, sube_kurallari, kurala_takilanlar,
+                        favoriler, AYLIK_SAAT_LIMITI,
+                    )
+                komut.report_progress(PlanAsama.DOLDURMA, 10 + 60 * gun_no // len(gunler))
+
+        # Dilimlere sigmayan ya da kimsenin alamadigi parcalar icin v15 dongusu
+        komut.stdout.write(komut.style.HTTP_INFO('\nTAMAMLAMA: Kalan bosluklar v15 ile dolduruluyor...'))
+        with komut.profil.asama('doldurma'):
+            komut.fill_remaining_shifts(bloklar)
+
+    def _gunu_coz(self, dilimler, linear_sum_assignment, son_bitis, sube_kurallari, kurala_takilanlar,
+                  favoriler, aylik_limit):
+        komut = self.komut
+        calisanlar = komut.aktif_calisanlar
+        # Gunun basindaki saatler; dilimler atandikca komutun dizileri degisir
+        atanan = komut.atanan_saatler.copy()
+        # Gun boyunca degismeyen puan: denge bonusu, mesai cezasi ve yuku yaymak icin atanan saat
+        temel_puan = komut.denge_puanlari - komut.atanan_mesai_saatler * 5 - atanan
+
+        aday_vektorleri = {}
+        uygun = np.zeros((len(dilimler), len(calisanlar)), dtype=bool)
+        puan = np.empty((len(dilimler), len(calisanlar)))
+        for satir, (blok, bas, bit) in enumerate(dilimler):
+            sube_id = blok.sube_id
+            saat = (bit - bas).total_seconds() / 3600
+
+            # Musaitlik, baslangic kurali ve limit uygunluk indeksinden
+            kume = komut.uygunluk.adaylar(sube_id, bas)
+            vektor = aday_vektorleri.get(id(kume))
+            if vektor is None:
+                vektor = np.zeros(len(calisanlar), dtype=bool)
+                vektor[[komut.calisan_sirasi[cid] for cid in kume]] = True
+                aday_vektorleri[id(kume)] = vektor
+            satir_uygun = vektor & (son_bitis <= bas.timestamp()) & (atanan + saat <= aylik_limit)
+            # Kural saatinden sonra biten dilimi kurala takilanlar alamaz
+            for kural in sube_kurallari.get(sube_id, []):
+                kural_bitis = datetime.combine(bas.date(), kural.baslangic_saati)
+                if kural_bitis < bas:
+                    kural_bitis += timedelta(days=1)
+                if bit > kural_bitis:
+                    satir_uygun &= ~kurala_takilanlar[kural.sart]
+            uygun[satir] = satir_uygun
+
+            satir_puani = temel_puan + saat * KAPSAMA_AGIRLIGI + komut.mesafe_puanlari[:, komut.sube_sirasi[sube_id]]
+            satir_puani[favoriler.get((sube_id, bas.isoweekday()), [])] += FAVORI_PUANI
+            puan[satir] = satir_puani
+
+        sutunlar = np.flatnonzero(uygun.any(axis=0))
+        if not len(sutunlar):
+            return
+        komut.profil.sayaclar['aday_tarama'] += int(uygun.sum())
+        maliyet = np.where(uygun[:, sutunlar], -puan[:, sutunlar], UYGUN_DEGIL)
+        satirlar, secilenler = linear_sum_assignment(maliyet)
+
+        for satir, sutun in zip(satirlar, secilenler):
+            i = sutunlar[sutun]
+            if not uygun[satir, i]:
+                continue
+            blok, bas, bit = dilimler[satir]
+            if komut.has_conflicting_shift(calisanlar[i], bas, bit):
+                continue
+            komut.create_shift(calisanlar[i], blok.sube_id, bas, bit)
+            blok.kapsama.ekle(bas, bit)
+            son_bitis[i] = bit.timestamp()
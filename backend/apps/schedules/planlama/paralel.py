@@ -0,0 +1,137 @@
+# apps/schedules/planlama/paralel.py
+
+import io
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from apps.schedules.planlama.mesafe import koordinat_dizisi
+from apps.schedules.planlama.profil import PlanlamaProfili
+
+
+def haftalik_acik_saat(calisma_saatleri):
+    """Bir subenin {gun: saatler} sozlugunden haftalik acik saat toplami (talep olcusu)"""
+    toplam = 0
+    for saatler in calisma_saatleri.values():
+        if saatler.get('kapali'):
+            continue
+        acilis = datetime.combine(datetime.min, saatler['acilis'])
+        kapanis = datetime.combine(datetime.min, saatler['kapanis'])
+        if kapanis <= acilis:
+            kapanis += timedelta(days=1)
+        toplam += (kapanis - acilis).total_seconds() / 3600
+    return toplam
+
+
+def sube_kumeleri(subeler, agirliklar, kume_sayisi):
+    """
+    Subeleri koordinatlarina gore yinelemeli ikiye bolerek (genis eksende,
+    agirlik ortancasindan) birbirine yakin ve talebi dengeli kume_sayisi
+    kumeye ayirir. Koordinati olmayan subeler en hafif kumelere dagitilir.
+    Sube sira numaralarinin listelerini dondurur.
+    """
+    koordinatlar = koordinat_dizisi(subeler)
+    konumlu = [i for i in range(len(subeler)) if not np.isnan(koordinatlar[i, 0])]
+    konumsuz = [i for i in range(len(subeler)) if np.isnan(koordinatlar[i, 0])]
+
+    def bol(indeksler, k):
+        if k <= 1 or len(indeksler) <= 1:
+            return [indeksler]
+        aralik = np.ptp(koordinatlar[indeksler], axis=0)
+        eksen = int(np.argmax(aralik))
+        indeksler = sorted(indeksler, key=lambda i: (koordinatlar[i, eksen], i))
+        sol_k = k // 2
+        hedef = sum(agirliklar[i] for i in indeksler) * sol_k / k
+        kesim, birikim = 0, 0
+        while kesim < len(indeksler) - 1 and birikim + agirliklar[indeksler[kesim]] / 2 < hedef:
+            birikim += agirliklar[indeksler[kesim]]
+            kesim += 1
+        kesim = max(kesim, 1)
+        return bol(indeksler[:kesim], sol_k) + bol(indeksler[kesim:], k - sol_k)
+
+    kumeler = [kume for kume in bol(konumlu, kume_sayisi) if kume] if konumlu else []
+    while len(kumeler) < min(kume_sayisi, len(subeler)):
+        kumeler.append([])
+    for i in konumsuz:
+        min(kumeler, key=lambda kume: sum(agirliklar[j] for j in kume)).append(i)
+    return [kume for kume in kumeler if kume]
+
+
+def calisan_kumeleri(veri, kumeler, agirliklar, mesafeler):
+    """
+    Her calisani tek bir kumeye yerlestirir. Kumelerin calisan kotasi
+    talepleriyle orantilidir. Tercihi olan calisan once tercih ettigi subenin
+    kumesine, digerleri kotasi dolmamis en yakin kumeye gider.
+    Kume basina calisan sira numaralari listesi dondurur.
+    """
+    kume_sayisi = len(kumeler)
+    toplam_agirlik = sum(agirliklar) or 1
+    kotalar = [
+        math.ceil(len(veri.calisanlar) * sum(agirliklar[i] for i in kume) / toplam_agirlik)
+        for kume in kumeler
+    ]
+    # Calisan x kume en yakin sube mesafesi; koordinat eksikse inf
+    mesafeler = np.where(np.isnan(mesafeler), np.inf, mesafeler)
+    kume_mesafeleri = np.column_stack([mesafeler[:, kume].min(axis=1) for kume in kumeler])
+
+    sube_kumesi = {veri.subeler[i].id: k for k, kume in enumerate(kumeler) for i in kume}
+    calisan_sirasi = {calisan.id: i for i, calisan in enumerate(veri.calisanlar)}
+    tercih_kumesi = {}
+    for tercih in veri.tercihler:
+        tercih_kumesi.setdefault(calisan_sirasi[tercih.calisan_id], sube_kumesi[tercih.sube_id])
+
+    sonuc = [[] for _ in range(kume_sayisi)]
+    for i in range(len(veri.calisanlar)):
+        if i in tercih_kumesi and len(sonuc[tercih_kumesi[i]]) < kotalar[tercih_kumesi[i]]:
+            sonuc[tercih_kumesi[i]].append(i)
+            continue
+        bos_kumeler = [k for k in range(kume_sayisi) if len(sonuc[k]) < kotalar[k]] or list(range(kume_sayisi))
+        if np.isfinite(kume_mesafeleri[i, bos_kumeler]).any():
+            secilen = min(bos_kumeler, key=lambda k: kume_mesafeleri[i, k])
+        else:
+            secilen = max(bos_kumeler, key=lambda k: kotalar[k] - len(sonuc[k]))
+        sonuc[secilen].append(i)
+    return sonuc
+
+
+def veri_parcalari(veri, kume_sayisi, mesafeler):
+    """Planlama verisini birbirinden bagimsiz planlanabilecek kume parcalarina boler"""
+    agirliklar = [haftalik_acik_saat(veri.calisma_saatleri.get(sube.id, {})) for sube in veri.subeler]
+    kumeler = sube_kumeleri(veri.subeler, agirliklar, kume_sayisi)
+    calisanlar = calisan_kumeleri(veri, kumeler, agirliklar, mesafeler)
+    return [
+        veri.parca([veri.subeler[i].id for i in sube_kumesi], [veri.calisanlar[i].id for i in calisan_kumesi])
+        for sube_kumesi, calisan_kumesi in zip(kumeler, calisanlar)
+    ]
+
+
+def isci_hazirla():
+    """Alt surec 'spawn' ile basladiysa Django'yu yukle (fork'ta zaten hazir)"""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def kumeyi_planla(parca, motor_adi='greedy'):
+    """
+    Alt surecte bir kumeyi secilen motorla planlar. Veritabanina dokunmaz;
+    (sube_id, calisan_id, baslangic, bitis) atamalarini, kalan bosluk sayisini ve
+    profil sayaclarini dondurur.
+    """
+    from apps.schedules.management.commands.create_schedule import Command
+    from apps.schedules.planlama.motorlar import MOTORLAR
+
+    komut = Command(stdout=io.StringIO())
+    komut.ilerleme = None
+    # Alt surecin ciktisi okunmaz; satir bazinda log uretmeye gerek yok
+    komut.ayrintili = False
+    komut.profil = PlanlamaProfili()
+    komut.prepare_state(parca)
+    MOTORLAR[motor_adi](komut).planla(komut.build_blocks(parca))
+    atamalar = [
+        (a.sube_id, a.calisan_id, a.baslangic_zamani, a.bitis_zamani)
+        for a in komut.planlanan_vardiyalar
+    ]
+    return atamalar, komut.kalan_bosluk, komut.profil.sayaclar
@@ -0,0 +1,44 @@
+# apps/schedules/planlama/profil.py
+
+import time
+from contextlib import contextmanager
+
+SAYACLAR = ('bosluk_degerlendirme', 'aday_tarama', 'cakisma_kontrolu', 'atama', 'sorgu')
+
+
+class PlanlamaProfili:
+    """
+    Planlama calismasinin asama sureleri ve sayaclari. Sayaclar sicak
+    dongulerde dogrudan `profil.sayaclar[ad] += n` ile artirilir.
+    """
+
+    def __init__(self):
+        self.sureler = {}
+        self.sayaclar = dict.fromkeys(SAYACLAR, 0)
+        self._baslangic = time.perf_counter()
+
+    @contextmanager
+    def asama(self, ad):
+        """Blok icinde gecen sureyi asamanin toplamina ekler (ayni asama birden cok kez olabilir)"""
+        baslangic = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sureler[ad] = self.sureler.get(ad, 0) + time.perf_counter() - baslangic
+
+    def sayaclari_ekle(self, sayaclar):
+        """Baska bir profilin (or. paralel alt surec) sayaclarini ekle"""
+        for ad, adet in sayaclar.items():
+            self.sayaclar[ad] = self.sayaclar.get(ad, 0) + adet
+
+    def sorgu_sayaci(self, execute, sql, params, many, context):
+        """connection.execute_wrapper ile kullanilir; DEBUG kapaliyken de sorgulari sayar"""
+        self.sayaclar['sorgu'] += 1
+        return execute(sql, params, many, context)
+
+    def rapor(self):
+        return {
+            'toplam_sn': round(time.perf_counter() - self._baslangic, 3),
+            'asamalar': {ad: round(sure, 3) for ad, sure in self.sureler.items()},
+            'sayaclar': dict(self.sayaclar),
+        }
@@ -0,0 +1,96 @@
+# apps/schedules/planlama/sentetik.py
+
+import random
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+
+from apps.users.models import CustomUser
+from apps.branches.models import Sube, SubeCalismaSaati
+from apps.schedules.choices import MusaitlikDurum, KuralSart
+from apps.schedules.models import Musaitlik, CalisanTercihi, KisitlamaKurali, AylikSaatDengesi
+
+SENTETIK_ONEK = 'sentetik_'
+TOPLU_KAYIT_BOYUTU = 1000
+
+# Gercekci bir dagilim: cogu calisan tum gun ya da ogleden sonra musait
+MUSAITLIK_AGIRLIKLARI = {
+    MusaitlikDurum.MUSAIT_DEGIL: 3,
+    MusaitlikDurum.TUM_GUN: 4,
+    MusaitlikDurum.SAAT_11_SONRASI: 1,
+    MusaitlikDurum.SAAT_14_SONRASI: 1,
+    MusaitlikDurum.SAAT_17_SONRASI: 1,
+}
+
+
+def sentetik_veri_olustur(calisan_sayisi, sube_sayisi, donem, tohum=0):
+    """
+    Verilen boyutta, tohuma gore tekrarlanabilir planlama verisi olusturur:
+    subeler, calisma saatleri, calisanlar, donem musaitlikleri, tercihler,
+    kisitlama kurallari ve onceki ayin saat dengeleri.
+    """
+    rnd = random.Random(tohum)
+    onceki_donem = (datetime.strptime(donem, '%Y-%m') - timedelta(days=1)).strftime('%Y-%m')
+
+    subeler = Sube.objects.bulk_create([
+        Sube(
+            sube_adi=f'{SENTETIK_ONEK}sube_{i}',
+            adres='Sentetik adres',
+            enlem=round(41.0 + rnd.uniform(-0.3, 0.3), 6),
+            boylam=round(29.0 + rnd.uniform(-0.5, 0.5), 6),
+        )
+        for i in range(sube_sayisi)
+    ], batch_size=TOPLU_KAYIT_BOYUTU)
+
+    saatler, kurallar = [], []
+    for sube in subeler:
+        acilis = time(rnd.choice([7, 8, 9, 10]))
+        kapanis = time(rnd.choice([20, 22, 23, 0]))
+        kapali_gun = rnd.choice([None, None, 7])
+        for gun in range(1, 8):
+            saatler.append(SubeCalismaSaati(
+                sube=sube, gun=gun, acilis_saati=acilis, kapanis_saati=kapanis, kapali=(gun == kapali_gun)
+            ))
+        if rnd.random() < 0.3:
+            kurallar.append(KisitlamaKurali(
+                sube=sube, sart=KuralSart.CINSIYET_KADIN, baslangic_saati=time(rnd.choice([20, 21, 22]))
+            ))
+    SubeCalismaSaati.objects.bulk_create(saatler, batch_size=TOPLU_KAYIT_BOYUTU)
+    KisitlamaKurali.objects.bulk_create(kurallar, batch_size=TOPLU_KAYIT_BOYUTU)
+
+    parola = make_password(None)
+    calisanlar = CustomUser.objects.bulk_create([
+        CustomUser(
+            username=f'{SENTETIK_ONEK}{i}',
+            email=f'{SENTETIK_ONEK}{i}@ornek.com',
+            password=parola,
+            first_name='Sentetik',
+            last_name=str(i),
+            rol=CustomUser.Role.CALISAN,
+            cinsiyet=rnd.choice([CustomUser.Gender.KADIN, CustomUser.Gender.ERKEK]),
+            enlem=round(41.0 + rnd.uniform(-0.4, 0.4), 6) if rnd.random() < 0.9 else None,
+            boylam=round(29.0 + rnd.uniform(-0.6, 0.6), 6),
+        )
+        for i in range(calisan_sayisi)
+    ], batch_size=TOPLU_KAYIT_BOYUTU)
+
+    durumlar, agirliklar = list(MUSAITLIK_AGIRLIKLARI), list(MUSAITLIK_AGIRLIKLARI.values())
+    musaitlikler, tercihler, dengeler = [], [], []
+    for calisan in calisanlar:
+        for gun, durum in enumerate(rnd.choices(durumlar, agirliklar, k=7), start=1):
+            musaitlikler.append(Musaitlik(calisan=calisan, gun=gun, musaitlik_durumu=durum, donem=donem))
+        if subeler and rnd.random() < 0.2:
+            for _ in range(rnd.randint(1, 2)):
+                tercihler.append(CalisanTercihi(calisan=calisan, sube=rnd.choice(subeler), gun=rnd.randint(1, 7)))
+        dengeler.append(AylikSaatDengesi(calisan=calisan, donem=onceki_donem, denge=rnd.randint(-12, 12)))
+    Musaitlik.objects.bulk_create(musaitlikler, batch_size=TOPLU_KAYIT_BOYUTU)
+    CalisanTercihi.objects.bulk_create(tercihler, batch_size=TOPLU_KAYIT_BOYUTU)
+    AylikSaatDengesi.objects.bulk_create(dengeler, batch_size=TOPLU_KAYIT_BOYUTU)
+
+    return {'calisan': len(calisanlar), 'sube': len(subeler), 'tercih': len(tercihler), 'kural': len(kurallar)}
+
+
+def sentetik_veriyi_sil():
+    """Onceki sentetik veriyi (ve bagli tum kayitlari) siler"""
+    CustomUser.objects.filter(username__startswith=SENTETIK_ONEK).delete()
+    Sube.objects.filter(sube_adi__startswith=SENTETIK_ONEK).delete()
@@ -0,0 +1,108 @@
+# apps/schedules/planlama/uygunluk.py
+
+from bisect import bisect_right
+
+from apps.schedules.choices import KuralSart
+
+# Musaitlik durumlarinin degistigi saatler; [0,11), [11,14), [14,17), [17,24) dilimleri
+MUSAITLIK_ESIKLERI = (11, 14, 17)
+DILIM_TEMSILCI_SAATLERI = (0,) + MUSAITLIK_ESIKLERI
+
+# Kisitlama kurali sarti -> kurala takilan calisan
+SART_KOSULLARI = {
+    KuralSart.CINSIYET_KADIN: lambda calisan: calisan.cinsiyet == 'kadin',
+}
+
+
+def saat_dilimi(saat):
+    """Bir baslangic saatinin musaitlik dilimini dondur"""
+    return bisect_right(MUSAITLIK_ESIKLERI, saat)
+
+
+class UygunlukIndeksi:
+    """
+    (haftanin gunu, saat dilimi, sube) -> aday calisan id kumesi.
+
+    Sonuc yalnizca musaitlik dilimine ve subenin o saatte aktif olan kural
+    sartlarina bagli oldugu icin, ayni kombinasyonu paylasan tum anahtarlar
+    tek bir kumeyi paylasir. Aylik limite ulasan calisanlar tum kumelerden
+    cikarilir.
+    """
+
+    def __init__(self, calisanlar, musait_mi, kurallar):
+        # musait_mi(calisan_id, gun, saat) -> bool
+        self._musait_mi = musait_mi
+        self._calisan_idler = [calisan.id for calisan in calisanlar]
+        self._kurala_takilanlar = {
+            sart: {calisan.id for calisan in calisanlar if kosul(calisan)}
+            for sart, kosul in SART_KOSULLARI.items()
+        }
+
+        # Sube bazinda kural saatleri ve o saatten itibaren aktif sart kumeleri
+        sube_kurallari = {}
+        for kural in kurallar:
+            if kural.sart in SART_KOSULLARI:
+                sube_kurallari.setdefault(kural.sube_id, []).append((kural.baslangic_saati, kural.sart))
+        self._kural_saatleri = {}
+        self._aktif_sartlar = {}
+        for sube_id, liste in sube_kurallari.items():
+            liste.sort()
+            saatler, aktifler, aktif = [], [frozenset()], frozenset()
+            for saat, sart in liste:
+                aktif = aktif | {sart}
+                saatler.append(saat)
+                aktifler.append(aktif)
+            self._kural_saatleri[sube_id] = saatler
+            self._aktif_sartlar[sube_id] = aktifler
+
+        self._kumeler = {}
+        self._doygunlar = set()
+
+    def _anahtar(self, sube_id, baslangic_zamani):
+        saatler = self._kural_saatleri.get(sube_id)
+        if saatler:
+            aktif = self._aktif_sartlar[sube_id][bisect_right(saatler, baslangic_zamani.time())]
+        else:
+            aktif = frozenset()
+        return baslangic_zamani.isoweekday(), saat_dilimi(baslangic_zamani.hour), aktif
+
+    def adaylar(self, sube_id, baslangic_zamani):
+        """O sube ve baslangic icin uygun calisan id'leri (paylasilan kume, degistirmeyin)"""
+        anahtar = self._anahtar(sube_id, baslangic_zamani)
+        kume = self._kumeler.get(anahtar)
+        if kume is None:
+            kume = self._kume_olustur(*anahtar)
+            self._kumeler[anahtar] = kume
+        return kume
+
+    def _kume_olustur(self, gun, dilim, aktif_sartlar):
+        saat = DILIM_TEMSILCI_SAATLERI[dilim]
+        kume = {cid for cid in self._calisan_idler if self._musait_mi(cid, gun, saat)}
+        for sart in aktif_sartlar:
+            kume -= self._kurala_takilanlar[sart]
+        kume -= self._doygunlar
+        return kume
+
+    def uygun_mu(self, calisan_id, sube_id, baslangic_zamani):
+        """Musaitlik ve baslangic kurali; aylik limit (doygunluk) dikkate alinmaz"""
+        return self._uygun_mu(calisan_id, *self._anahtar(sube_id, baslangic_zamani))
+
+    def _uygun_mu(self, calisan_id, gun, dilim, aktif_sartlar):
+        if not self._musait_mi(calisan_id, gun, DILIM_TEMSILCI_SAATLERI[dilim]):
+            return False
+        return not any(calisan_id in self._kurala_takilanlar[sart] for sart in aktif_sartlar)
+
+    def doygun_yap(self, calisan_id):
+        """Aylik limite ulasan calisani tum aday kumelerinden cikar"""
+        self._doygunlar.add(calisan_id)
+        for kume in self._kumeler.values():
+            kume.discard(calisan_id)
+
+    def doygunluktan_cikar(self, calisan_id):
+        """Saatleri yeniden limitin altina inen calisani uygun oldugu kumelere geri ekle"""
+        if calisan_id not in self._doygunlar:
+            return
+        self._doygunlar.discard(calisan_id)
+        for (gun, dilim, aktif), kume in self._kumeler.items():
+            if self._uygun_mu(calisan_id, gun, dilim, aktif):
+                kume.add(calisan_id)
@@ -0,0 +1,124 @@
+# apps/schedules/planlama/veri.py
+
+import hashlib
+import json
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+from apps.users.models import CustomUser
+from apps.branches.models import Sube, SubeCalismaSaati
+from apps.schedules.models import Musaitlik, AylikSaatDengesi, CalisanTercihi, KisitlamaKurali
+
+Tercih = namedtuple('Tercih', 'calisan_id sube_id gun')
+Kural = namedtuple('Kural', 'sube_id sart baslangic_saati')
+
+# Motorun kurallari ayni girdiden farkli plan uretecek sekilde degisirse artirilir
+PARMAK_IZI_SURUMU = 1
+
+
+class PlanlamaVerisi:
+    """
+    Bir donemin planlamasi icin gereken tum girdilerin bellek ici anlik goruntusu.
+
+    Iliskiler *_id alanlari ve values_list ile okunur; calisan/sube sayisindan
+    bagimsiz olarak sabit sayida (SORGU_SAYISI) sorgu yapilir.
+    """
+
+    SORGU_SAYISI = 7
+
+    def __init__(self, donem):
+        self.donem = donem
+        self.yil, self.ay = map(int, donem.split('-'))
+
+    @classmethod
+    def yukle(cls, donem):
+        veri = cls(donem)
+
+        # 1-2: Calisanlar ve subeler (motorun ve loglarin kullandigi alanlar)
+        veri.calisanlar = list(
+            CustomUser.objects.filter(is_active=True, rol='calisan')
+            .only('id', 'username', 'first_name', 'last_name', 'cinsiyet', 'enlem', 'boylam')
+        )
+        veri.subeler = list(Sube.objects.only('id', 'sube_adi', 'enlem', 'boylam'))
+
+        # 3: calisan_id -> {gun: musaitlik_durumu}
+        veri.musaitlik = {}
+        for calisan_id, gun, durum in Musaitlik.objects.filter(donem=donem).values_list(
+                'calisan_id', 'gun', 'musaitlik_durumu'):
+            veri.musaitlik.setdefault(calisan_id, {})[gun] = durum
+
+        # 4: sube_id -> {gun: {'acilis', 'kapanis', 'kapali'}}
+        veri.calisma_saatleri = {}
+        for sube_id, gun, acilis, kapanis, kapali in SubeCalismaSaati.objects.values_list(
+                'sube_id', 'gun', 'acilis_saati', 'kapanis_saati', 'kapali'):
+            veri.calisma_saatleri.setdefault(sube_id, {})[gun] = {
+                'acilis': acilis if acilis else time(0, 0),
+                'kapanis': kapanis if kapanis else time(0, 0),
+                'kapali': kapali,
+            }
+
+        # 5: Sadece aktif calisanlarin tercihleri
+        veri.tercihler = [
+            Tercih(*satir) for satir in CalisanTercihi.objects.filter(
+                calisan__is_active=True, calisan__rol='calisan'
+            ).order_by('id').values_list('calisan_id', 'sube_id', 'gun')
+        ]
+
+        # 6
+        veri.kurallar = [
+            Kural(*satir) for satir in KisitlamaKurali.objects.order_by('id').values_list(
+                'sube_id', 'sart', 'baslangic_saati')
+        ]
+
+        # 7: Onceki ayin saat dengeleri
+        try:
+            onceki_donem = (datetime.strptime(donem, "%Y-%m") - timedelta(days=1)).strftime("%Y-%m")
+        except ValueError:
+            veri.onceki_ay_dengeleri = {}
+        else:
+            veri.onceki_ay_dengeleri = dict(
+                AylikSaatDengesi.objects.filter(donem=onceki_donem).values_list('calisan_id', 'denge')
+            )
+        return veri
+
+    def parmak_izi(self, *ekler):
+        """
+        Planlama girdilerinin kararli SHA-256 ozeti: musaitlik, tercihler, kurallar,
+        sube saatleri, aktif calisanlar ve onceki ay dengeleri. Motorun kullandigi
+        siralamalar (calisanlar, tercihler, kurallar) korunur, digerleri siralanir.
+        ekler (or. deneme icin mevcut plan) ozete katilir.
+        """
+        girdiler = {
+            'surum': PARMAK_IZI_SURUMU,
+            'donem': self.donem,
+            'calisanlar': [(c.id, c.cinsiyet, c.enlem, c.boylam) for c in self.calisanlar],
+            'subeler': [(s.id, s.enlem, s.boylam) for s in self.subeler],
+            'musaitlik': sorted(
+                (calisan_id, gun, durum)
+                for calisan_id, gunler in self.musaitlik.items() for gun, durum in gunler.items()
+            ),
+            'calisma_saatleri': sorted(
+                (sube_id, gun, saatler['acilis'], saatler['kapanis'], saatler['kapali'])
+                for sube_id, gunler in self.calisma_saatleri.items() for gun, saatler in gunler.items()
+            ),
+            'tercihler': self.tercihler,
+            'kurallar': self.kurallar,
+            'onceki_ay_dengeleri': sorted(self.onceki_ay_dengeleri.items()),
+            'ekler': ekler,
+        }
+        return hashlib.sha256(json.dumps(girdiler, sort_keys=True, default=str).encode()).hexdigest()
+
+    def parca(self, sube_idler, calisan_idler):
+        """Verilen sube ve calisanlarla sinirli bir kopya (paralel planlama kumeleri icin)"""
+        sube_idler, calisan_idler = set(sube_idler), set(calisan_idler)
+        parca = type(self)(self.donem)
+        parca.calisanlar = [c for c in self.calisanlar if c.id in calisan_idler]
+        parca.subeler = [s for s in self.subeler if s.id in sube_idler]
+        parca.musaitlik = {cid: g for cid, g in self.musaitlik.items() if cid in calisan_idler}
+        parca.calisma_saatleri = {sid: g for sid, g in self.calisma_saatleri.items() if sid in sube_idler}
+        parca.tercihler = [t for t in self.tercihler if t.calisan_id in calisan_idler and t.sube_id in sube_idler]
+        parca.kurallar = [k for k in self.kurallar if k.sube_id in sube_idler]
+        parca.onceki_ay_dengeleri = {
+            cid: denge for cid, denge in self.onceki_ay_dengeleri.items() if cid in calisan_idler
+        }
+        return parca
@@ -0,0 +1,25 @@
+# apps/schedules/planlama/yayin.py
+
+from datetime import timedelta
+
+from django.db import transaction
+
+from apps.schedules.choices import VardiyaDurum
+from apps.schedules.istatistik import ozetleri_yeniden_olustur
+from apps.schedules.planlama.fark import ay_araligi, taslak_vardiyalari
+
+
+def plani_yayinla(yil, ay, pencere=None):
+    """
+    Ayin (pencere verildiyse pencerenin) taslaklarini 'planlandi' yapar.
+    Yayinlanan vardiyalar artimli planlamada sabit kalir ve calisanlara
+    gorunur. Yayinlanan vardiya sayisini dondurur.
+    """
+    ay_basi, sonraki_ay = ay_araligi(yil, ay)
+    with transaction.atomic():
+        sayi = taslak_vardiyalari(yil, ay, pencere).update(durum=VardiyaDurum.PLANLANDI)
+        if pencere:
+            ozetleri_yeniden_olustur(*pencere)
+        else:
+            ozetleri_yeniden_olustur(ay_basi.date(), sonraki_ay.date() - timedelta(days=1))
+    return sayi
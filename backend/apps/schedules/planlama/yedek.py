@@ -0,0 +1,130 @@
+# apps/schedules/planlama/yedek.py
+
+import io
+import threading
+import time
+from datetime import datetime, timedelta
+
+from django.db.models import DurationField, ExpressionWrapper, F, Sum
+
+from apps.schedules.choices import VardiyaDurum
+from apps.schedules.models import Vardiya
+from apps.schedules.planlama.cakisma import AZAMI_VARDIYA_SURESI
+from apps.schedules.planlama.fark import ay_araligi, ay_vardiyalari, yerel_zaman
+from apps.schedules.planlama.profil import PlanlamaProfili
+from apps.schedules.planlama.veri import PlanlamaVerisi
+
+# Goruntu bu kadar saniye sonra veritabanindan yeniden kurulur
+GORUNTU_OMRU_SANIYE = 300
+# Calisanin saatini dolduran ve cakisma sayilan vardiyalar
+DOLU_DURUMLAR = [
+    VardiyaDurum.PLANLANDI, VardiyaDurum.BASLATILDI, VardiyaDurum.TAMAMLANDI,
+    VardiyaDurum.TASLAK, VardiyaDurum.IPTAL_ISTEGI,
+]
+
+_goruntuler = {}
+_kilit = threading.Lock()
+
+
+def ay_goruntusu(donem):
+    """
+    Donemin planlama girdileri ve mevcut atamalarinin yuklendigi motor durumu.
+    Surec icinde GORUNTU_OMRU_SANIYE boyunca onbellekte tutulur; ilk istekten
+    sonra yedek aramasi veritabanina gitmez.
+    """
+    with _kilit:
+        kayit = _goruntuler.get(donem)
+        if kayit is None or time.monotonic() - kayit[0] > GORUNTU_OMRU_SANIYE:
+            from apps.schedules.management.commands.create_schedule import Command
+
+            komut = Command(stdout=io.StringIO())
+            komut.ilerleme = None
+            komut.ayrintili = False
+            komut.profil = PlanlamaProfili()
+            veri = PlanlamaVerisi.yukle(donem)
+            komut.prepare_state(veri)
+            komut.load_shifts(vardiya[:4] for vardiya in ay_vardiyalari(veri.yil, veri.ay, DOLU_DURUMLAR))
+            kayit = _goruntuler[donem] = (time.monotonic(), komut)
+        return kayit[1]
+
+
+def goruntuyu_gecersiz_kil(donem=None):
+    """Plan toplu degistiginde (or. create_schedule kaydi) onbellekteki goruntuyu at"""
+    with _kilit:
+        if donem is None:
+            _goruntuler.clear()
+        else:
+            _goruntuler.pop(donem, None)
+
+
+def _kurala_uyar(komut, calisan, sube_id, bas, bit):
+    kural_saati = komut.check_restriction_end_time(calisan, sube_id)
+    if not kural_saati:
+        return True
+    kural_bitis = datetime.combine(bas.date(), kural_saati)
+    if kural_bitis < bas:
+        kural_bitis += timedelta(days=1)
+    return bas < kural_bitis and bit <= kural_bitis
+
+
+def yedek_adaylari(vardiya, haric=(), dinlenme=timedelta(0)):
+    """
+    Tek bir vardiya icin motorun uygunluk (musaitlik, baslangic kurali, aylik
+    limit), kisitlama bitis saati ve cakisma kontrollerinden gecen calisanlari
+    motorun siralamasiyla dondurur: [{'aday', 'puan', 'is_favorite'}, ...]
+    dinlenme verilirse vardiyaya o kadar yakin baska vardiyasi olanlar da elenir.
+    Ayni donemin vardiyalari ayni goruntuyu ve aday kumelerini paylasir.
+    """
+    from apps.schedules.management.commands.create_schedule import AYLIK_SAAT_LIMITI
+
+    bas, bit = yerel_zaman(vardiya.baslangic_zamani), yerel_zaman(vardiya.bitis_zamani)
+    komut = ay_goruntusu(bas.strftime('%Y-%m'))
+    sube_id = vardiya.sube_id
+    saat = (bit - bas).total_seconds() / 3600
+    # Goruntu istekler arasinda paylasilir ve yedegi_isle ile degisir; okuma da kilit altinda
+    with _kilit:
+        adaylar = [
+            aday for aday in komut.find_candidates(sube_id, bas)
+            if aday.id not in haric
+            and komut.atanan_saatler[komut.calisan_sirasi[aday.id]] + saat <= AYLIK_SAAT_LIMITI
+            and _kurala_uyar(komut, aday, sube_id, bas, bit)
+            and not komut.atanmis_vardiyalar.cakisiyor_mu(aday.id, bas, bit, dinlenme)
+        ]
+        return komut.rank_candidates(adaylar, sube_id, bas)
+
+
+def yedegi_isle(vardiya):
+    """Goruntuye yeni atamayi isle; sonraki aramalar bu calisani dolu gorur"""
+    bas, bit = yerel_zaman(vardiya.baslangic_zamani), yerel_zaman(vardiya.bitis_zamani)
+    with _kilit:
+        kayit = _goruntuler.get(bas.strftime('%Y-%m'))
+        if kayit is not None:
+            kayit[1].load_shifts([(vardiya.sube_id, vardiya.calisan_id, bas, bit)])
+
+
+def veritabaninda_cakisiyor_mu(calisan_id, vardiya):
+    """
+    Goruntu eskimis olabilir (baska gorunumlerdeki ya da baska sureclerdeki
+    atamalar); atamadan once son durum veritabanindan dogrulanir.
+    """
+    return Vardiya.objects.filter(
+        calisan_id=calisan_id,
+        durum__in=DOLU_DURUMLAR,
+        baslangic_zamani__gt=vardiya.baslangic_zamani - AZAMI_VARDIYA_SURESI,
+        baslangic_zamani__lt=vardiya.bitis_zamani,
+        bitis_zamani__gt=vardiya.baslangic_zamani,
+    ).exclude(id=vardiya.id).exists()
+
+
+def veritabaninda_limiti_asiyor_mu(calisan_id, vardiya):
+    """Vardiya eklenince calisanin o ayki dolu saatleri aylik limiti asiyor mu (veritabanina gore)"""
+    from apps.schedules.management.commands.create_schedule import AYLIK_SAAT_LIMITI
+
+    bas = yerel_zaman(vardiya.baslangic_zamani)
+    ay_basi, sonraki_ay = ay_araligi(bas.year, bas.month)
+    dolu = Vardiya.objects.filter(
+        calisan_id=calisan_id, durum__in=DOLU_DURUMLAR, baslangic_zamani__gte=ay_basi, baslangic_zamani__lt=sonraki_ay,
+    ).exclude(id=vardiya.id).aggregate(
+        sure=Sum(ExpressionWrapper(F('bitis_zamani') - F('baslangic_zamani'), output_field=DurationField()))
+    )['sure'] or timedelta(0)
+    return (dolu + vardiya.bitis_zamani - vardiya.baslangic_zamani).total_seconds() / 3600 > AYLIK_SAAT_LIMITI
@@ -1,7 +1,10 @@
 # apps/schedules/serializers.py
+from django.db.models import OuterRef, Subquery
 from rest_framework import serializers
-from .models import Musaitlik, Vardiya, VardiyaIstegi, VardiyaIptalIstegi, CalisanTercihi, KisitlamaKurali
-from .choices import Gunler, KuralSart
+from .models import Musaitlik, Vardiya, VardiyaIstegi, VardiyaIptalIstegi, CalisanTercihi, KisitlamaKurali, PlanIsi
+from .choices import Gunler, IstekDurum, KuralSart
+
+BEKLEYEN_ISTEK_DURUMLARI = [IstekDurum.HEDEF_ONAYI_BEKLIYOR, IstekDurum.ADMIN_ONAYI_BEKLIYOR]
 
 class MusaitlikSerializer(serializers.ModelSerializer):
     class Meta:
@@ -25,6 +28,23 @@ class KisitlamaKuraliSerializer(serializers.ModelSerializer):
         model = KisitlamaKurali
         fields = ['id', 'sube', 'sube_adi', 'sart', 'sart_display', 'baslangic_saati']
 
+def vardiya_listesi(queryset):
+    """
+    VardiyaSerializer ile listelenecek vardiyalar: sube ve calisan join ile,
+    bekleyen takas isteginin durumu ve bekleyen iptal isteginin id'si alt
+    sorgu olarak gelir. Satir sayisindan bagimsiz tek sorgu.
+    """
+    bekleyen_takas = VardiyaIstegi.objects.filter(
+        istek_yapan_vardiya=OuterRef('pk'), durum__in=BEKLEYEN_ISTEK_DURUMLARI
+    ).order_by('pk')
+    bekleyen_iptal = VardiyaIptalIstegi.objects.filter(
+        vardiya=OuterRef('pk'), durum=IstekDurum.ADMIN_ONAYI_BEKLIYOR
+    )
+    return queryset.select_related('sube', 'calisan').annotate(
+        bekleyen_istek_durumu=Subquery(bekleyen_takas.values('durum')[:1]),
+        bekleyen_iptal_istegi_id=Subquery(bekleyen_iptal.values('id')[:1]),
+    )
+
 class VardiyaSerializer(serializers.ModelSerializer):
     calisan_adi = serializers.SerializerMethodField()  # ← Metod olarak tanımla
     sube_adi = serializers.StringRelatedField(source='sube')
@@ -46,15 +66,19 @@ class VardiyaSerializer(serializers.ModelSerializer):
         return "Atanmamış"
 
     def get_iptal_istegi_id(self, obj):
+        # vardiya_listesi ile gelen satirlarda ek sorgu yok
+        if hasattr(obj, 'bekleyen_iptal_istegi_id'):
+            return obj.bekleyen_iptal_istegi_id
         if hasattr(obj, 'iptal_istegi') and obj.iptal_istegi.durum == 'admin_onayi_bekliyor':
             return obj.iptal_istegi.id
         return None
 
     def get_aktif_istek_durumu(self, obj):
-        bekleyen_durumlar = ['hedef_onayi_bekliyor', 'admin_onayi_bekliyor']
+        if hasattr(obj, 'bekleyen_istek_durumu'):
+            return obj.bekleyen_istek_durumu
         istek = VardiyaIstegi.objects.filter(
             istek_yapan_vardiya=obj,
-            durum__in=bekleyen_durumlar
+            durum__in=BEKLEYEN_ISTEK_DURUMLARI
         ).first()
         if istek:
             return istek.durum
@@ -106,3 +130,15 @@ class VardiyaIptalIstegiListSerializer(serializers.ModelSerializer):
             'durum',
             'olusturulma_tarihi',
         ]
+
+class PlanIsiSerializer(serializers.ModelSerializer):
+    durum_display = serializers.CharField(source='get_durum_display', read_only=True)
+    asama_display = serializers.CharField(source='get_asama_display', read_only=True)
+
+    class Meta:
+        model = PlanIsi
+        fields = [
+            'id', 'donem', 'deneme', 'durum', 'durum_display', 'asama', 'asama_display',
+            'ilerleme', 'atama_sayisi', 'kalan_bosluk', 'hata_mesaji', 'sonuc', 'profil', 'parmak_izi', 'onbellekten',
+            'olusturulma_tarihi', 'guncellenme_tarihi', 'bitis_tarihi'
+        ]
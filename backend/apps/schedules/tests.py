@@ -1,3 +1,904 @@
-from django.test import TestCase
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from importlib import import_module
+from types import SimpleNamespace
 
-# Create your tests here.
+from unittest import mock, skipUnless
+
+import numpy as np
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models import QuerySet, Sum
+from django.test.utils import CaptureQueriesContext
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.users.models import CustomUser
+from apps.branches.models import Sube, SubeCalismaSaati
+from .choices import IstekDurum, KuralSart, MusaitlikDurum, PlanIsiDurum, VardiyaDurum
+from .management.commands.create_schedule import (
+    AYLIK_SAAT_LIMITI, VARDIYA_MAX_SAAT, VARDIYA_MIN_SAAT, Command as PlanlamaKomutu,
+)
+from .models import (
+    Musaitlik, CalisanTercihi, KisitlamaKurali, AylikSaatDengesi, GunlukVardiyaOzeti, PlanIsi, Vardiya,
+    VardiyaIptalIstegi, VardiyaIstegi,
+)
+from .istatistik import ozet_anahtari, ozetleri_guncelle, ozetleri_yeniden_olustur
+from .planlama.cakisma import CalisanVardiyalari, VardiyaIndeksi
+from .planlama.isler import plan_isi_baslat, plan_isini_calistir
+from .planlama.kapsama import BlokKapsamasi
+from .planlama import mesafe
+from .planlama.mesafe import calisan_sube_mesafeleri
+from .planlama.optimal import blok_dilimleri
+from .planlama.sentetik import sentetik_veri_olustur
+from .planlama.uygunluk import UygunlukIndeksi
+from .planlama.veri import PlanlamaVerisi
+from .planlama.yayin import plani_yayinla
+from .planlama.yedek import goruntuyu_gecersiz_kil, veritabaninda_cakisiyor_mu
+
+
+def calisan_olustur(no, **kwargs):
+    return CustomUser.objects.create(username=f'calisan{no}', email=f'calisan{no}@test.com', rol='calisan', **kwargs)
+
+
+class PlanlamaVerisiTests(TestCase):
+    def setUp(self):
+        self.sube = Sube.objects.create(sube_adi='Merkez', adres='Adres')
+        SubeCalismaSaati.objects.create(sube=self.sube, gun=1, acilis_saati=time(8), kapanis_saati=time(22))
+        KisitlamaKurali.objects.create(sube=self.sube, sart='cinsiyet_kadin', baslangic_saati=time(20))
+
+    def calisanlar_ekle(self, adet, baslangic=0):
+        for no in range(baslangic, baslangic + adet):
+            calisan = calisan_olustur(no, cinsiyet='kadin')
+            Musaitlik.objects.create(calisan=calisan, gun=1, musaitlik_durumu='tüm gün', donem='2025-11')
+            CalisanTercihi.objects.create(calisan=calisan, sube=self.sube, gun=1)
+            AylikSaatDengesi.objects.create(calisan=calisan, donem='2025-10', denge=-2)
+
+    def test_sorgu_sayisi_calisan_sayisindan_bagimsiz(self):
+        self.calisanlar_ekle(2)
+        with self.assertNumQueries(PlanlamaVerisi.SORGU_SAYISI):
+            veri = PlanlamaVerisi.yukle('2025-11')
+        self.assertEqual(len(veri.calisanlar), 2)
+
+        self.calisanlar_ekle(20, baslangic=2)
+        with self.assertNumQueries(PlanlamaVerisi.SORGU_SAYISI):
+            veri = PlanlamaVerisi.yukle('2025-11')
+            # Motorun kullandigi alanlar ek sorgu yapmamali
+            for calisan in veri.calisanlar:
+                calisan.get_full_name(), calisan.cinsiyet, calisan.enlem, calisan.boylam
+        self.assertEqual(len(veri.calisanlar), 22)
+        self.assertEqual(len(veri.tercihler), 22)
+
+    def test_girdiler_id_ile_yuklenir(self):
+        self.calisanlar_ekle(1)
+        pasif = calisan_olustur(99, is_active=False)
+        CalisanTercihi.objects.create(calisan=pasif, sube=self.sube, gun=1)
+
+        veri = PlanlamaVerisi.yukle('2025-11')
+        calisan_id = veri.calisanlar[0].id
+        self.assertEqual(veri.musaitlik, {calisan_id: {1: 'tüm gün'}})
+        self.assertEqual(veri.calisma_saatleri[self.sube.id][1], {'acilis': time(8), 'kapanis': time(22), 'kapali': False})
+        self.assertEqual(veri.tercihler, [(calisan_id, self.sube.id, 1)])
+        self.assertEqual(veri.kurallar, [(self.sube.id, 'cinsiyet_kadin', time(20))])
+        self.assertEqual(veri.onceki_ay_dengeleri, {calisan_id: -2})
+
+
+class PlanIsiTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user(username='admin', email='admin@test.com', password='x', is_staff=True, rol='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_ayni_donem_icin_tek_is_olusur(self):
+        ilk = self.client.post(reverse('plan-olustur'), {'donem': '2025-11'}, format='json')
+        ikinci = self.client.post(reverse('plan-olustur'), {'donem': '2025-11'}, format='json')
+        self.assertEqual(ilk.status_code, 202)
+        self.assertEqual(ikinci.status_code, 200)
+        self.assertEqual(ilk.data['is_id'], ikinci.data['is_id'])
+        self.assertEqual(PlanIsi.objects.count(), 1)
+
+        durum = self.client.get(reverse('plan-isi-durum', args=[ilk.data['is_id']]))
+        self.assertEqual(durum.data['durum'], PlanIsiDurum.BEKLIYOR)
+
+    def test_zaman_asimina_ugrayan_bekleyen_is_yenilenir(self):
+        eski = PlanIsi.objects.create(donem='2025-11')
+        PlanIsi.objects.filter(id=eski.id).update(guncellenme_tarihi=timezone.now() - timedelta(days=3))
+
+        plan_isi, yeni_mi = plan_isi_baslat('2025-11')
+        self.assertTrue(yeni_mi)
+        self.assertNotEqual(plan_isi.id, eski.id)
+        eski.refresh_from_db()
+        self.assertEqual(eski.durum, PlanIsiDurum.HATA)
+        # Kuyrukta kalmis eski is sonradan calissa da bir sey yapmaz
+        self.assertEqual(plan_isini_calistir(eski.id).durum, PlanIsiDurum.HATA)
+
+    def test_gecersiz_donem(self):
+        cevap = self.client.post(reverse('plan-olustur'), {'donem': '2025-13'}, format='json')
+        self.assertEqual(cevap.status_code, 400)
+
+    def plan_verisi_olustur(self):
+        sube = Sube.objects.create(sube_adi='Merkez', adres='Adres')
+        SubeCalismaSaati.objects.create(sube=sube, gun=1, acilis_saati=time(9), kapanis_saati=time(18))
+        calisan = calisan_olustur(1)
+        Musaitlik.objects.create(calisan=calisan, gun=1, musaitlik_durumu='tüm gün', donem='2025-11')
+        return sube, calisan
+
+    def test_is_calisinca_ilerleme_ve_sayaclar_kaydedilir(self):
+        sube, calisan = self.plan_verisi_olustur()
+
+        plan_isi = plan_isini_calistir(PlanIsi.objects.create(donem='2025-11').id)
+        plan_isi.refresh_from_db()
+        self.assertEqual(plan_isi.durum, PlanIsiDurum.TAMAMLANDI)
+        self.assertEqual(plan_isi.ilerleme, 100)
+        # Kasim 2025'te 4 pazartesi var
+        self.assertEqual(plan_isi.atama_sayisi, 4)
+        self.assertEqual(Vardiya.objects.filter(calisan=calisan).count(), 4)
+
+        profil = plan_isi.profil
+        self.assertEqual(profil['sayaclar']['atama'], 4)
+        self.assertGreater(profil['sayaclar']['sorgu'], 0)
+        self.assertLessEqual({'veri', 'bloklar', 'favoriler', 'doldurma', 'kayit'}, set(profil['asamalar']))
+
+    def test_ayni_girdilerle_tekrar_calisan_is_onceki_sonucu_kullanir(self):
+        sube, calisan = self.plan_verisi_olustur()
+        ilk = plan_isini_calistir(PlanIsi.objects.create(donem='2025-11').id)
+        ikinci = plan_isini_calistir(PlanIsi.objects.create(donem='2025-11').id)
+        self.assertEqual(len(ilk.parmak_izi), 64)
+        self.assertEqual(ikinci.parmak_izi, ilk.parmak_izi)
+        self.assertTrue(ikinci.onbellekten)
+        self.assertEqual(ikinci.atama_sayisi, 4)
+        self.assertEqual(Vardiya.objects.count(), 4)
+
+        # Plan elle silinirse parmak izi degisir ve is plani yeniden yazar
+        Vardiya.objects.all().delete()
+        yeniden = plan_isini_calistir(PlanIsi.objects.create(donem='2025-11').id)
+        self.assertFalse(yeniden.onbellekten)
+        self.assertEqual(Vardiya.objects.count(), 4)
+        self.assertEqual(yeniden.parmak_izi, ilk.parmak_izi)
+
+        Musaitlik.objects.filter(calisan=calisan).update(musaitlik_durumu='14 sonrası')
+        ucuncu = plan_isini_calistir(PlanIsi.objects.create(donem='2025-11').id)
+        self.assertNotEqual(ucuncu.parmak_izi, ilk.parmak_izi)
+        self.assertFalse(ucuncu.onbellekten)
+
+    def test_sessiz_calisma_atama_satiri_yazmaz(self):
+        self.plan_verisi_olustur()
+        cikti = io.StringIO()
+        call_command('create_schedule', '2025-11', dry_run=True, verbosity=0, stdout=cikti)
+        self.assertNotIn('[OK] Atama', cikti.getvalue())
+        self.assertIn('[PROFIL]', cikti.getvalue())
+
+    def test_deneme_isi_veritabanina_yazmaz_ve_farki_dondurur(self):
+        sube, calisan = self.plan_verisi_olustur()
+        # Planda olmayacak eski bir taslak
+        Vardiya.objects.create(sube=sube, calisan=calisan, durum='taslak',
+                               baslangic_zamani=timezone.make_aware(datetime(2025, 11, 4, 9)),
+                               bitis_zamani=timezone.make_aware(datetime(2025, 11, 4, 18)))
+        # Yayinlanmis vardiya kayitta silinmez, farkta da 'silinen' olmamali
+        Vardiya.objects.create(sube=sube, calisan=calisan, durum=VardiyaDurum.PLANLANDI,
+                               baslangic_zamani=timezone.make_aware(datetime(2025, 11, 5, 9)),
+                               bitis_zamani=timezone.make_aware(datetime(2025, 11, 5, 18)))
+
+        plan_isi = plan_isini_calistir(PlanIsi.objects.create(donem='2025-11', deneme=True).id)
+        self.assertEqual(plan_isi.durum, PlanIsiDurum.TAMAMLANDI)
+        self.assertEqual(Vardiya.objects.count(), 2)
+        self.assertEqual(len(plan_isi.sonuc['plan']), 4)
+        self.assertEqual(plan_isi.sonuc['fark']['ozet'], {'ayni': 0, 'eklenen': 4, 'silinen': 1, 'degisen': 0})
+        self.assertEqual(plan_isi.sonuc['fark']['subeler'][0]['sube_adi'], 'Merkez')
+
+    def test_kayit_yarida_kalirsa_onceki_taslaklar_korunur(self):
+        sube, calisan = self.plan_verisi_olustur()
+        eski = Vardiya.objects.create(sube=sube, calisan=calisan, durum=VardiyaDurum.TASLAK,
+                                      baslangic_zamani=timezone.make_aware(datetime(2025, 11, 4, 9)),
+                                      bitis_zamani=timezone.make_aware(datetime(2025, 11, 4, 18)))
+        hatalar = {
+            'toplu kayit': mock.patch.object(Vardiya.objects, 'bulk_create', side_effect=RuntimeError),
+            'ozetler': mock.patch(
+                'apps.schedules.management.commands.create_schedule.ozetleri_yeniden_olustur', side_effect=RuntimeError,
+            ),
+        }
+        for ad, yama in hatalar.items():
+            with self.subTest(ad), yama, self.assertRaises(RuntimeError):
+                call_command('create_schedule', '2025-11', verbosity=0, stdout=io.StringIO())
+            self.assertEqual(list(Vardiya.objects.values_list('id', flat=True)), [eski.id])
+
+
+class CakismaTests(SimpleTestCase):
+    def test_cakisma_ve_dinlenme_araligi(self):
+        gun = datetime(2025, 11, 3)
+        vardiyalar = CalisanVardiyalari([(gun.replace(hour=9), gun.replace(hour=13)),
+                                         (gun.replace(hour=8), gun.replace(hour=18))])
+        # Ic ice vardiyalar da dogru sayilir
+        self.assertEqual(vardiyalar.cakisan_sayisi(gun.replace(hour=10), gun.replace(hour=11)), 2)
+        # Ucu uca degmek cakisma degildir
+        self.assertFalse(vardiyalar.cakisiyor_mu(gun.replace(hour=18), gun.replace(hour=22)))
+        self.assertTrue(vardiyalar.cakisiyor_mu(gun.replace(hour=19), gun.replace(hour=22), timedelta(hours=2)))
+        self.assertFalse(vardiyalar.cakisiyor_mu(gun.replace(hour=20), gun.replace(hour=22), timedelta(hours=2)))
+
+        vardiyalar.cikar(gun.replace(hour=8), gun.replace(hour=18))
+        self.assertEqual(vardiyalar.cakisan_sayisi(gun.replace(hour=10), gun.replace(hour=11)), 1)
+        self.assertFalse(vardiyalar.cakisiyor_mu(gun.replace(hour=14), gun.replace(hour=16)))
+        self.assertEqual(len(vardiyalar), 1)
+
+
+class KapsamaTests(SimpleTestCase):
+    def test_bitisik_ve_ortusen_araliklar_birlesir(self):
+        gun = datetime(2025, 11, 3)
+        kapsama = BlokKapsamasi(gun.replace(hour=8), gun.replace(hour=22))
+        kapsama.ekle(gun.replace(hour=9), gun.replace(hour=11))
+        kapsama.ekle(gun.replace(hour=11), gun.replace(hour=13))
+        self.assertEqual(list(kapsama), [(gun.replace(hour=9), gun.replace(hour=13))])
+        kapsama.ekle(gun.replace(hour=16), gun.replace(hour=18))
+        kapsama.ekle(gun.replace(hour=12), gun.replace(hour=14))
+        # Bos aralik yok sayilir
+        kapsama.ekle(gun.replace(hour=20), gun.replace(hour=20))
+        self.assertEqual(list(kapsama), [(gun.replace(hour=9), gun.replace(hour=14)),
+                                         (gun.replace(hour=16), gun.replace(hour=18))])
+        self.assertTrue(kapsama.kapsiyor_mu(gun.replace(hour=10), gun.replace(hour=14)))
+        self.assertFalse(kapsama.kapsiyor_mu(gun.replace(hour=13), gun.replace(hour=17)))
+
+        # Iki araligi kapsayan ekleme hepsini tek araliga indirir
+        kapsama.ekle(gun.replace(hour=10), gun.replace(hour=19))
+        self.assertEqual(list(kapsama), [(gun.replace(hour=9), gun.replace(hour=19))])
+
+    def test_bosluklar_min_sureden_kisalari_atlar(self):
+        gun = datetime(2025, 11, 3)
+        kapsama = BlokKapsamasi(gun.replace(hour=8), gun.replace(hour=20), min_sure_saat=2)
+        self.assertEqual(kapsama.bosluklar(), ((gun.replace(hour=8), gun.replace(hour=20)),))
+        kapsama.ekle(gun.replace(hour=9), gun.replace(hour=13))
+        kapsama.ekle(gun.replace(hour=14), gun.replace(hour=18))
+        # 8-9 ve 13-14 iki saatten kisa
+        self.assertEqual(kapsama.bosluklar(), ((gun.replace(hour=18), gun.replace(hour=20)),))
+        self.assertFalse(kapsama.tamamen_dolu)
+        kapsama.ekle(gun.replace(hour=18), gun.replace(hour=20))
+        self.assertEqual(kapsama.bosluklar(), ())
+        self.assertTrue(kapsama.tamamen_dolu)
+
+
+class UygunlukIndeksiTests(SimpleTestCase):
+    def setUp(self):
+        calisanlar = [SimpleNamespace(id=1, cinsiyet='erkek'), SimpleNamespace(id=2, cinsiyet='erkek'),
+                      SimpleNamespace(id=3, cinsiyet='kadin')]
+        def musait_mi(calisan_id, gun, saat):
+            # 2 numara yalnizca 14'ten sonra musait
+            return calisan_id != 2 or saat >= 14
+
+        kurallar = [SimpleNamespace(sube_id=1, sart=KuralSart.CINSIYET_KADIN, baslangic_saati=time(18))]
+        self.indeks = UygunlukIndeksi(calisanlar, musait_mi, kurallar)
+        self.pazartesi = datetime(2025, 11, 3)
+
+    def test_ayni_dilim_ve_kurallar_kumeyi_paylasir(self):
+        sabah = self.indeks.adaylar(1, self.pazartesi.replace(hour=9))
+        self.assertEqual(sabah, {1, 3})
+        # Ayni musaitlik dilimi, kural saatinden once: ayni kume nesnesi
+        self.assertIs(self.indeks.adaylar(1, self.pazartesi.replace(hour=10)), sabah)
+        self.assertIs(self.indeks.adaylar(2, self.pazartesi.replace(hour=9)), sabah)
+        # Kural yalnizca 1 numarali subede 18'den sonra baslayan vardiyalarda aktif
+        self.assertEqual(self.indeks.adaylar(1, self.pazartesi.replace(hour=19)), {1, 2})
+        self.assertEqual(self.indeks.adaylar(2, self.pazartesi.replace(hour=19)), {1, 2, 3})
+        self.assertFalse(self.indeks.uygun_mu(3, 1, self.pazartesi.replace(hour=19)))
+
+    def test_doygunluk_kumelerden_cikarir_ve_geri_ekler(self):
+        sabah = self.indeks.adaylar(1, self.pazartesi.replace(hour=9))
+        aksam = self.indeks.adaylar(1, self.pazartesi.replace(hour=19))
+        self.indeks.doygun_yap(1)
+        self.assertEqual((sabah, aksam), ({3}, {2}))
+        # Doygunluktan sonra olusan kumeye de girmez; uygun_mu doygunlugu saymaz
+        sali = self.indeks.adaylar(2, self.pazartesi.replace(hour=15) + timedelta(days=1))
+        self.assertEqual(sali, {2, 3})
+        self.assertTrue(self.indeks.uygun_mu(1, 1, self.pazartesi.replace(hour=9)))
+
+        self.indeks.doygunluktan_cikar(1)
+        self.assertEqual((sabah, aksam, sali), ({1, 3}, {1, 2}, {1, 2, 3}))
+        # Uygun olmadigi kumeye eklenmez
+        self.indeks.doygun_yap(2)
+        self.indeks.doygunluktan_cikar(2)
+        self.assertEqual(sabah, {1, 3})
+
+
+class MesafeTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_matris_ve_onbellek(self):
+        calisanlar = [SimpleNamespace(enlem=41.0082, boylam=28.9784), SimpleNamespace(enlem=None, boylam=None)]
+        subeler = [SimpleNamespace(enlem=41.0082, boylam=28.9784), SimpleNamespace(enlem=39.9334, boylam=32.8597)]
+        with mock.patch('apps.schedules.planlama.mesafe.mesafe_matrisi', wraps=mesafe.mesafe_matrisi) as hesap:
+            matris = calisan_sube_mesafeleri(calisanlar, subeler)
+            self.assertEqual(matris.shape, (2, 2))
+            self.assertAlmostEqual(matris[0, 0], 0)
+            # Istanbul - Ankara kus ucusu ~350 km
+            self.assertAlmostEqual(matris[0, 1], 350, delta=5)
+            # Koordinati eksik calisanin mesafesi bilinmez
+            self.assertTrue(np.isnan(matris[1]).all())
+
+            # Ayni koordinatlar onbellekten gelir, biri degisince yeniden hesaplanir
+            self.assertTrue(np.array_equal(calisan_sube_mesafeleri(calisanlar, subeler), matris, equal_nan=True))
+            self.assertEqual(hesap.call_count, 1)
+            calisanlar[1].enlem, calisanlar[1].boylam = 39.9334, 32.8597
+            self.assertAlmostEqual(calisan_sube_mesafeleri(calisanlar, subeler)[1, 1], 0)
+            self.assertEqual(hesap.call_count, 2)
+
+
+class UygunCalisanTests(TestCase):
+    def test_cakisan_ve_dinlenmeyi_bozan_calisanlar_dislanir(self):
+        admin = CustomUser.objects.create_user(username='admin', email='admin@test.com', password='x', is_staff=True, rol='admin')
+        sube = Sube.objects.create(sube_adi='Merkez', adres='Adres')
+        saat = lambda h: timezone.make_aware(datetime(2025, 11, 3, h))
+        bos, cakisan, yakin, asil = (calisan_olustur(no) for no in range(4))
+        vardiya = Vardiya.objects.create(sube=sube, calisan=asil, baslangic_zamani=saat(12), bitis_zamani=saat(18))
+        Vardiya.objects.create(sube=sube, calisan=cakisan, baslangic_zamani=saat(15), bitis_zamani=saat(20))
+        Vardiya.objects.create(sube=sube, calisan=yakin, baslangic_zamani=saat(6), bitis_zamani=saat(10))
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        url = reverse('uygun-calisan-list', args=[vardiya.id])
+        self.assertEqual({c['id'] for c in client.get(url).data}, {bos.id, yakin.id})
+        self.assertEqual({c['id'] for c in client.get(url, {'dinlenme_saati': 3}).data}, {bos.id})
+        for gecersiz in ('abc', 'inf', 'nan', '-1', '1e300'):
+            self.assertEqual(client.get(url, {'dinlenme_saati': gecersiz}).status_code, 400)
+
+
+class TopluUygunCalisanTests(TestCase):
+    def test_motor_kurallari_uygulanir(self):
+        goruntuyu_gecersiz_kil()
+        admin = CustomUser.objects.create_user(username='admin', email='admin@test.com', password='x', is_staff=True, rol='admin')
+        sube = Sube.objects.create(sube_adi='Merkez', adres='Adres')
+        KisitlamaKurali.objects.create(sube=sube, sart='cinsiyet_kadin', baslangic_saati=time(18))
+        saat = lambda h: timezone.make_aware(datetime(2025, 11, 3, h))
+        tum_gun, ogleden_sonra, musait_degil, kadin, mesgul = (
+            calisan_olustur(no, cinsiyet='kadin' if no == 3 else 'erkek') for no in range(5)
+        )
+        for calisan, durum in ((tum_gun, 'tüm gün'), (ogleden_sonra, '14 sonrası'), (musait_degil, 'müsait değil'),
+                               (kadin, 'tüm gün'), (mesgul, 'tüm gün')):
+            Musaitlik.objects.create(calisan=calisan, gun=1, musaitlik_durumu=durum, donem='2025-11')
+        sabah = Vardiya.objects.create(sube=sube, baslangic_zamani=saat(9), bitis_zamani=saat(13))
+        aksam = Vardiya.objects.create(sube=sube, baslangic_zamani=saat(15), bitis_zamani=saat(20))
+        Vardiya.objects.create(sube=sube, calisan=mesgul, baslangic_zamani=saat(14), bitis_zamani=saat(22), durum='planlandi')
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        cevap = client.post(reverse('toplu-uygun-calisan'), {'vardiya_idler': [sabah.id, aksam.id, 0]}, format='json')
+        adaylar = {s['vardiya_id']: {a['id'] for a in s['adaylar']} for s in cevap.data['sonuclar']}
+        self.assertEqual(adaylar[sabah.id], {tum_gun.id, kadin.id, mesgul.id})
+        self.assertEqual(adaylar[aksam.id], {tum_gun.id, ogleden_sonra.id})
+        self.assertEqual(cevap.data['bulunamayanlar'], [0])
+
+        url = reverse('toplu-uygun-calisan')
+        for gecersiz in ({'vardiya_idler': ['abc']}, {'vardiya_idler': [str(sabah.id)]}, {'vardiya_idler': [True]},
+                         {'vardiya_idler': [sabah.id], 'dinlenme_saati': 'inf'},
+                         {'vardiya_idler': [sabah.id], 'dinlenme_saati': -1},
+                         {'vardiya_idler': [sabah.id], 'aday_sayisi': 0},
+                         {'vardiya_idler': [sabah.id], 'aday_sayisi': -1}):
+            self.assertEqual(client.post(url, gecersiz, format='json').status_code, 400)
+
+
+class MusaitlikKuraliTests(TestCase):
+    def test_motor_kayitli_musaitlik_degerlerini_uygular(self):
+        sube = Sube.objects.create(sube_adi='Merkez', adres='Adres')
+        SubeCalismaSaati.objects.create(sube=sube, gun=1, acilis_saati=time(9), kapanis_saati=time(13))
+        # Esit puanli adaylarda ilk olusturulan secilir; kisitli calisanlar once olusturulur
+        musait_degil, ogleden_sonra, tum_gun = (calisan_olustur(no) for no in range(3))
+        for calisan, durum in ((tum_gun, MusaitlikDurum.TUM_GUN), (musait_degil, MusaitlikDurum.MUSAIT_DEGIL),
+                               (ogleden_sonra, MusaitlikDurum.SAAT_14_SONRASI)):
+            Musaitlik.objects.create(calisan=calisan, gun=1, musaitlik_durumu=durum, donem='2025-11')
+
+        komut = PlanlamaKomutu()
+        call_command(komut, '2025-11', dry_run=True, verbosity=0, stdout=io.StringIO())
+        # Kasim 2025'te 4 pazartesi; sabah blogunu sadece tum gun musait olan alabilir
+        self.assertEqual([v.calisan_id for v in komut.planlanan_vardiyalar], [tum_gun.id] * 4)
+
+
+class VardiyaListesiTests(TestCase):
+    def setUp(self):
+        self.sube = Sube.objects.create(sube_adi='Merkez', adres='Adres')
+        self.calisan = calisan_olustur(0, first_name='Ayse', last_name='Kaya')
+        self.diger = calisan_olustur(1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.calisan)
+
+    def vardiyalar_olustur(self, adet):
+        for gun in range(adet):
+            bas = timezone.now() + timedelta(days=gun + 1)
+            vardiya = Vardiya.objects.create(
+                sube=self.sube, calisan=self.calisan, baslangic_zamani=bas, bitis_zamani=bas + timedelta(hours=8),
+                durum=VardiyaDurum.PLANLANDI,
+            )
+            hedef = Vardiya.objects.create(
+                sube=self.sube, calisan=self.diger, baslangic_zamani=bas, bitis_zamani=bas + timedelta(hours=8),
+                durum=VardiyaDurum.PLANLANDI,
+            )
+            VardiyaIstegi.objects.create(
+                istek_tipi='takas', istek_yapan_vardiya=vardiya, hedef_vardiya=hedef,
+                istek_yapan=self.calisan, hedef_calisan=self.diger,
+            )
+            VardiyaIptalIstegi.objects.create(istek_yapan=self.diger, vardiya=hedef)
+
+    def test_sorgu_sayisi_satir_sayisindan_bagimsiz(self):
+        yarin = timezone.localdate() + timedelta(days=1)
+        pencere = f'?from={yarin}&to={yarin + timedelta(days=10)}'
+        for url in (reverse('vardiya-list') + pencere, reverse('benim-vardiyalarim')):
+            Vardiya.objects.all().delete()
+            self.vardiyalar_olustur(1)
+            with self.assertNumQueries(1):
+                self.client.get(url)
+            self.vardiyalar_olustur(5)
+            with self.assertNumQueries(1):
+                self.client.get(url)
+
+    def test_bekleyen_istekler_alt_sorgudan(self):
+        self.vardiyalar_olustur(1)
+        yarin = timezone.localdate() + timedelta(days=1)
+        cevap = self.client.get(reverse('vardiya-list'), {'from': yarin, 'to': yarin + timedelta(days=1)})
+        satirlar = {v['calisan']: v for v in cevap.data['results']}
+        kendi, hedef = satirlar[self.calisan.id], satirlar[self.diger.id]
+        self.assertEqual(kendi['calisan_adi'], 'Ayse Kaya')
+        self.assertEqual(kendi['sube_adi'], 'Merkez')
+        self.assertEqual(kendi['aktif_istek_durumu'], IstekDurum.HEDEF_ONAYI_BEKLIYOR)
+        self.assertIsNone(kendi['iptal_istegi_id'])
+        self.assertEqual(hedef['calisan_adi'], self.diger.username)
+        self.assertIsNone(hedef['aktif_istek_durumu'])
+        self.assertEqual(hedef['iptal_istegi_id'], VardiyaIptalIstegi.objects.get().id)
+
+
+class VardiyaSayfalamaTests(TestCase):
+    def setUp(self):
+        self.subeler = [Sube.objects.create(sube_adi=f'Sube {no}', adres='Adres') for no in range(2)]
+        self.calisanlar = [calisan_olustur(no) for no in range(2)]
+        saat = lambda gun, h: timezone.make_aware(datetime(2025, 11, gun, h))
+        # Ayni baslangic zamanina sahip vardiyalar sayfa sinirinda id ile ayrilir
+        for gun in (3, 4, 5):
+            for no in range(4):
+                Vardiya.objects.create(
+                    sube=self.subeler[no % 2], calisan=self.calisanlar[no // 2], durum=VardiyaDurum.PLANLANDI,
+                    baslangic_zamani=saat(gun, 9), bitis_zamani=saat(gun, 17),
+                )
+        Vardiya.objects.create(sube=self.subeler[0], baslangic_zamani=saat(4, 9), bitis_zamani=saat(4, 17))
+        self.client = APIClient()
+        self.client.force_authenticate(self.calisanlar[0])
+
+    def tum_sayfalar(self, parametreler):
+        cevap = self.client.get(reverse('vardiya-list'), parametreler)
+        idler, sayfa = [v['id'] for v in cevap.data['results']], 1
+        while cevap.data['next']:
+            with self.assertNumQueries(1):
+                cevap = self.client.get(cevap.data['next'])
+            idler += [v['id'] for v in cevap.data['results']]
+            sayfa += 1
+        return idler, sayfa
+
+    def test_imlec_tum_pencereyi_tekrarsiz_dolasir(self):
+        idler, sayfa = self.tum_sayfalar({'from': '2025-11-01', 'to': '2025-11-30', 'sayfa_boyutu': 5})
+        beklenen = Vardiya.objects.exclude(durum='taslak').order_by('baslangic_zamani', 'id')
+        self.assertEqual(idler, list(beklenen.values_list('id', flat=True)))
+        self.assertEqual(sayfa, 3)
+
+    def test_filtreler(self):
+        idler, _ = self.tum_sayfalar({
+            'from': '2025-11-04', 'to': '2025-11-05', 'sube': self.subeler[1].id, 'calisan': self.calisanlar[0].id,
+        })
+        self.assertEqual(set(idler), set(Vardiya.objects.filter(
+            sube=self.subeler[1], calisan=self.calisanlar[0], baslangic_zamani__date__gte=date(2025, 11, 4),
+        ).values_list('id', flat=True)))
+        self.assertEqual(len(idler), 2)
+        # Varsayilan pencere bu ay
+        self.assertEqual(self.client.get(reverse('vardiya-list')).data['results'], [])
+
+    def test_gecersiz_parametre(self):
+        for parametreler in ({'from': '2025-11-31'}, {'from': '2025-11-10', 'to': '2025-11-01'}, {'sube': 'x'},
+                             {'from': '0001-01-01', 'to': '9999-12-31'}):
+            self.assertEqual(self.client.get(reverse('vardiya-list'), parametreler).status_code, 400)
+        self.assertEqual(self.client.get(reverse('vardiya-list'), {'imlec': 'bozuk'}).status_code, 404)
+
+
+class OtomatikYedekTests(TestCase):
+    def setUp(self):
+        goruntuyu_gecersiz_kil()
+        sentetik_veri_olustur(40, 3, '2025-11', tohum=13)
+        call_command('create_schedule', '2025-11', verbosity=0, stdout=io.StringIO())
+        self.vardiya = Vardiya.objects.filter(calisan__isnull=False).order_by('baslangic_zamani').first()
+        self.istek = VardiyaIptalIstegi.objects.create(
+            istek_yapan=self.vardiya.calisan, vardiya=self.vardiya, orijinal_vardiya_durumu=self.vardiya.durum,
+        )
+        Vardiya.objects.filter(id=self.vardiya.id).update(durum=VardiyaDurum.IPTAL_ISTEGI)
+        admin = CustomUser.objects.create_user(username='admin', email='admin@test.com', password='x', is_staff=True, rol='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.url = reverse('admin-iptal-istek-aksiyon', args=[self.istek.id])
+
+    def test_liste_degisiklik_yapmaz_ata_ilk_adayi_atar(self):
+        liste = self.client.post(self.url, {'action': 'onayla', 'otomatik_doldur': 'liste', 'aday_sayisi': 3}, format='json')
+        self.assertEqual(liste.status_code, 200)
+        self.assertTrue(0 < len(liste.data['adaylar']) <= 3)
+        self.assertNotIn(self.vardiya.calisan_id, [a['id'] for a in liste.data['adaylar']])
+        self.istek.refresh_from_db()
+        self.assertEqual(self.istek.durum, IstekDurum.ADMIN_ONAYI_BEKLIYOR)
+
+        cevap = self.client.post(self.url, {'action': 'onayla', 'otomatik_doldur': 'ata'}, format='json')
+        self.assertEqual(cevap.data['atanan_calisan_id'], liste.data['adaylar'][0]['id'])
+        self.vardiya.refresh_from_db()
+        self.assertEqual(self.vardiya.calisan_id, cevap.data['atanan_calisan_id'])
+        self.assertEqual(self.vardiya.durum, self.istek.orijinal_vardiya_durumu)
+        self.assertFalse(Vardiya.objects.filter(
+            calisan_id=self.vardiya.calisan_id,
+            baslangic_zamani__lt=self.vardiya.bitis_zamani, bitis_zamani__gt=self.vardiya.baslangic_zamani,
+        ).exclude(id=self.vardiya.id).exists())
+
+
+    def test_ata_aylik_limiti_veritabanindan_dogrular(self):
+        liste = self.client.post(self.url, {'action': 'onayla', 'otomatik_doldur': 'liste'}, format='json')
+        ilk_aday = liste.data['adaylar'][0]['id']
+        # Goruntunun disinda (or. baska bir surecte) ilk adaya limiti dolduran bir vardiya yazilir
+        bas = timezone.make_aware(datetime(2025, 11, 20))
+        Vardiya.objects.create(sube=self.vardiya.sube, calisan_id=ilk_aday, durum=VardiyaDurum.PLANLANDI,
+                               baslangic_zamani=bas, bitis_zamani=bas + timedelta(hours=AYLIK_SAAT_LIMITI))
+
+        cevap = self.client.post(self.url, {'action': 'onayla', 'otomatik_doldur': 'ata'}, format='json')
+        self.assertNotEqual(cevap.data['atanan_calisan_id'], ilk_aday)
+
+    def test_gecersiz_aday_sayisi(self):
+        for aday_sayisi in (0, -1, 'x'):
+            cevap = self.client.post(self.url, {'action': 'onayla', 'otomatik_doldur': 'liste', 'aday_sayisi': aday_sayisi},
+                                     format='json')
+            self.assertEqual(cevap.status_code, 400)
+
+
+class SentetikVeriTests(TestCase):
+    def test_sentetik_veri_komutu(self):
+        cikti = io.StringIO()
+        call_command('generate_synthetic_data', '2025-11', calisan=12, sube=2, tohum=4, stdout=cikti)
+        self.assertIn('12 calisan, 2 sube', cikti.getvalue())
+        self.assertEqual(Sube.objects.count(), 2)
+        self.assertEqual(CustomUser.objects.filter(rol='calisan').count(), 12)
+        self.assertEqual(Musaitlik.objects.filter(donem='2025-11').count(), 12 * 7)
+
+        call_command('generate_synthetic_data', '2025-11', calisan=5, sube=1, temizle=True, stdout=io.StringIO())
+        self.assertEqual(CustomUser.objects.filter(rol='calisan').count(), 5)
+
+
+class KiyaslamaKomutuTests(TransactionTestCase):
+    # Komut kendi gecici veritabanini kurup kaldirir; test transaction'i icinde calisamaz
+    def test_kiyaslama_raporu(self):
+        cikti = io.StringIO()
+        call_command('benchmark_schedule', boyutlar='10', sube_basina_calisan=5, motorlar='greedy,optimal',
+                     stdout=cikti, stderr=io.StringIO())
+        rapor = json.loads(cikti.getvalue())
+        self.assertEqual({'donem', 'tohum', 'paralel', 'sonuclar'}, set(rapor))
+        self.assertEqual([(s['calisan'], s['sube'], s['motor']) for s in rapor['sonuclar']],
+                         [(10, 2, 'greedy'), (10, 2, 'optimal')])
+        for sonuc in rapor['sonuclar']:
+            self.assertLessEqual({'sure_sn', 'sorgu_sayisi', 'rss_artisi_mb', 'atama_sayisi', 'kapsama_orani', 'profil'},
+                                 set(sonuc))
+            self.assertNotIn('maks_rss_mb', sonuc)
+            self.assertGreater(sonuc['atama_sayisi'], 0)
+
+
+class ParalelPlanlamaTests(TestCase):
+    def test_kumeler_cakismasiz_ve_limit_icinde_planlanir(self):
+        sentetik_veri_olustur(60, 6, '2025-11', tohum=3)
+        komut, cikti = PlanlamaKomutu(), io.StringIO()
+        call_command(komut, '2025-11', dry_run=True, paralel=3, stdout=cikti)
+
+        self.assertIn('[KUME 3]', cikti.getvalue())
+        indeks, saatler = VardiyaIndeksi(), {}
+        for vardiya in komut.planlanan_vardiyalar:
+            bas, bit = vardiya.baslangic_zamani, vardiya.bitis_zamani
+            self.assertFalse(indeks.cakisiyor_mu(vardiya.calisan_id, bas, bit))
+            indeks.ekle(vardiya.calisan_id, bas, bit)
+            saatler[vardiya.calisan_id] = saatler.get(vardiya.calisan_id, 0) + (bit - bas).total_seconds() / 3600
+        self.assertTrue(komut.planlanan_vardiyalar)
+        self.assertLess(max(saatler.values()), AYLIK_SAAT_LIMITI + VARDIYA_MAX_SAAT + VARDIYA_MIN_SAAT)
+
+
+class ArtimliPlanlamaTests(TestCase):
+    def test_pencere_disi_ve_yayinlanmis_vardiyalar_sabit_kalir(self):
+        sentetik_veri_olustur(30, 3, '2025-11', tohum=11)
+        call_command('create_schedule', '2025-11', verbosity=0, stdout=io.StringIO())
+        self.assertFalse(Vardiya.objects.exclude(durum=VardiyaDurum.TASLAK).exists())
+        # Ilk hafta yayinlanir; pencere yayinlanmamis taslaklarin uzerindedir
+        plani_yayinla(2025, 11, (date(2025, 11, 1), date(2025, 11, 7), None))
+        sube = Sube.objects.order_by('id').first()
+        pencere = Vardiya.objects.filter(sube=sube, baslangic_zamani__date__range=(date(2025, 11, 10), date(2025, 11, 12)))
+        eski_taslaklar = set(pencere.values_list('id', flat=True))
+        self.assertTrue(eski_taslaklar)
+        sabitler = set(Vardiya.objects.exclude(id__in=eski_taslaklar).values_list('id', 'calisan_id', 'baslangic_zamani'))
+
+        komut = PlanlamaKomutu()
+        call_command(komut, '2025-11', pencere_baslangic=date(2025, 11, 10), pencere_bitis=date(2025, 11, 12),
+                     sube=[sube.id], verbosity=0, stdout=io.StringIO())
+
+        self.assertLessEqual(sabitler, set(Vardiya.objects.values_list('id', 'calisan_id', 'baslangic_zamani')))
+        self.assertFalse(Vardiya.objects.filter(id__in=eski_taslaklar).exists())
+        self.assertTrue(komut.planlanan_vardiyalar)
+        for vardiya in komut.planlanan_vardiyalar:
+            self.assertEqual(vardiya.sube_id, sube.id)
+            self.assertTrue(date(2025, 11, 10) <= vardiya.baslangic_zamani.date() <= date(2025, 11, 12))
+        indeks = VardiyaIndeksi()
+        for calisan_id, bas, bit in Vardiya.objects.values_list('calisan_id', 'baslangic_zamani', 'bitis_zamani'):
+            self.assertFalse(indeks.cakisiyor_mu(calisan_id, bas, bit))
+            indeks.ekle(calisan_id, bas, bit)
+
+    def test_yayinlanan_plan_calisanlara_gorunur(self):
+        sentetik_veri_olustur(10, 1, '2025-11', tohum=2)
+        call_command('create_schedule', '2025-11', verbosity=0, stdout=io.StringIO())
+        taslak_sayisi = Vardiya.objects.filter(durum=VardiyaDurum.TASLAK).count()
+        calisan = CustomUser.objects.get(id=Vardiya.objects.values_list('calisan_id', flat=True).first())
+        calisan_istemcisi = APIClient()
+        calisan_istemcisi.force_authenticate(calisan)
+        aralik = {'from': '2025-11-01', 'to': '2025-11-30', 'sayfa_boyutu': 2000}
+        self.assertEqual(calisan_istemcisi.get(reverse('vardiya-list'), aralik).data['results'], [])
+
+        admin = CustomUser.objects.create_user(username='admin', email='admin@test.com', password='x', is_staff=True, rol='admin')
+        admin_istemcisi = APIClient()
+        admin_istemcisi.force_authenticate(admin)
+        self.assertEqual(len(admin_istemcisi.get(reverse('vardiya-list'), aralik).data['results']), taslak_sayisi)
+        yanit = admin_istemcisi.post(reverse('plan-yayinla'), {'donem': '2025-11'}, format='json')
+        self.assertEqual(yanit.data['yayinlanan'], taslak_sayisi)
+        self.assertEqual(len(calisan_istemcisi.get(reverse('vardiya-list'), aralik).data['results']), taslak_sayisi)
+        self.assertEqual(GunlukVardiyaOzeti.objects.aggregate(toplam=Sum('planlanan'))['toplam'], taslak_sayisi)
+
+    def test_pencere_donem_disinda_olamaz(self):
+        with self.assertRaises(CommandError):
+            call_command('create_schedule', '2025-11', pencere_baslangic=date(2025, 10, 30), stdout=io.StringIO())
+
+
+class OptimalMotorTests(TestCase):
+    def test_kisitlama_saatinden_bolunur(self):
+        bas = datetime(2025, 11, 3, 8)
+        dilimler = blok_dilimleri(bas, bas + timedelta(hours=16), [time(20)], VARDIYA_MIN_SAAT, VARDIYA_MAX_SAAT)
+        self.assertEqual(
+            [(d1.hour, d2.hour) for d1, d2 in dilimler],
+            [(8, 14), (14, 20), (20, 0)],
+        )
+
+    def test_kurallar_ve_cakismalar_korunur(self):
+        sentetik_veri_olustur(30, 3, '2025-11', tohum=5)
+        sube = Sube.objects.order_by('id').first()
+        KisitlamaKurali.objects.create(sube=sube, sart='cinsiyet_kadin', baslangic_saati=time(18))
+        komut, cikti = PlanlamaKomutu(), io.StringIO()
+        call_command(komut, '2025-11', dry_run=True, engine='optimal', stdout=cikti)
+
+        kadinlar = set(CustomUser.objects.filter(cinsiyet='kadin').values_list('id', flat=True))
+        indeks = VardiyaIndeksi()
+        for vardiya in komut.planlanan_vardiyalar:
+            bas, bit = vardiya.baslangic_zamani, vardiya.bitis_zamani
+            self.assertFalse(indeks.cakisiyor_mu(vardiya.calisan_id, bas, bit))
+            indeks.ekle(vardiya.calisan_id, bas, bit)
+            if vardiya.sube_id == sube.id and vardiya.calisan_id in kadinlar:
+                self.assertLessEqual(bit, datetime.combine(bas.date(), time(18)))
+        self.assertIn('[MOTOR optimal]', cikti.getvalue())
+
+    def test_artimli_modda_kismen_dolu_saatler_tekrar_atanmaz(self):
+        sentetik_veri_olustur(30, 3, '2025-11', tohum=11)
+        call_command('create_schedule', '2025-11', verbosity=0, stdout=io.StringIO())
+        sube = Sube.objects.order_by('id').first()
+        pencere = (date(2025, 11, 10), date(2025, 11, 12))
+        # Pencerenin vardiyalarindan her ikincisi yayinlanir; bloklar kismen dolu kalir
+        taslaklar = Vardiya.objects.filter(sube=sube, baslangic_zamani__date__range=pencere).order_by('baslangic_zamani')
+        Vardiya.objects.filter(id__in=list(taslaklar.values_list('id', flat=True)[::2])).update(durum=VardiyaDurum.PLANLANDI)
+
+        komut = PlanlamaKomutu()
+        call_command(komut, '2025-11', engine='optimal', pencere_baslangic=pencere[0], pencere_bitis=pencere[1],
+                     sube=[sube.id], verbosity=0, stdout=io.StringIO())
+
+        self.assertTrue(komut.planlanan_vardiyalar)
+        son_bitis = None
+        for bas, bit in Vardiya.objects.filter(sube=sube, baslangic_zamani__date__range=pencere).order_by(
+            'baslangic_zamani'
+        ).values_list('baslangic_zamani', 'bitis_zamani'):
+            if son_bitis is not None:
+                self.assertGreaterEqual(bas, son_bitis)
+            son_bitis = bit if son_bitis is None else max(son_bitis, bit)
+
+
+class YerelAramaTests(TestCase):
+    def test_iyilestirme_sayaclari_tutarli_ve_hedefleri_kotulestirmez(self):
+        sentetik_veri_olustur(40, 6, '2025-11', tohum=7)
+        komut = PlanlamaKomutu()
+        call_command(komut, '2025-11', dry_run=True, iyilestirme=5, stdout=io.StringIO())
+
+        rapor = komut.iyilestirme_raporu
+        self.assertLessEqual(rapor['sonra']['kapsanmayan_saat'], rapor['once']['kapsanmayan_saat'])
+        self.assertLessEqual(rapor['sonra']['mesai_saat'], rapor['once']['mesai_saat'])
+        self.assertGreater(sum(rapor['hamleler'].values()), 0)
+
+        indeks, saatler = VardiyaIndeksi(), {}
+        for vardiya in komut.planlanan_vardiyalar:
+            bas, bit = vardiya.baslangic_zamani, vardiya.bitis_zamani
+            self.assertFalse(indeks.cakisiyor_mu(vardiya.calisan_id, bas, bit))
+            indeks.ekle(vardiya.calisan_id, bas, bit)
+            saatler[vardiya.calisan_id] = saatler.get(vardiya.calisan_id, 0) + (bit - bas).total_seconds() / 3600
+        for calisan_id, i in komut.calisan_sirasi.items():
+            self.assertAlmostEqual(komut.atanan_saatler[i], saatler.get(calisan_id, 0))
+
+
+class IstatistikTests(TestCase):
+    def setUp(self):
+        self.sube = Sube.objects.create(sube_adi='Merkez', adres='Adres')
+        self.calisanlar = [calisan_olustur(no, first_name=f'Ad{no}') for no in range(3)]
+        admin = CustomUser.objects.create_user(username='admin', email='admin@test.com', password='x', is_staff=True, rol='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def vardiya(self, calisan, gun, saat, durum=VardiyaDurum.TAMAMLANDI):
+        bas = timezone.make_aware(datetime(2025, 11, gun, 9))
+        return Vardiya.objects.create(
+            sube=self.sube, calisan=calisan, durum=durum, baslangic_zamani=bas, bitis_zamani=bas + timedelta(hours=8),
+            gercek_baslangic_zamani=bas, gercek_bitis_zamani=bas + timedelta(hours=saat),
+        )
+
+    def istatistikler(self):
+        return self.client.get(reverse('admin-istatistikler'), {'baslangic': '2025-11-01', 'bitis': '2025-11-30'}).data
+
+    def test_toplamlar_ve_calisan_saatleri(self):
+        self.vardiya(self.calisanlar[0], 3, 8)
+        self.vardiya(self.calisanlar[0], 4, 7.5)
+        self.vardiya(self.calisanlar[1], 3, 10)
+        self.vardiya(self.calisanlar[2], 5, 8, durum=VardiyaDurum.IPTAL)
+        self.vardiya(self.calisanlar[2], 6, 8, durum=VardiyaDurum.PLANLANDI)
+        ozetleri_yeniden_olustur()
+
+        veri = self.istatistikler()
+        self.assertEqual(veri['genel'], {
+            'toplam_vardiya': 5, 'tamamlanan_vardiya': 3, 'iptal_edilen': 1, 'tamamlanma_orani': 60.0,
+        })
+        self.assertEqual(
+            [(c['calisan__id'], c['toplam_vardiya'], c['toplam_saat']) for c in veri['calisan_performans']],
+            [(self.calisanlar[0].id, 2, 15.5), (self.calisanlar[1].id, 1, 10.0)],
+        )
+
+    def test_sorgu_sayisi_vardiya_sayisindan_bagimsiz(self):
+        for adet in (1, 20):
+            for gun in range(1, adet + 1):
+                self.vardiya(self.calisanlar[gun % 3], gun, 8)
+            ozetleri_yeniden_olustur()
+            with self.assertNumQueries(6):
+                self.istatistikler()
+
+    def ozetler(self):
+        return set(GunlukVardiyaOzeti.objects.values_list(
+            'sube_id', 'calisan_id', 'tarih', 'vardiya_sayisi', 'planlanan', 'tamamlanan', 'iptal',
+            'planlanan_saat', 'gercek_saat',
+        ))
+
+    def yeniden_olusturulanla_ayni(self):
+        artimli = self.ozetler()
+        ozetleri_yeniden_olustur()
+        self.assertEqual(artimli, self.ozetler())
+
+    def test_migration_gecmis_vardiyalardan_ozetleri_doldurur(self):
+        self.vardiya(self.calisanlar[0], 3, 8)
+        self.vardiya(self.calisanlar[1], 3, 10)
+        self.vardiya(self.calisanlar[2], 5, 8, durum=VardiyaDurum.IPTAL)
+        migration = import_module('apps.schedules.migrations.0012_gunluk_ozetleri_doldur')
+        migration.ozetleri_doldur(django_apps, None)
+        self.assertEqual(self.istatistikler()['genel']['toplam_vardiya'], 3)
+        self.yeniden_olusturulanla_ayni()
+
+    def test_ozetler_islemlerle_artimli_guncellenir(self):
+        bas = timezone.now() - timedelta(hours=1)
+        calisan, iptal_eden = self.calisanlar[:2]
+        biten = Vardiya.objects.create(sube=self.sube, calisan=calisan, durum=VardiyaDurum.PLANLANDI,
+                                       baslangic_zamani=bas, bitis_zamani=bas + timedelta(hours=8))
+        iptal_edilen = Vardiya.objects.create(sube=self.sube, calisan=iptal_eden, durum=VardiyaDurum.PLANLANDI,
+                                              baslangic_zamani=bas + timedelta(days=2),
+                                              bitis_zamani=bas + timedelta(days=2, hours=8))
+        ozetleri_yeniden_olustur()
+
+        calisan_istemcisi = APIClient()
+        calisan_istemcisi.force_authenticate(calisan)
+        for action in ('baslat', 'bitir'):
+            yanit = calisan_istemcisi.post(reverse('vardiya-kontrol', args=[biten.id]),
+                                           {'action': action, 'qr_token': f'sube_{self.sube.id}_qr'})
+            self.assertEqual(yanit.status_code, 200)
+        satir = GunlukVardiyaOzeti.objects.get(calisan=calisan)
+        self.assertEqual((satir.tamamlanan, satir.planlanan), (1, 1))
+        self.yeniden_olusturulanla_ayni()
+
+        iptal_istemcisi = APIClient()
+        iptal_istemcisi.force_authenticate(iptal_eden)
+        self.assertEqual(iptal_istemcisi.post(reverse('iptal-istek-olustur'), {'vardiya': iptal_edilen.id}).status_code, 201)
+        istek = VardiyaIptalIstegi.objects.get(vardiya=iptal_edilen)
+        yanit = self.client.post(reverse('admin-iptal-istek-aksiyon', args=[istek.id]), {'action': 'onayla'})
+        self.assertEqual(yanit.status_code, 200)
+        self.assertFalse(GunlukVardiyaOzeti.objects.filter(calisan=iptal_eden).exists())
+        self.assertEqual(GunlukVardiyaOzeti.objects.get(calisan__isnull=True).iptal, 1)
+        self.yeniden_olusturulanla_ayni()
+
+    def test_eszamanli_olusturulan_ozet_satiri_guncellenir(self):
+        vardiya = self.vardiya(None, 3, 8, durum=VardiyaDurum.PLANLANDI)
+        ozetleri_yeniden_olustur()
+        GunlukVardiyaOzeti.objects.update(planlanan=0, planlanan_saat=0)
+        # Baska bir islem satiri okumadan hemen sonra olusturmus gibi: ilk okuma bos doner
+        gercek_get, okumalar = QuerySet.get, []
+
+        def ilk_okuma_bos(qs, *args, **kwargs):
+            if qs.model is GunlukVardiyaOzeti and not okumalar:
+                okumalar.append(kwargs)
+                raise GunlukVardiyaOzeti.DoesNotExist
+            return gercek_get(qs, *args, **kwargs)
+
+        with mock.patch.object(QuerySet, 'get', ilk_okuma_bos):
+            ozetleri_guncelle([ozet_anahtari(vardiya)])
+        self.assertTrue(okumalar)
+        self.assertEqual(GunlukVardiyaOzeti.objects.count(), 1)
+        self.yeniden_olusturulanla_ayni()
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            GunlukVardiyaOzeti.objects.create(sube=self.sube, calisan=None, tarih=date(2025, 11, 3))
+
+    def test_plan_kaydi_ve_komut_ozetleri_doldurur(self):
+        sentetik_veri_olustur(20, 2, '2025-11', tohum=5)
+        call_command('create_schedule', '2025-11', verbosity=0, stdout=io.StringIO())
+        toplam = GunlukVardiyaOzeti.objects.aggregate(toplam=Sum('vardiya_sayisi'))['toplam']
+        self.assertEqual(toplam, Vardiya.objects.count())
+
+        yayinlanan = self.ozetler()
+        GunlukVardiyaOzeti.objects.all().delete()
+        call_command('rebuild_daily_stats', '--from', '2025-11-01', '--to', '2025-11-30', stdout=io.StringIO())
+        self.assertEqual(yayinlanan, self.ozetler())
+        with self.assertRaises(CommandError):
+            call_command('rebuild_daily_stats', '--from', '2025-11-30', '--to', '2025-11-01', stdout=io.StringIO())
+
+
+SICAK_TABLOLAR = (Vardiya._meta.db_table, VardiyaIstegi._meta.db_table, VardiyaIptalIstegi._meta.db_table)
+
+
+def tam_taramalar(islem):
+    """islem sirasindaki sorgulardan sicak tablolari indekssiz tarayanlar: [(sql, plan satiri)]"""
+    with CaptureQueriesContext(connection) as sorgular:
+        islem()
+    taramalar = []
+    with connection.cursor() as cursor:
+        for sorgu in sorgular.captured_queries:
+            if not sorgu['sql'].lstrip().upper().startswith(('SELECT', 'DELETE', 'UPDATE')):
+                continue
+            cursor.execute('EXPLAIN QUERY PLAN ' + sorgu['sql'])
+            for *_, ayrinti in cursor.fetchall():
+                tablo = ayrinti.split()[1] if ayrinti.startswith('SCAN ') else None
+                if tablo in SICAK_TABLOLAR:
+                    taramalar.append((sorgu['sql'], ayrinti))
+    return taramalar
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN ciktisi SQLite icin')
+class SorguPlaniTests(TestCase):
+    def setUp(self):
+        goruntuyu_gecersiz_kil()
+        sentetik_veri_olustur(20, 2, '2025-11', tohum=5)
+        call_command('create_schedule', '2025-11', publish=True, verbosity=0, stdout=io.StringIO())
+        self.vardiya = Vardiya.objects.filter(calisan__isnull=False).order_by('baslangic_zamani').first()
+        VardiyaIptalIstegi.objects.create(istek_yapan=self.vardiya.calisan, vardiya=self.vardiya)
+        self.admin = CustomUser.objects.create_user(username='admin', email='admin@test.com', password='x', is_staff=True, rol='admin')
+        self.client = APIClient()
+
+    def assertTaramaYok(self, islem):
+        self.assertEqual(tam_taramalar(islem), [])
+
+    def test_motor_sorgulari(self):
+        self.assertTaramaYok(lambda: call_command('create_schedule', '2025-11', verbosity=0, stdout=io.StringIO()))
+        self.assertTaramaYok(lambda: call_command(
+            'create_schedule', '2025-11', pencere_baslangic=date(2025, 11, 3), pencere_bitis=date(2025, 11, 4),
+            verbosity=0, stdout=io.StringIO(),
+        ))
+        self.assertTaramaYok(lambda: veritabaninda_cakisiyor_mu(self.vardiya.calisan_id, self.vardiya))
+
+    def test_liste_sorgulari(self):
+        self.client.force_authenticate(self.vardiya.calisan)
+        parametreler = {'from': '2025-11-01', 'to': '2025-11-30', 'sayfa_boyutu': 20}
+        self.assertTaramaYok(lambda: self.client.get(reverse('vardiya-list'), parametreler))
+        self.assertTaramaYok(lambda: self.client.get(reverse('vardiya-list'), {**parametreler, 'sube': self.vardiya.sube_id}))
+        sonraki = self.client.get(reverse('vardiya-list'), parametreler).data['next']
+        self.assertTaramaYok(lambda: self.client.get(sonraki))
+        self.assertTaramaYok(lambda: self.client.get(reverse('benim-vardiyalarim')))
+
+    def test_admin_sorgulari(self):
+        self.client.force_authenticate(self.admin)
+        for url in (reverse('uygun-calisan-list', args=[self.vardiya.id]), reverse('admin-takas-istek-list'),
+                    reverse('admin-iptal-istek-list'), reverse('admin-onay-gecmisi')):
+            self.assertTaramaYok(lambda: self.client.get(url))
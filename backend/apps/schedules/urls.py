@@ -7,6 +7,8 @@ from .views import (
     VardiyaListAPIView,
     BenimVardiyalarimListView,
     PlanOlusturView,
+    PlanYayinlaView,
+    PlanIsiDurumView,
     VardiyaIstekView,
     VardiyaIstegiYanitlaView,
     AdminIstekListView,
@@ -15,6 +17,7 @@ from .views import (
     AdminIptalIstekListView,
     AdminIptalIstekAksiyonView,
     UygunCalisanListView,
+    TopluUygunCalisanView,
     VardiyaIstegiGeriCekView,
     VardiyaIptalIstegiGeriCekView,
     KendiIptalIsteklerimListView,
@@ -40,7 +43,10 @@ urlpatterns = [
     path('vardiyalar/', VardiyaListAPIView.as_view(), name='vardiya-list'),
     path('vardiyalarim/', BenimVardiyalarimListView.as_view(), name='benim-vardiyalarim'),
     path('plan-olustur/', PlanOlusturView.as_view(), name='plan-olustur'),
+    path('plan-yayinla/', PlanYayinlaView.as_view(), name='plan-yayinla'),
+    path('plan-isleri/<int:pk>/', PlanIsiDurumView.as_view(), name='plan-isi-durum'),
     path('vardiyalar/<int:vardiya_id>/uygun-calisanlar/', UygunCalisanListView.as_view(), name='uygun-calisan-list'),
+    path('vardiyalar/uygun-calisanlar/', TopluUygunCalisanView.as_view(), name='toplu-uygun-calisan'),
 
     # Vardiya Takas İstekleri
     path('istekler/', VardiyaIstekView.as_view(), name='takas-istek-list-create'),
@@ -1,11 +1,11 @@
 from django.db.models import Q
 from django.db import transaction
-from django.core.management import call_command
 from django.http import JsonResponse
-from datetime import datetime
+from datetime import date, datetime
 from django.utils import timezone
 from django.db.models import Count, Avg, Sum, Q, F
-from django.db.models.functions import TruncMonth
+from django.db.models.functions import Coalesce, TruncMonth
+import math
 import secrets
 from datetime import timedelta
 from rest_framework.parsers import MultiPartParser
@@ -14,12 +14,24 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics, permissions, viewsets
 from apps.users.models import CustomUser
-from .models import Musaitlik, Vardiya, VardiyaIstegi, VardiyaIptalIstegi, CalisanTercihi, KisitlamaKurali
+from .models import (
+    Musaitlik, Vardiya, VardiyaIstegi, VardiyaIptalIstegi, CalisanTercihi, KisitlamaKurali, PlanIsi, GunlukVardiyaOzeti,
+)
 from .serializers import (
     MusaitlikSerializer, VardiyaSerializer, VardiyaIstegiCreateSerializer, 
     VardiyaIstegiListSerializer, VardiyaIptalIstegiCreateSerializer, VardiyaIptalIstegiListSerializer,
     CalisanTercihiSerializer,
-    KisitlamaKuraliSerializer
+    KisitlamaKuraliSerializer,
+    PlanIsiSerializer,
+    vardiya_listesi,
+)
+from .istatistik import ozet_anahtari, ozetleri_guncelle
+from .pagination import VardiyaSayfalama
+from .planlama.cakisma import VardiyaIndeksi
+from .planlama.isler import plan_isi_baslat
+from .planlama.yayin import plani_yayinla
+from .planlama.yedek import (
+    veritabaninda_cakisiyor_mu, veritabaninda_limiti_asiyor_mu, yedegi_isle, yedek_adaylari,
 )
 from .choices import IstekTipi, IstekDurum, VardiyaDurum, Gunler, MusaitlikDurum
 from django.core.cache import cache
@@ -67,7 +79,9 @@ class VardiyaBaslatBitirView(APIView):
             
             vardiya.gercek_bitis_zamani = now
             vardiya.durum = VardiyaDurum.TAMAMLANDI
-            vardiya.save()
+            with transaction.atomic():
+                vardiya.save()
+                ozetleri_guncelle([ozet_anahtari(vardiya)])
             
             # Çalışılan süreyi hesapla
             calisilan_sure = (vardiya.gercek_bitis_zamani - vardiya.gercek_baslangic_zamani).total_seconds() / 3600
@@ -231,13 +245,54 @@ class MusaitlikView(APIView):
         
         return Response({'message': 'Müsaitlik durumu başarıyla güncellendi.'}, status=status.HTTP_201_CREATED)
 class VardiyaListAPIView(generics.ListAPIView):
-    """TÜM vardiyaları listeler - TASLAK HARİÇ"""
+    """
+    Vardiyalar (taslaklar sadece yöneticilere); from/to (YYYY-AA-GG, verilmezse bu ay), sube
+    (tekrarlanabilir) ve calisan ile suzulur. Baslangic zamanina gore imlecli
+    sayfalanir: {'next': ..., 'results': [...]}.
+    """
     serializer_class = VardiyaSerializer
     permission_classes = [permissions.IsAuthenticated]
-    
+    pagination_class = VardiyaSayfalama
+
+    def list(self, request, *args, **kwargs):
+        try:
+            self.filtreler = self.parse_filters(request.query_params)
+        except (ValueError, OverflowError):
+            # OverflowError: takvimin sinirindaki tarihler (or. to=9999-12-31 + 1 gun)
+            return Response(
+                {'hata': 'from/to YYYY-AA-GG, sube ve calisan sayı olmalı; from, to\'dan sonra olamaz.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return super().list(request, *args, **kwargs)
+
+    @staticmethod
+    def parse_filters(params):
+        bugun = timezone.localdate()
+        baslangic = date.fromisoformat(params['from']) if params.get('from') else bugun.replace(day=1)
+        if params.get('to'):
+            bitis = date.fromisoformat(params['to'])
+        else:
+            sonraki_ay = (baslangic.replace(day=1) + timedelta(days=32)).replace(day=1)
+            bitis = sonraki_ay - timedelta(days=1)
+        if bitis < baslangic:
+            raise ValueError('from > to')
+        filtreler = {
+            # Gunler yerel saatle; bitis gunu dahil
+            'baslangic_zamani__gte': timezone.make_aware(datetime.combine(baslangic, datetime.min.time())),
+            'baslangic_zamani__lt': timezone.make_aware(datetime.combine(bitis + timedelta(days=1), datetime.min.time())),
+        }
+        if params.getlist('sube'):
+            filtreler['sube_id__in'] = [int(sube_id) for sube_id in params.getlist('sube')]
+        if params.get('calisan'):
+            filtreler['calisan_id'] = int(params['calisan'])
+        return filtreler
+
     def get_queryset(self):
-        # TASLAK olmayan TÜM vardiyaları döndür
-        return Vardiya.objects.exclude(durum='taslak').order_by('baslangic_zamani')
+        # Siralama sayfalamada (baslangic_zamani, id)
+        vardiyalar = Vardiya.objects.filter(**self.filtreler)
+        if not self.request.user.is_staff:
+            vardiyalar = vardiyalar.exclude(durum='taslak')
+        return vardiya_listesi(vardiyalar)
 
 class BenimVardiyalarimListView(generics.ListAPIView):
     """Sadece kullanıcının kendi vardiyaları"""
@@ -245,11 +300,11 @@ class BenimVardiyalarimListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Vardiya.objects.filter(
+        return vardiya_listesi(Vardiya.objects.filter(
             calisan=self.request.user,
             durum__in=['planlandi', 'baslatildi', 'iptal_istegi'],  # taslak HARİÇ
             baslangic_zamani__gte=datetime.now()
-        ).order_by('baslangic_zamani')
+        ).order_by('baslangic_zamani'))
 
 class VardiyaIstekView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -313,6 +368,7 @@ class AdminIstekActionView(APIView):
             vardiya2 = istek.hedef_vardiya
             calisan1 = vardiya1.calisan
             calisan2 = vardiya2.calisan
+            anahtarlar = [ozet_anahtari(vardiya1), ozet_anahtari(vardiya2)]
             
             with transaction.atomic():
                 vardiya1.calisan, vardiya2.calisan = calisan2, calisan1
@@ -320,6 +376,7 @@ class AdminIstekActionView(APIView):
                 vardiya2.save()
                 istek.durum = IstekDurum.ONAYLANDI
                 istek.save()
+                ozetleri_guncelle(anahtarlar + [ozet_anahtari(vardiya1), ozet_anahtari(vardiya2)])
             
             return Response({'mesaj': 'Takas başarıyla onaylandı ve vardiyalar değiştirildi.'})
         
@@ -332,17 +389,49 @@ class AdminIstekActionView(APIView):
             return Response({'hata': 'Geçersiz eylem. "onayla" veya "reddet" gönderilmeli.'}, status=status.HTTP_400_BAD_REQUEST)
 
 class PlanOlusturView(APIView):
+    """
+    Plan oluşturma işini arka plana alır; ilerleme PlanIsiDurumView'dan izlenir.
+    'deneme': true gönderilirse veritabanına yazılmaz, önerilen plan ve mevcut
+    planla farkı işin 'sonuc' alanına konur.
+    """
     permission_classes = [permissions.IsAdminUser]
     def post(self, request, *args, **kwargs):
         donem = request.data.get('donem')
-        if not donem or len(donem.split('-')) != 2:
+        try:
+            datetime.strptime(donem or '', '%Y-%m')
+        except ValueError:
             return Response({'hata': 'Lütfen geçerli bir dönem belirtin (YYYY-AA).'}, status=status.HTTP_400_BAD_REQUEST)
 
+        deneme = str(request.data.get('deneme', '')).lower() in ('1', 'true')
+        plan_isi, yeni_mi = plan_isi_baslat(donem, olusturan=request.user, deneme=deneme)
+        tur = 'deneme planı' if deneme else 'plan'
+        if yeni_mi:
+            mesaj = f'{donem} dönemi için {tur} oluşturma başlatıldı.'
+        else:
+            mesaj = f'{donem} dönemi için zaten devam eden bir {tur} işi var.'
+        return Response(
+            {'mesaj': mesaj, 'is_id': plan_isi.id, 'durum': plan_isi.durum, 'deneme': deneme},
+            status=status.HTTP_202_ACCEPTED if yeni_mi else status.HTTP_200_OK
+        )
+
+class PlanYayinlaView(APIView):
+    """Dönemin taslak vardiyalarını yayınlar; çalışanlar vardiyalarını bundan sonra görür."""
+    permission_classes = [permissions.IsAdminUser]
+    def post(self, request, *args, **kwargs):
+        donem = request.data.get('donem')
         try:
-            call_command('create_schedule', donem)
-            return Response({'mesaj': f'{donem} dönemi için plan başarıyla oluşturuldu.'})
-        except Exception as e:
-            return Response({'hata': f'Plan oluşturulurken bir hata oluştu: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            tarih = datetime.strptime(donem or '', '%Y-%m')
+        except ValueError:
+            return Response({'hata': 'Lütfen geçerli bir dönem belirtin (YYYY-AA).'}, status=status.HTTP_400_BAD_REQUEST)
+
+        yayinlanan = plani_yayinla(tarih.year, tarih.month)
+        return Response({'mesaj': f'{donem} dönemi için {yayinlanan} vardiya yayınlandı.', 'yayinlanan': yayinlanan})
+
+class PlanIsiDurumView(generics.RetrieveAPIView):
+    """Plan işinin aşama, ilerleme ve sayaçları"""
+    queryset = PlanIsi.objects.all()
+    serializer_class = PlanIsiSerializer
+    permission_classes = [permissions.IsAdminUser]
 
 class VardiyaIptalIstegiOlusturView(generics.CreateAPIView):
     queryset = VardiyaIptalIstegi.objects.all()
@@ -371,14 +460,15 @@ class VardiyaIptalIstegiOlusturView(generics.CreateAPIView):
         orijinal_durum = vardiya.durum
         vardiya.durum = VardiyaDurum.IPTAL_ISTEGI
         
-        istek = VardiyaIptalIstegi.objects.create(
-            vardiya=vardiya,
-            istek_yapan=request.user,
-            orijinal_vardiya_durumu=orijinal_durum,
-            durum=IstekDurum.ADMIN_ONAYI_BEKLIYOR
-        )
-        
-        vardiya.save()
+        with transaction.atomic():
+            istek = VardiyaIptalIstegi.objects.create(
+                vardiya=vardiya,
+                istek_yapan=request.user,
+                orijinal_vardiya_durumu=orijinal_durum,
+                durum=IstekDurum.ADMIN_ONAYI_BEKLIYOR
+            )
+            vardiya.save()
+            ozetleri_guncelle([ozet_anahtari(vardiya)])
         
         serializer = self.get_serializer(istek)
         headers = self.get_success_headers(serializer.data)
@@ -390,6 +480,27 @@ class AdminIptalIstekListView(generics.ListAPIView):
     def get_queryset(self):
         return VardiyaIptalIstegi.objects.filter(durum=IstekDurum.ADMIN_ONAYI_BEKLIYOR).order_by('olusturulma_tarihi')
 
+def aday_verisi(siralama):
+    """Motorun rank_candidates ciktisindaki bir adayi API cevabina cevirir"""
+    aday = siralama['aday']
+    return {
+        'id': aday.id,
+        'ad_soyad': aday.get_full_name() or aday.username,
+        'username': aday.username,
+        'puan': round(siralama['puan'], 1),
+        'favori': siralama['is_favorite'],
+    }
+
+def dinlenme_suresi(deger):
+    """dinlenme_saati parametresi; sonlu ve negatif olmayan bir saat degilse ValueError"""
+    saat = float(deger)
+    if not math.isfinite(saat) or saat < 0:
+        raise ValueError('dinlenme_saati')
+    try:
+        return timedelta(hours=saat)
+    except OverflowError:
+        raise ValueError('dinlenme_saati')
+
 class AdminIptalIstekAksiyonView(APIView):
     permission_classes = [permissions.IsAdminUser]
     def post(self, request, pk, *args, **kwargs):
@@ -400,6 +511,8 @@ class AdminIptalIstekAksiyonView(APIView):
 
         action = request.data.get('action')
         vardiya = istek.vardiya
+        # Onay calisani degistirebilir; ozetlerde eski satir da yeniden hesaplanir
+        onceki_anahtar = ozet_anahtari(vardiya)
 
         if action == 'reddet':
             with transaction.atomic():
@@ -407,10 +520,16 @@ class AdminIptalIstekAksiyonView(APIView):
                 istek.save()
                 vardiya.durum = istek.orijinal_vardiya_durumu
                 vardiya.save()
+                ozetleri_guncelle([onceki_anahtar])
             return Response({'mesaj': 'İptal isteği reddedildi.'})
 
         elif action == 'onayla':
             yeni_calisan_id = request.data.get('yeni_calisan_id')
+            # otomatik_doldur: 'liste' -> sirali aday listesi (hicbir sey degismez), 'ata' -> en iyi adayi ata
+            otomatik_doldur = request.data.get('otomatik_doldur')
+
+            if not yeni_calisan_id and otomatik_doldur:
+                return self.otomatik_doldur(request, istek, vardiya, otomatik_doldur)
 
             if not yeni_calisan_id:
                 with transaction.atomic():
@@ -419,6 +538,7 @@ class AdminIptalIstekAksiyonView(APIView):
                     vardiya.durum = VardiyaDurum.IPTAL
                     vardiya.calisan = None
                     vardiya.save()
+                    ozetleri_guncelle([onceki_anahtar, ozet_anahtari(vardiya)])
                 return Response({'mesaj': 'Vardiya başarıyla iptal edildi.'})
 
             else:
@@ -433,12 +553,54 @@ class AdminIptalIstekAksiyonView(APIView):
                     vardiya.save()
                     istek.durum = IstekDurum.ONAYLANDI
                     istek.save()
+                    ozetleri_guncelle([onceki_anahtar, ozet_anahtari(vardiya)])
                 
                 return Response({'mesaj': f'Vardiya başarıyla {yeni_calisan.get_full_name()} adlı çalışana atandı.'})
 
         else:
             return Response({'hata': 'Geçersiz eylem. "onayla" veya "reddet" gönderilmeli.'}, status=status.HTTP_400_BAD_REQUEST)
 
+    def otomatik_doldur(self, request, istek, vardiya, mod):
+        """Motorun uygunluk, cakisma ve siralama kurallariyla iptal edilen vardiyaya yedek bul"""
+        if mod not in ('liste', 'ata'):
+            return Response({'hata': 'otomatik_doldur "liste" veya "ata" olmalıdır.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            aday_sayisi = int(request.data.get('aday_sayisi', 5))
+        except (TypeError, ValueError):
+            aday_sayisi = 0
+        if aday_sayisi < 1:
+            return Response({'hata': 'aday_sayisi en az 1 olan bir sayı olmalıdır.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        adaylar = yedek_adaylari(vardiya, haric={istek.istek_yapan_id, vardiya.calisan_id})
+        if mod == 'liste':
+            return Response({'adaylar': [aday_verisi(a) for a in adaylar[:aday_sayisi]]})
+
+        # Goruntu surec ici onbellektir; cakisma ve aylik limit veritabanindan yeniden dogrulanir
+        secilen = next((
+            a['aday'] for a in adaylar
+            if not veritabaninda_cakisiyor_mu(a['aday'].id, vardiya)
+            and not veritabaninda_limiti_asiyor_mu(a['aday'].id, vardiya)
+        ), None)
+        onceki_anahtar = ozet_anahtari(vardiya)
+        with transaction.atomic():
+            istek.durum = IstekDurum.ONAYLANDI
+            istek.save()
+            if secilen is None:
+                vardiya.durum = VardiyaDurum.IPTAL
+                vardiya.calisan = None
+            else:
+                vardiya.calisan = secilen
+                vardiya.durum = istek.orijinal_vardiya_durumu
+            vardiya.save()
+            ozetleri_guncelle([onceki_anahtar, ozet_anahtari(vardiya)])
+        if secilen is None:
+            return Response({'mesaj': 'Uygun yedek bulunamadı, vardiya iptal edildi.', 'atanan_calisan_id': None})
+        yedegi_isle(vardiya)
+        return Response({
+            'mesaj': f'Vardiya otomatik olarak {secilen.get_full_name() or secilen.username} adlı çalışana atandı.',
+            'atanan_calisan_id': secilen.id,
+        })
+
 class UygunCalisanListView(APIView):
     permission_classes = [permissions.IsAdminUser]
     def get(self, request, vardiya_id, *args, **kwargs):
@@ -450,7 +612,13 @@ class UygunCalisanListView(APIView):
         bitis = vardiya.bitis_zamani
         gun_numarasi = baslangic.isoweekday()
         donem = baslangic.strftime('%Y-%m')
-        cakisan_vardiyasi_olanlar = Vardiya.objects.filter(baslangic_zamani__lt=bitis, bitis_zamani__gt=baslangic, durum__in=[VardiyaDurum.PLANLANDI, VardiyaDurum.TASLAK]).values_list('calisan_id', flat=True)
+        # ?dinlenme_saati=11 -> vardiyadan once/sonra 11 saat icinde baska vardiyasi olanlar da dislanir
+        try:
+            dinlenme = dinlenme_suresi(request.query_params.get('dinlenme_saati', 0))
+        except ValueError:
+            return Response({'hata': 'dinlenme_saati sıfır ya da pozitif bir sayı olmalıdır.'}, status=status.HTTP_400_BAD_REQUEST)
+        vardiya_indeksi = VardiyaIndeksi.yukle(baslangic, bitis, dinlenme)
+        cakisan_vardiyasi_olanlar = vardiya_indeksi.cakisan_calisanlar(baslangic, bitis, dinlenme)
         musait_olmayanlar = Musaitlik.objects.filter(donem=donem, gun=gun_numarasi, musaitlik_durumu=MusaitlikDurum.MUSAIT_DEGIL).values_list('calisan_id', flat=True)
         orijinal_calisan_id = [vardiya.calisan.id] if vardiya.calisan else []
         dislanacak_calisan_idler = set(list(cakisan_vardiyasi_olanlar) + list(musait_olmayanlar) + orijinal_calisan_id)
@@ -458,6 +626,51 @@ class UygunCalisanListView(APIView):
         data = [{'id': user.id, 'ad_soyad': user.get_full_name(), 'username': user.username} for user in uygun_calisanlar]
         return Response(data)
 
+class TopluUygunCalisanView(APIView):
+    """
+    Birden cok vardiya (or. bir subenin bir gunu) icin uygun calisanlari tek
+    istekte, motorun kurallariyla dondurur: musaitlik (kismi saatler dahil),
+    kisitlama kurallari, aylik saat limiti ve cakisma/dinlenme. Tum vardiyalar
+    donemin paylasilan bellek ici goruntusu uzerinden degerlendirilir.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    MAKS_VARDIYA = 500
+
+    def post(self, request, *args, **kwargs):
+        vardiya_idler = request.data.get('vardiya_idler')
+        if not isinstance(vardiya_idler, list) or not vardiya_idler or \
+                not all(isinstance(v, int) and not isinstance(v, bool) for v in vardiya_idler):
+            return Response({'hata': 'vardiya_idler boş olmayan bir tam sayı listesi olmalıdır.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(vardiya_idler) > self.MAKS_VARDIYA:
+            return Response({'hata': f'En fazla {self.MAKS_VARDIYA} vardiya gönderilebilir.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            dinlenme = dinlenme_suresi(request.data.get('dinlenme_saati', 0))
+            aday_sayisi = request.data.get('aday_sayisi')
+            aday_sayisi = int(aday_sayisi) if aday_sayisi is not None else None
+            if aday_sayisi is not None and aday_sayisi < 1:
+                raise ValueError('aday_sayisi')
+        except (TypeError, ValueError):
+            return Response(
+                {'hata': 'dinlenme_saati sıfır ya da pozitif, aday_sayisi en az 1 olan bir sayı olmalıdır.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        vardiyalar = Vardiya.objects.select_related('sube').filter(id__in=vardiya_idler).order_by('baslangic_zamani', 'id')
+        sonuclar = [
+            {
+                'vardiya_id': vardiya.id,
+                'adaylar': [
+                    aday_verisi(a) for a in yedek_adaylari(vardiya, haric={vardiya.calisan_id}, dinlenme=dinlenme)[:aday_sayisi]
+                ],
+            }
+            for vardiya in vardiyalar
+        ]
+        bulunan = {sonuc['vardiya_id'] for sonuc in sonuclar}
+        return Response({
+            'sonuclar': sonuclar,
+            'bulunamayanlar': [vardiya_id for vardiya_id in vardiya_idler if vardiya_id not in bulunan],
+        })
+
 class VardiyaIstegiGeriCekView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     def post(self, request, pk, *args, **kwargs):
@@ -486,6 +699,7 @@ class VardiyaIptalIstegiGeriCekView(APIView):
             vardiya.durum = istek.orijinal_vardiya_durumu
             vardiya.save()
             istek.delete()
+            ozetleri_guncelle([ozet_anahtari(vardiya)])
         
         return Response({'mesaj': 'Vardiya iptal isteği başarıyla geri çekildi.'}, status=status.HTTP_200_OK)
 
@@ -509,73 +723,48 @@ class AdminIstatistiklerView(APIView):
             bitis = request.query_params.get('bitis', 
                 timezone.now().strftime('%Y-%m-%d'))
             
-            # 1. Genel İstatistikler
-            toplam_vardiya = Vardiya.objects.filter(
-                baslangic_zamani__range=[baslangic, bitis]
-            ).count()
-            
-            tamamlanan_vardiya = Vardiya.objects.filter(
-                baslangic_zamani__range=[baslangic, bitis],
-                durum=VardiyaDurum.TAMAMLANDI
-            ).count()
-            
-            iptal_edilen = Vardiya.objects.filter(
-                baslangic_zamani__range=[baslangic, bitis],
-                durum=VardiyaDurum.IPTAL
-            ).count()
-            
-            # 2. Çalışan Performansı
-            calisan_performans_list = []
-            tamamlanan_vardiyalar = Vardiya.objects.filter(
-                baslangic_zamani__range=[baslangic, bitis],
-                durum=VardiyaDurum.TAMAMLANDI,
-                gercek_baslangic_zamani__isnull=False,
-                gercek_bitis_zamani__isnull=False,
-                calisan__isnull=False
-            ).select_related('calisan')
-            
-            # Çalışan bazlı gruplama
-            from collections import defaultdict
-            calisan_data = defaultdict(lambda: {'toplam_vardiya': 0, 'toplam_saat': 0})
-            
-            for vardiya in tamamlanan_vardiyalar:
-                if vardiya.calisan:
-                    key = vardiya.calisan.id
-                    calisan_data[key]['calisan__id'] = vardiya.calisan.id
-                    calisan_data[key]['calisan__first_name'] = vardiya.calisan.first_name
-                    calisan_data[key]['calisan__last_name'] = vardiya.calisan.last_name
-                    calisan_data[key]['toplam_vardiya'] += 1
-                    
-                    # Süre hesaplama
-                    sure = (vardiya.gercek_bitis_zamani - vardiya.gercek_baslangic_zamani).total_seconds() / 3600
-                    calisan_data[key]['toplam_saat'] += sure
+            # Ham vardiyalar yerine günlük özetler (bitiş günü dahil)
+            kapsam = GunlukVardiyaOzeti.objects.filter(
+                tarih__range=[date.fromisoformat(baslangic), date.fromisoformat(bitis)]
+            )
+
+            # 1. Genel İstatistikler (tek sorguda)
+            genel = kapsam.aggregate(
+                toplam_vardiya=Coalesce(Sum('vardiya_sayisi'), 0),
+                tamamlanan_vardiya=Coalesce(Sum('tamamlanan'), 0),
+                iptal_edilen=Coalesce(Sum('iptal'), 0),
+            )
+            toplam_vardiya = genel['toplam_vardiya']
+            tamamlanan_vardiya = genel['tamamlanan_vardiya']
+            iptal_edilen = genel['iptal_edilen']
             
-            calisan_performans = sorted(
-                calisan_data.values(), 
-                key=lambda x: x['toplam_saat'], 
-                reverse=True
-            )[:10]
+            # 2. Çalışan Performansı (toplam, sıralama ve ilk 10 veritabanında)
+            calisan_performans = list(kapsam.filter(
+                calisan__isnull=False,
+                tamamlanan__gt=0
+            ).values(
+                'calisan__id', 'calisan__first_name', 'calisan__last_name'
+            ).annotate(
+                toplam_vardiya=Sum('tamamlanan'),
+                toplam_saat=Sum('gercek_saat')
+            ).order_by('-toplam_saat', 'calisan__id')[:10])
             
             # 3. Şube Bazlı İstatistikler
-            sube_istatistik = Vardiya.objects.filter(
-                baslangic_zamani__range=[baslangic, bitis]
-            ).values(
+            sube_istatistik = kapsam.values(
                 'sube__sube_adi',
                 'sube__id'
             ).annotate(
-                toplam_vardiya=Count('id'),
-                tamamlanan=Count('id', filter=Q(durum=VardiyaDurum.TAMAMLANDI)),
-                iptal=Count('id', filter=Q(durum=VardiyaDurum.IPTAL))
-            )
+                toplam_vardiya=Sum('vardiya_sayisi'),
+                tamamlanan=Sum('tamamlanan'),
+                iptal=Sum('iptal')
+            ).order_by('sube__id')
             
             # 4. Aylık Trend
-            aylik_trend = Vardiya.objects.filter(
-                baslangic_zamani__range=[baslangic, bitis]
-            ).annotate(
-                ay=TruncMonth('baslangic_zamani')
+            aylik_trend = kapsam.annotate(
+                ay=TruncMonth('tarih')
             ).values('ay').annotate(
-                toplam=Count('id'),
-                tamamlanan=Count('id', filter=Q(durum=VardiyaDurum.TAMAMLANDI))
+                toplam=Sum('vardiya_sayisi'),
+                tamamlanan=Sum('tamamlanan')
             ).order_by('ay')
             
             # 5. Takas/İptal İstatistikleri
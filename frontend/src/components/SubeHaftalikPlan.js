@@ -14,11 +14,11 @@ const getAuthHeaders = () => {
     return { headers: { 'Authorization': `Bearer ${token}` } };
 };
 
-function SubeHaftalikPlan({ events, loading: eventsLoading, currentUser }) {
+function SubeHaftalikPlan({ events, loading: eventsLoading, currentUser, date, onWeekChange }) {
     const theme = useTheme();
     const [subeler, setSubeler] = useState([]);
     const [planData, setPlanData] = useState({});
-    const [currentWeek, setCurrentWeek] = useState(moment().startOf('isoWeek'));
+    const [currentWeek, setCurrentWeek] = useState(moment(date).startOf('isoWeek'));
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
@@ -70,8 +70,13 @@ function SubeHaftalikPlan({ events, loading: eventsLoading, currentUser }) {
 
     }, [events, eventsLoading, subeler, currentWeek]);
 
-    const handlePrevWeek = () => setCurrentWeek(currentWeek.clone().subtract(1, 'week'));
-    const handleNextWeek = () => setCurrentWeek(currentWeek.clone().add(1, 'week'));
+    // Üst bileşen vardiyaları haftalık pencere olarak çeker; hafta değişince haber ver
+    const changeWeek = (week) => {
+        setCurrentWeek(week);
+        if (onWeekChange) onWeekChange(week.toDate());
+    };
+    const handlePrevWeek = () => changeWeek(currentWeek.clone().subtract(1, 'week'));
+    const handleNextWeek = () => changeWeek(currentWeek.clone().add(1, 'week'));
 
     const weekDays = Array(7).fill(null).map((_, i) => currentWeek.clone().add(i, 'days'));
     const today = moment().format('YYYY-MM-DD');
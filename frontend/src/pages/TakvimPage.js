@@ -7,6 +7,7 @@ import 'moment/locale/tr';
 import axios from 'axios';
 import 'react-big-calendar/lib/css/react-big-calendar.css';
 import SubeHaftalikPlan from '../components/SubeHaftalikPlan';
+import { fetchVardiyaPenceresi, gorunenAralik } from '../utils/vardiyalar';
 
 import {
     Container, Typography, Button, Box, CircularProgress, Alert, Paper, useTheme,
@@ -158,6 +159,7 @@ function TakvimPage() {
     const [view, setView] = useState(Views.MONTH);
     const [loading, setLoading] = useState(true);
     const [generating, setGenerating] = useState(false);
+    const [planIlerleme, setPlanIlerleme] = useState(null);
     const [error, setError] = useState('');
     const [successMessage, setSuccessMessage] = useState('');
     const [currentUser, setCurrentUser] = useState(null);
@@ -184,12 +186,11 @@ function TakvimPage() {
         setLoading(true); 
         setError('');
     
-        // ← KRİTİK: Endpoint doğru mu kontrol et
-        axios.get('http://127.0.0.1:8000/api/schedules/vardiyalar/', getAuthHeaders())
-            .then(response => {
-                console.log("API'den gelen vardiyalar:", response.data); // ← DEBUG için ekle
-                
-                const formattedEvents = response.data.map(vardiya => ({
+        // Sadece takvimde görünen pencere çekilir
+        const [baslangic, bitis] = gorunenAralik(date, activeView === 'calendar' ? view : 'week');
+        fetchVardiyaPenceresi(baslangic, bitis, {}, getAuthHeaders())
+            .then(vardiyalar => {
+                const formattedEvents = vardiyalar.map(vardiya => ({
                     id: vardiya.id,
                     title: `${vardiya.calisan_adi} @ ${vardiya.sube_adi}`,
                     start: new Date(vardiya.baslangic_zamani),
@@ -197,7 +198,6 @@ function TakvimPage() {
                     resource: vardiya
                 }));
             
-                console.log("Formatlı eventler:", formattedEvents); // ← DEBUG için ekle
                 setEvents(formattedEvents);
                 setFilteredEvents(formattedEvents);
             })
@@ -206,7 +206,7 @@ function TakvimPage() {
                 setError('Vardiyalar yüklenemedi.'); 
             })
             .finally(() => { setLoading(false); });
-    }, [getAuthHeaders]);
+    }, [getAuthHeaders, date, view, activeView]);
 
     useEffect(() => {
         fetchVardiyalar();
@@ -317,6 +317,32 @@ function TakvimPage() {
 
         doc.save(`Vardiya_Takvimi_${currentWeekStart.format('YYYY-MM-DD')}.pdf`);
     };
+       const takipPlanIsi = (isId) => {
+        // Plan arka planda oluşuyor; iş bitene kadar durumunu sorgula
+        axios.get(`http://127.0.0.1:8000/api/schedules/plan-isleri/${isId}/`, getAuthHeaders())
+            .then(response => {
+                const planIsi = response.data;
+                if (planIsi.durum === 'tamamlandi') {
+                    setSuccessMessage(`Taslak plan oluşturuldu! (${planIsi.atama_sayisi} atama, ${planIsi.kalan_bosluk} boş kalan aralık) Kontrol edip yayınlayın.`);
+                    setPlanIlerleme(null);
+                    setGenerating(false);
+                    fetchVardiyalar();
+                } else if (planIsi.durum === 'hata') {
+                    setError(`Plan oluşturulurken bir hata oluştu: ${planIsi.hata_mesaji}`);
+                    setPlanIlerleme(null);
+                    setGenerating(false);
+                } else {
+                    setPlanIlerleme(planIsi);
+                    setTimeout(() => takipPlanIsi(isId), 2000);
+                }
+            })
+            .catch(() => {
+                setError('Plan durumu alınamadı.');
+                setPlanIlerleme(null);
+                setGenerating(false);
+            });
+    };
+
        const handlePlanOlustur = () => { 
         setGenerating(true); 
         setError(''); 
@@ -324,13 +350,26 @@ function TakvimPage() {
         const currentMonth = moment(date).format('YYYY-MM');
         axios.post('http://127.0.0.1:8000/api/schedules/plan-olustur/', { donem: currentMonth }, getAuthHeaders())
             .then(response => {
-                setSuccessMessage(response.data.mesaj || 'Plan başarıyla oluşturuldu!');
-                fetchVardiyalar();
+                takipPlanIsi(response.data.is_id);
             })
             .catch(error => {
                 setError(error.response?.data?.hata || 'Plan oluşturulurken bir hata oluştu.');
+                setGenerating(false);
+            });
+    };
+
+    const handlePlanYayinla = () => {
+        setError('');
+        setSuccessMessage('');
+        const currentMonth = moment(date).format('YYYY-MM');
+        axios.post('http://127.0.0.1:8000/api/schedules/plan-yayinla/', { donem: currentMonth }, getAuthHeaders())
+            .then(response => {
+                setSuccessMessage(response.data.mesaj);
+                fetchVardiyalar();
             })
-            .finally(() => { setGenerating(false); });
+            .catch(error => {
+                setError(error.response?.data?.hata || 'Plan yayınlanırken bir hata oluştu.');
+            });
     };
 
     const handleSelectEvent = useCallback((event) => {
@@ -364,7 +403,8 @@ function TakvimPage() {
         toplam: filteredEvents.length,
         tamamlanan: filteredEvents.filter(e => e.resource?.durum === 'tamamlandi').length,
         planlanan: filteredEvents.filter(e => e.resource?.durum === 'planlandi').length,
-        iptal: filteredEvents.filter(e => e.resource?.durum === 'iptal').length
+        iptal: filteredEvents.filter(e => e.resource?.durum === 'iptal').length,
+        taslak: events.filter(e => e.resource?.durum === 'taslak').length
     };
 
     return (
@@ -418,7 +458,13 @@ function TakvimPage() {
                             disabled={generating || loading}
                             startIcon={generating ? <CircularProgress size={20} /> : null}
                         >
-                            Plan Oluştur
+                            {planIlerleme ? `${planIlerleme.asama_display || 'Sırada'} %${planIlerleme.ilerleme}` : 'Plan Oluştur'}
+                        </Button>
+                    )}
+
+                    {currentUser?.is_staff && stats.taslak > 0 && (
+                        <Button variant="outlined" onClick={handlePlanYayinla} disabled={generating || loading}>
+                            Yayınla ({stats.taslak})
                         </Button>
                     )}
                 </Box>
@@ -536,7 +582,7 @@ function TakvimPage() {
                     </Box>
                 </>
             ) : (
-                <SubeHaftalikPlan events={filteredEvents} loading={loading} currentUser={currentUser} />
+                <SubeHaftalikPlan events={filteredEvents} loading={loading} currentUser={currentUser} date={date} onWeekChange={setDate} />
             )}
 
             {/* Detay Dialog */}
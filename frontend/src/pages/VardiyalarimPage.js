@@ -8,8 +8,12 @@ import { Container, Typography, Paper, Table, TableBody, TableCell, TableContain
 import moment from 'moment';
 import { jwtDecode } from "jwt-decode";
 import { useNavigate } from 'react-router-dom';
+import { fetchVardiyaPenceresi } from '../utils/vardiyalar';
 
 // Modal için stil
+// Takas için arkadaşın vardiyaları bu kadar gün ilerisine kadar listelenir
+const TAKAS_PENCERESI_GUN = 90;
+
 const modalStyle = {
     position: 'absolute',
     top: '50%',
@@ -112,7 +116,7 @@ function VardiyalarimPage() {
             .catch(error => console.error("Çalışan listesi çekilirken hata!", error));
     };
 
-    // Arkadaş seçildiğinde, onun TÜM vardiyalarını çeker
+    // Arkadaş seçildiğinde, onun yaklaşan vardiyalarını çeker
     const handleColleagueChange = (event) => {
         const colleagueId = event.target.value;
         setSelectedColleagueId(colleagueId);
@@ -120,13 +124,10 @@ function VardiyalarimPage() {
         setAllColleagueShifts([]);
 
         if (colleagueId) {
-            // Arkadaşın TÜM vardiyalarını çekmek için ana vardiya listesini kullan
-            // Bu API'yi zaten TakvimPage için yazmıştık
-            axios.get('http://127.0.0.1:8000/api/schedules/vardiyalar/', getAuthHeaders())
-                .then(response => {
-                    const colleagueIdInt = parseInt(colleagueId, 10);
-                    const shifts = response.data.filter(v => 
-                        v.calisan === colleagueIdInt && // Sadece o arkadaşa ait olanlar
+            // Arkadaşın önümüzdeki TAKAS_PENCERESI_GUN gündeki vardiyaları (API çalışana göre süzer)
+            fetchVardiyaPenceresi(moment(), moment().add(TAKAS_PENCERESI_GUN, 'days'), { calisan: colleagueId }, getAuthHeaders())
+                .then(vardiyalar => {
+                    const shifts = vardiyalar.filter(v => 
                         v.durum__in !== ['IPTAL', 'REDDEDILDI'] && // Aktif vardiyalar
                         new Date(v.baslangic_zamani) > new Date() // Sadece gelecekteki vardiyalar
                     );
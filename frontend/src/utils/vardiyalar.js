@@ -0,0 +1,33 @@
+// frontend/src/utils/vardiyalar.js
+
+import axios from 'axios';
+import moment from 'moment';
+
+const VARDIYA_LISTESI_URL = 'http://127.0.0.1:8000/api/schedules/vardiyalar/';
+
+// Takvimde görünen tarih aralığı (ay görünümünde baştaki/sondaki hafta taşmaları dahil)
+export const gorunenAralik = (date, view) => {
+    const gun = moment(date);
+    if (view === 'month') {
+        return [gun.clone().startOf('month').startOf('isoWeek'), gun.clone().endOf('month').endOf('isoWeek')];
+    }
+    if (view === 'day') {
+        return [gun.clone().startOf('day'), gun.clone().endOf('day')];
+    }
+    if (view === 'agenda') {
+        return [gun.clone().startOf('day'), gun.clone().add(30, 'days').endOf('day')];
+    }
+    return [gun.clone().startOf('isoWeek'), gun.clone().endOf('isoWeek')];
+};
+
+// Verilen pencerenin tüm vardiyaları; API imleçle sayfaladığı için 'next' bitene kadar okunur
+export const fetchVardiyaPenceresi = async (baslangic, bitis, filtreler, config) => {
+    const params = { from: moment(baslangic).format('YYYY-MM-DD'), to: moment(bitis).format('YYYY-MM-DD'), ...filtreler };
+    let response = await axios.get(VARDIYA_LISTESI_URL, { ...config, params });
+    const vardiyalar = [...response.data.results];
+    while (response.data.next) {
+        response = await axios.get(response.data.next, config);
+        vardiyalar.push(...response.data.results);
+    }
+    return vardiyalar;
+};